@@ -2,101 +2,40 @@
 """
 Fix Bauhaus styling across Magento documentation HTML files.
 Removes rounded corners, hexagon patterns, and fixes header styling.
+
+Every docs/**/*.html page is restyled by one rule engine:
+- RULES lists each fix as a pattern and its replacement; all of them are
+  combined into one regex, so a page is rewritten in a single pass (plus a
+  confirming pass when it changed)
+- Pages are processed in parallel worker processes
+- A page is only written when its restyled content differs; a manifest
+  records the hash of every page the current rules already produced, so
+  unchanged pages are skipped after hashing them
+- --dry-run prints a unified diff instead of writing, --check exits non-zero
+  when any page would change (for a pre-commit hook)
 """
 
+import os
 import re
 import sys
+import json
+import difflib
+import hashlib
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
-FILES_TO_FIX = [
-    "docs/modules/Magento_Customer/html/annotated-code.html",
-    "docs/modules/Magento_Customer/html/anti-patterns.html",
-    "docs/modules/Magento_Customer/html/performance-optimization.html",
-    "docs/modules/Magento_Sales/html/execution-flows.html",
-    "docs/modules/Magento_Sales/html/known-issues.html",
-    "docs/modules/Magento_Sales/html/plugins-observers.html",
-]
+ROOT = Path(__file__).resolve().parent.parent
+DOCS_DIR = ROOT / "docs"
+MANIFEST_NAME = ".bauhaus-manifest.json"
 
-def fix_file(filepath: Path):
-    """Fix Bauhaus styling issues in a single HTML file."""
-    print(f"Fixing {filepath.name}...")
+# Safety bound on repeated passes over one page; real pages settle after one
+MAX_PASSES = 10
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+BAUHAUS_HEADER_CLASS = 'bg-gradient-to-br from-magento-charcoal via-magento-charcoal to-gray-800 border-b-8 border-magento-orange'
 
-    # Backup original
-    backup_path = filepath.with_suffix('.html.backup')
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    # Fix 1: Remove all border-radius from CSS
-    content = re.sub(r'border-radius:\s*[^;]+;', '', content)
-
-    # Fix 2: Remove rx attributes from SVG
-    content = re.sub(r'\s*rx="[^"]*"', '', content)
-
-    # Fix 2a: Remove orphaned -lg, -md, -sm artifacts from rounded class removal
-    content = re.sub(r'\s+-(?:xs|sm|md|lg|xl|2xl|3xl|full)\b', '', content)
-
-    # Fix 3: Remove hexagon SVG pattern (multi-line)
-    content = re.sub(
-        r'<svg class="hero-pattern".*?</svg>',
-        '',
-        content,
-        flags=re.DOTALL
-    )
-
-    # Fix 4: Remove repeating-linear-gradient patterns
-    content = re.sub(
-        r'background-image:\s*repeating-linear-gradient[^;]+;',
-        '',
-        content
-    )
-
-    # Fix 5: Replace hero header class
-    # Old: class="hero"  with gradient and patterns
-    # New: bg-gradient-to-br from-magento-charcoal via-magento-charcoal to-gray-800 border-b-8 border-magento-orange
-
-    # Fix hero section background (CSS)
-    content = re.sub(
-        r'\.hero\s*\{[^}]*background:[^;]*;[^}]*\}',
-        '',
-        content,
-        flags=re.DOTALL
-    )
-
-    # Fix 6: Replace .hero::before patterns
-    content = re.sub(
-        r'\.hero::before\s*\{[^}]*\}',
-        '',
-        content,
-        flags=re.DOTALL
-    )
-
-    # Fix 7: Replace Font (Google Fonts to Inter Tight)
-    content = re.sub(
-        r'family=Inter:[^&"]+',
-        'family=Inter+Tight:wght@400;500;600;700',
-        content
-    )
-
-    # Fix 8: Update Tailwind font config
-    content = re.sub(
-        r"sans:\s*\['Inter'",
-        "sans: ['Inter Tight'",
-        content
-    )
-
-    # Fix 9: Fix magento-offwhite naming consistency
-    content = re.sub(
-        r"'magento-off-white':\s*'#FAFAFA'",
-        "'magento-offwhite': '#FAFAFA'",
-        content
-    )
-
-    # Fix 9a: Add Tailwind config for files using Tailwind CDN without config
-    if 'tailwindcss.com' in content and 'tailwind.config' not in content:
-        tailwind_config = '''  <script>
+TAILWIND_CONFIG = '''  <script>
     tailwind.config = {
       theme: {
         extend: {
@@ -126,64 +65,229 @@ def fix_file(filepath: Path):
     }
   </style>'''
 
-        # Insert after Tailwind CDN script
-        content = re.sub(
-            r'(<script src="https://cdn\.tailwindcss\.com"></script>)',
-            r'\1\n' + tailwind_config,
-            content
-        )
-
-    # Fix 10: For files using inline CSS with .hero class
-    # We need to remove the .hero CSS and change HTML to use Tailwind classes
-
-    # Remove .hero CSS definition
-    content = re.sub(
-        r'\.hero\s*\{[^}]*\}',
-        '',
-        content,
-        flags=re.DOTALL
-    )
-
-    # Fix header/section tags - change class="hero" to Tailwind classes
-    bauhaus_header_class = 'bg-gradient-to-br from-magento-charcoal via-magento-charcoal to-gray-800 border-b-8 border-magento-orange'
-
-    content = re.sub(
-        r'<header\s+class="hero">',
-        f'<header class="{bauhaus_header_class}">',
-        content
-    )
-
-    content = re.sub(
-        r'<section\s+class="hero">',
-        f'<header class="{bauhaus_header_class}">',
-        content
-    )
-
-    # Fix closing tags
-    content = re.sub(
-        r'</section>\s*\n\s*<!-- Breadcrumb',
-        '</header>\n\n  <!-- Breadcrumb',
-        content
-    )
-
-    # Save fixed content
+
+class Rule(NamedTuple):
+    """One fix: text matching pattern is replaced by replacement (a string, or a function of the match)"""
+    name: str
+    pattern: str
+    replacement: Union[str, Callable[[str], str]]
+    # Page-level condition, checked on the page before each pass
+    applies: Optional[Callable[[str], bool]] = None
+
+
+# Patterns become alternatives of one regex: where two rules can match at the
+# same position, the earlier one wins. Patterns that start with whitespace are
+# anchored at the start of a whitespace run, or every position inside
+# indentation would be retried.
+RULES = [
+    # Hexagon SVG pattern (multi-line)
+    Rule('hero_pattern_svg', r'<svg class="hero-pattern"(?s:.*?)</svg>', ''),
+    # Hero CSS, with or without a background, and its ::before pattern overlay
+    Rule('hero_css', r'\.hero\s*\{[^}]*\}', ''),
+    Rule('hero_before_css', r'\.hero::before\s*\{[^}]*\}', ''),
+    Rule('border_radius', r'border-radius:\s*[^;]+;', ''),
+    Rule('svg_rx', r'(?<!\s)\s*rx="[^"]*"', ''),
+    # Orphaned -lg, -md, -sm artifacts from rounded class removal
+    Rule('orphan_size_class', r'(?<!\s)\s+-(?:xs|sm|md|lg|xl|2xl|3xl|full)\b', ''),
+    Rule('repeating_gradient', r'background-image:\s*repeating-linear-gradient[^;]+;', ''),
+    # Google Fonts and Tailwind font config: Inter -> Inter Tight
+    Rule('google_font', r'family=Inter:[^&"]+', 'family=Inter+Tight:wght@400;500;600;700'),
+    Rule('tailwind_font', r"sans:\s*\['Inter'", "sans: ['Inter Tight'"),
+    # magento-offwhite naming consistency
+    Rule('offwhite_name', r"'magento-off-white':\s*'#FAFAFA'", "'magento-offwhite': '#FAFAFA'"),
+    # Tailwind config for pages using the Tailwind CDN without one
+    Rule('tailwind_config', r'<script src="https://cdn\.tailwindcss\.com"></script>',
+         lambda text: f"{text}\n{TAILWIND_CONFIG}",
+         applies=lambda page: 'tailwindcss.com' in page and 'tailwind.config' not in page),
+    # Hero header/section -> Bauhaus header
+    Rule('hero_header', r'<(?:header|section)\s+class="hero">', f'<header class="{BAUHAUS_HEADER_CLASS}">'),
+    Rule('hero_section_close', r'</section>\s*\n\s*<!-- Breadcrumb', '</header>\n\n  <!-- Breadcrumb'),
+]
+
+
+def rules_digest(rules: List[Rule] = RULES) -> str:
+    """Changes whenever a rule's pattern or replacement changes, invalidating the manifest"""
+    digest = hashlib.sha256()
+    for rule in rules:
+        replacement = TAILWIND_CONFIG if callable(rule.replacement) else rule.replacement
+        digest.update(f"{rule.name}\0{rule.pattern}\0{replacement}\n".encode())
+    return digest.hexdigest()
+
+
+class RuleEngine:
+    """All rules compiled into one alternation, one regex per set of applicable rules"""
+
+    def __init__(self, rules: List[Rule] = RULES):
+        self.rules = [(rule, re.compile(rule.pattern)) for rule in rules]
+        self._compiled: Dict[Tuple[int, ...], Tuple[re.Pattern, List[Tuple[Rule, re.Pattern]]]] = {}
+
+    def _pattern(self, page: str) -> Tuple[re.Pattern, List[Tuple[Rule, re.Pattern]]]:
+        active = tuple(i for i, (rule, _) in enumerate(self.rules) if rule.applies is None or rule.applies(page))
+        if active not in self._compiled:
+            rules = [self.rules[i] for i in active]
+            # Non-capturing: capture groups around each alternative make the scan several times slower
+            combined = re.compile('|'.join(f"(?:{rule.pattern})" for rule, _ in rules))
+            self._compiled[active] = (combined, rules)
+        return self._compiled[active]
+
+    def apply(self, page: str) -> Tuple[str, Dict[str, int]]:
+        """Restyled page and how often each rule fired
+
+        A rewrite can expose a new match (removing a declaration joins the
+        text around it), so passes repeat until one changes nothing; the
+        result is stable and rerunning the rules on it is a no-op.
+        """
+        counts: Dict[str, int] = {}
+
+        for _ in range(MAX_PASSES):
+            combined, rules = self._pattern(page)
+
+            def replace(match: re.Match) -> str:
+                # The alternation took the first rule that matches here
+                for rule, pattern in rules:
+                    if pattern.match(match.string, match.start()):
+                        break
+                counts[rule.name] = counts.get(rule.name, 0) + 1
+                if callable(rule.replacement):
+                    return rule.replacement(match.group())
+                return rule.replacement
+
+            fixed = combined.sub(replace, page)
+            if fixed == page:
+                break
+            page = fixed
+        return page, counts
+
+
+_engine: Optional[RuleEngine] = None
+
+
+def page_name(path: Path) -> str:
+    """Path relative to the repository for pages inside it"""
+    try:
+        return str(path.relative_to(ROOT))
+    except ValueError:
+        return str(path)
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def fix_file(filepath: Path, dry_run: bool = False, backup: bool = False) -> Dict:
+    """Restyle one page; returns its new hash, rule counts and (for dry runs) its diff"""
+    global _engine
+    if _engine is None:
+        _engine = RuleEngine()
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    fixed, counts = _engine.apply(content)
+    result = {'path': str(filepath), 'changed': fixed != content, 'hash': content_hash(fixed), 'counts': counts}
+
+    if not result['changed']:
+        return result
+
+    if dry_run:
+        result['diff'] = ''.join(difflib.unified_diff(
+            content.splitlines(keepends=True), fixed.splitlines(keepends=True),
+            fromfile=f"a/{page_name(filepath)}", tofile=f"b/{page_name(filepath)}"))
+        return result
+
+    if backup:
+        with open(filepath.with_suffix('.html.backup'), 'w', encoding='utf-8') as f:
+            f.write(content)
+
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+        f.write(fixed)
+    return result
 
-    print(f"  ✓ Fixed {filepath.name} (backup: {backup_path.name})")
 
+def find_pages(docs_dir: Path) -> List[Path]:
+    """Every HTML page under docs/"""
+    return sorted(docs_dir.rglob('*.html'))
 
-def main():
-    root = Path(__file__).parent.parent
 
-    for file_path in FILES_TO_FIX:
-        full_path = root / file_path
-        if full_path.exists():
-            fix_file(full_path)
-        else:
-            print(f"  ✗ File not found: {full_path}")
+def load_manifest(path: Path) -> Dict[str, str]:
+    """Page -> hash of the content the current rules produced for it"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('rules') != rules_digest():
+        return {}
+    return manifest.get('pages', {})
 
-    print("\n✓ All files processed!")
+
+def save_manifest(path: Path, pages: Dict[str, str]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'rules': rules_digest(), 'pages': dict(sorted(pages.items()))}, f, indent=1)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply the Bauhaus styling rules to documentation HTML pages')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='pages to restyle (default: every docs/**/*.html)')
+    parser.add_argument('--dry-run', action='store_true', help='print a diff of what would change, write nothing')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 if any page would change')
+    parser.add_argument('--backup', action='store_true', help='keep the original of every changed page as .html.backup')
+    parser.add_argument('--force', action='store_true', help='ignore the manifest and restyle every page')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    pages = [path.resolve() for path in args.paths] if args.paths else find_pages(DOCS_DIR)
+    missing = [path for path in pages if not path.exists()]
+    for path in missing:
+        print(f"  ✗ File not found: {path}")
+    pages = [path for path in pages if path.exists()]
+
+    manifest_path = DOCS_DIR / MANIFEST_NAME
+    manifest = {} if args.force else load_manifest(manifest_path)
+    dry_run = args.dry_run or args.check
+
+    todo = []
+    skipped = 0
+    for page in pages:
+        if manifest.get(page_name(page)) == content_hash(page.read_text(encoding='utf-8')):
+            skipped += 1
+        else:
+            todo.append(page)
+
+    if args.workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(todo))) as pool:
+            results = list(pool.map(fix_file, todo, [dry_run] * len(todo), [args.backup] * len(todo),
+                                    chunksize=max(1, len(todo) // (args.workers * 4))))
+    else:
+        results = [fix_file(page, dry_run, args.backup) for page in todo]
+
+    totals: Dict[str, int] = {}
+    changed = [result for result in results if result['changed']]
+    for result in results:
+        for name, count in result['counts'].items():
+            totals[name] = totals.get(name, 0) + count
+        if dry_run and result['changed']:
+            sys.stdout.write(result['diff'])
+        elif result['changed']:
+            print(f"  ✓ Fixed {page_name(Path(result['path']))}")
+
+    if not dry_run:
+        for result in results:
+            manifest[page_name(Path(result['path']))] = result['hash']
+        save_manifest(manifest_path, manifest)
+
+    print()
+    verb = 'would change' if dry_run else 'changed'
+    print(f"✓ {len(pages)} pages: {len(changed)} {verb}, {len(results) - len(changed)} already styled, "
+          f"{skipped} unchanged since last run")
+    for name, count in sorted(totals.items()):
+        print(f"  {name}: {count}")
+
+    if args.check and changed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+r"""
+Claim Extraction Throughput Benchmark
+Measures ClaimExtractor throughput (MB/s) on the docs/modules/*/html pages.
+
+Compares the single-pass CLAIM_SCANNER against the previous extractor, which
+ran seven separate re.finditer passes over every text fragment, and checks
+that both produce identical claims for every page.
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+
+from extract_claims import ClaimExtractor
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+class SevenPassClaimExtractor(ClaimExtractor):
+    """Previous extractor: one re.finditer pass per claim kind"""
+
+    def _extract_from_buffer(self):
+        if not self.current_data:
+            return
+
+        text = self.current_data
+
+        class_pattern = r'Magento\\[A-Za-z0-9\\]+[A-Za-z0-9]+'
+        for match in re.finditer(class_pattern, text):
+            classname = match.group(0)
+            if 'Interface' in classname:
+                self.claims['interfaces'].add(classname)
+            else:
+                self.claims['classes'].add(classname)
+
+        method_pattern = r'([a-z][a-zA-Z0-9_]*)\s*\([^)]*\)(?:\s*:\s*[A-Za-z\\]+)?'
+        for match in re.finditer(method_pattern, text):
+            method = match.group(1)
+            if len(method) > 2 and method not in ['function', 'public', 'private', 'protected']:
+                self.claims['methods'].add(method)
+
+        event_pattern = r'\b([a-z]+_[a-z_]+)\b'
+        for match in re.finditer(event_pattern, text):
+            event = match.group(1)
+            if (event.count('_') >= 1 and
+                event not in ['the_core', 'full_page', 'per_website', 'primary_key'] and
+                any(keyword in event for keyword in ['save', 'delete', 'load', 'login', 'logout', 'customer', 'before', 'after'])):
+                self.claims['events'].add(event)
+
+        table_pattern = r'\b(customer_[a-z_]+|eav_[a-z_]+|sales_[a-z_]+|quote_[a-z_]+)\b'
+        for match in re.finditer(table_pattern, text):
+            self.claims['tables'].add(match.group(1))
+
+        acl_pattern = r'Magento_[A-Za-z]+::[a-z_]+'
+        for match in re.finditer(acl_pattern, text):
+            self.claims['acl_resources'].add(match.group(0))
+
+        config_pattern = r'\b([a-z]+/[a-z_]+(?:/[a-z_]+)?)\b'
+        for match in re.finditer(config_pattern, text):
+            path = match.group(1)
+            if path.count('/') >= 1 and not path.startswith('http'):
+                self.claims['config_paths'].add(path)
+
+        file_pattern = r'(?:etc|Model|Block|Controller|Helper|Observer|Plugin)/[A-Za-z0-9_/]+\.(?:xml|php)'
+        for match in re.finditer(file_pattern, text):
+            self.claims['file_paths'].add(match.group(0))
+
+
+def measure(extractor_class, pages, repeat):
+    """Best-of-N seconds to extract every page; claims from the last run"""
+    best = float('inf')
+    claims = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        claims = []
+        for content in pages:
+            parser = extractor_class()
+            parser.feed(content)
+            claims.append(parser.claims)
+        best = min(best, time.perf_counter() - start)
+    return best, claims
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark claim extraction throughput')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per extractor (best is reported)')
+    parser.add_argument('pages', type=Path, nargs='*',
+                        help='HTML pages (default: docs/modules/*/html/*.html)')
+    args = parser.parse_args()
+
+    paths = args.pages or sorted(REPO_ROOT.glob('docs/modules/*/html/*.html'))
+    pages = [path.read_text(encoding='utf-8') for path in paths]
+    megabytes = sum(len(content.encode('utf-8')) for content in pages) / 1e6
+
+    print(f"Pages: {len(pages)} ({megabytes:.2f} MB)")
+
+    before, before_claims = measure(SevenPassClaimExtractor, pages, args.repeat)
+    after, after_claims = measure(ClaimExtractor, pages, args.repeat)
+
+    mismatches = [path for path, a, b in zip(paths, before_claims, after_claims) if a != b]
+
+    print(f"  Seven-pass extractor:  {before:.3f}s  {megabytes / before:.2f} MB/s")
+    print(f"  Single-pass extractor: {after:.3f}s  {megabytes / after:.2f} MB/s")
+    print(f"  Speedup: {before / after:.2f}x")
+    print(f"  Identical claims: {len(pages) - len(mismatches)}/{len(pages)}")
+    for path in mismatches:
+        print(f"    differs: {path}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
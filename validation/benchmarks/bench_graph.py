@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Graph Engine Benchmark
+Compares csr_graph.CsrGraph with dict-of-lists adjacency over the graph JSON.
+
+Only data/Magento_Sales-graph.json exists in the repo, so larger inputs are
+made by writing one copy of every real graph per synthetic module, with its
+module name renamed (Magento\\Sales -> Magento\\Sales7, sales_ -> sales7_).
+Framework classes stay shared between the copies, as they are between real
+modules. For each module count it reports:
+- load: seconds, retained and peak memory (tracemalloc) to load every file
+- reach: forward reachability from every interface over PREFERS, INJECTS
+  and EXTENDS_VIRTUAL (all classes a preference pulls in)
+- reverse: what reaches each shared Reference node, over every edge type
+- plugins: plugin chain of every interface
+
+Every query's result must be identical in both engines.
+"""
+
+import gc
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+
+from csr_graph import DEFAULT_SORT_ORDER, PLUGIN_SCOPE_FORWARD, PLUGIN_SCOPE_REVERSE, load_csr_graph
+from graph_index import graph_files
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MODULES = [1, 10, 50, 200]
+REACH_EDGES = ('PREFERS', 'INJECTS', 'EXTENDS_VIRTUAL')
+
+
+class DictGraph:
+    """Naive engine: every file json.load()ed, edges kept as dicts in per-node lists"""
+
+    def __init__(self, paths: List[Path]):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.out: Dict[str, List[Dict[str, Any]]] = {}
+        self.inn: Dict[str, List[Dict[str, Any]]] = {}
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            for node in document['nodes']:
+                self.nodes[node['id']] = node
+            for edge in document['edges']:
+                self.out.setdefault(edge['from'], []).append(edge)
+                self.inn.setdefault(edge['to'], []).append(edge)
+
+    def _bfs(self, start: str, forward_types, reverse_types) -> List[str]:
+        seen = {start}
+        frontier = [start]
+        order = []
+        while frontier:
+            following = []
+            for v in frontier:
+                for edges, key, types in ((self.out, 'to', forward_types), (self.inn, 'from', reverse_types)):
+                    if not types:
+                        continue
+                    for edge in edges.get(v, ()):
+                        w = edge[key]
+                        if w not in seen and (types is True or edge['type'] in types):
+                            seen.add(w)
+                            following.append(w)
+            order.extend(following)
+            frontier = following
+        return order
+
+    def reachable(self, start: str, edge_types=None, reverse: bool = False) -> List[str]:
+        types = True if edge_types is None else set(edge_types)
+        return self._bfs(start, None if reverse else types, types if reverse else None)
+
+    def plugin_chain(self, start: str) -> List[Tuple[str, str, int]]:
+        chain: Dict[Tuple[str, str], int] = {}
+        for target in [start] + self._bfs(start, set(PLUGIN_SCOPE_FORWARD), set(PLUGIN_SCOPE_REVERSE)):
+            for edge in self.inn.get(target, ()):
+                if edge['type'] == 'INTERCEPTS':
+                    sort_order = edge['properties'].get('sortOrder') or DEFAULT_SORT_ORDER
+                    key = (edge['from'], target)
+                    chain[key] = min(sort_order, chain.get(key, sort_order))
+        return sorted(((plugin, target, sort_order) for (plugin, target), sort_order in chain.items()),
+                      key=lambda plugin: (plugin[2], plugin[0]))
+
+
+def write_modules(output_dir: Path, sources: List[Path], modules: int) -> List[Path]:
+    """One renamed copy of every source graph per synthetic module"""
+    paths = []
+    for source in sources:
+        text = source.read_text(encoding='utf-8')
+        name = re.match(r'Magento_(\w+)-graph\.json$', source.name)
+        module = name.group(1) if name else source.name[:-len('-graph.json')]
+        for i in range(modules):
+            suffix = str(i) if i else ''
+            renamed = text.replace(f'Magento\\\\{module}\\\\', f'Magento\\\\{module}{suffix}\\\\')
+            renamed = renamed.replace(f'{module.lower()}_', f'{module.lower()}{suffix}_')
+            path = output_dir / f"Magento_{module}{suffix}-graph.json"
+            path.write_text(renamed, encoding='utf-8')
+            paths.append(path)
+    return paths
+
+
+def measure_load(loader: Callable[[], Any]) -> Tuple[Any, float, float, float]:
+    """(graph, seconds, retained MB, peak MB); memory from a second, traced load"""
+    gc.collect()
+    start = time.perf_counter()
+    graph = loader()
+    seconds = time.perf_counter() - start
+    del graph
+    gc.collect()
+
+    tracemalloc.start()
+    graph = loader()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, seconds, current / 1e6, peak / 1e6
+
+
+def timed(query: Callable[[], List[Any]], repeat: int) -> Tuple[float, List[Any]]:
+    best = float('inf')
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = query()
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def run_case(sources: List[Path], modules: int, repeat: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix='mage-graph-') as tmp:
+        paths = write_modules(Path(tmp), sources, modules)
+        naive, naive_load, naive_mb, naive_peak = measure_load(lambda: DictGraph(paths))
+        csr, csr_load, csr_mb, csr_peak = measure_load(lambda: load_csr_graph(paths))
+
+    interfaces = [node_id for node_id, node in naive.nodes.items() if node['type'] == 'Interface']
+    references = sorted(node_id for node_id in naive.inn if node_id not in naive.nodes)
+
+    queries = {
+        'reach': (lambda: [naive.reachable(node, REACH_EDGES) for node in interfaces],
+                  lambda: [csr.reachable([node], REACH_EDGES) for node in interfaces]),
+        'reverse': (lambda: [naive.reachable(node, reverse=True) for node in references],
+                    lambda: [csr.reachable([node], reverse=True) for node in references]),
+        'plugins': (lambda: [naive.plugin_chain(node) for node in interfaces],
+                    lambda: [csr.plugin_chain(node) for node in interfaces]),
+    }
+
+    case = {
+        'modules': modules,
+        'nodes': len(csr),
+        'edges': csr.edge_count,
+        'load': {'dict_s': naive_load, 'csr_s': csr_load, 'dict_mb': naive_mb, 'csr_mb': csr_mb,
+                 'dict_peak_mb': naive_peak, 'csr_peak_mb': csr_peak},
+        'queries': {},
+        'mismatches': [],
+    }
+    for name, (naive_query, csr_query) in queries.items():
+        naive_s, naive_results = timed(naive_query, repeat)
+        csr_s, csr_results = timed(csr_query, repeat)
+        case['queries'][name] = {'count': len(naive_results), 'dict_s': naive_s, 'csr_s': csr_s}
+        if naive_results != csr_results:
+            case['mismatches'].append(name)
+    return case
+
+
+def print_case(case: Dict[str, Any]):
+    load = case['load']
+    print(f"{case['modules']} modules: {case['nodes']} nodes, {case['edges']} edges")
+    print(f"  load     dict {load['dict_s']:.3f}s {load['dict_mb']:7.2f} MB (peak {load['dict_peak_mb']:.2f})"
+          f"   csr {load['csr_s']:.3f}s {load['csr_mb']:7.2f} MB (peak {load['csr_peak_mb']:.2f})"
+          f"   memory {load['dict_mb'] / max(load['csr_mb'], 1e-9):.1f}x smaller")
+    for name, query in case['queries'].items():
+        print(f"  {name:<8} {query['count']:>6} queries   dict {query['dict_s'] * 1000:8.1f} ms"
+              f"   csr {query['csr_s'] * 1000:8.1f} ms   {query['dict_s'] / max(query['csr_s'], 1e-9):.2f}x")
+    if case['mismatches']:
+        print(f"  MISMATCH: {', '.join(case['mismatches'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the CSR graph engine against dict-of-lists adjacency')
+    parser.add_argument('--modules', type=int, nargs='+', default=DEFAULT_MODULES,
+                        help=f'synthetic module counts (default: {" ".join(map(str, DEFAULT_MODULES))})')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per query set (best is reported)')
+    parser.add_argument('graphs', type=Path, nargs='*',
+                        help='graph files or directories to replicate (default: data/)')
+    args = parser.parse_args()
+
+    sources = [graph for path in (args.graphs or [REPO_ROOT / 'data']) for graph in graph_files(path)]
+    if not sources:
+        print("Error: no *-graph.json files to benchmark")
+        sys.exit(1)
+    print(f"Source graphs: {', '.join(source.name for source in sources)}")
+    print()
+
+    failed = False
+    for modules in args.modules:
+        case = run_case(sources, modules, args.repeat)
+        print_case(case)
+        failed = failed or bool(case['mismatches'])
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+End-to-End Pipeline Benchmark
+Runs extraction and validation on synthetic Magento trees of increasing size.
+
+For every (layout, module count) case a fresh tree and docs set is generated
+(see synthetic_tree.py) and run in its own process, so peak RSS is per case:
+- extract: every docs page -> *_claims file (MB/s)
+- index: symbol index build on the fresh tree (seconds)
+- validate (index): every claims file against the symbol index (claims/s)
+- validate (search): the same with --no-index in-process searches (claims/s)
+
+Results print as a scaling table. --save-baseline stores them in
+baselines.json; --check compares a run against the stored baseline and exits
+non-zero when a metric regressed by more than --tolerance.
+"""
+
+import sys
+import json
+import time
+import resource
+import platform
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+
+from extract_claims import content_hash, extract_claims_from_text, format_claims_for_validation, write_claims
+from validate_claims import MagentoValidator, validate_claims_file, write_results
+from claims_io import FORMAT_EXTENSIONS
+from synthetic_tree import generate_docs, generate_tree, tree_stats
+
+
+BASELINE_FILE = Path(__file__).resolve().parent / 'baselines.json'
+DEFAULT_MODULES = [10, 50, 100, 500]
+
+# Metric -> True if higher is better
+METRICS = {
+    'extract_mb_s': True,
+    'index_seconds': False,
+    'validate_index_claims_s': True,
+    'validate_search_claims_s': True,
+    'peak_rss_mb': False,
+}
+
+
+def _validate_all(claims_files: List[Path], magento_root: Path, use_index: bool) -> Dict[str, float]:
+    start = time.perf_counter()
+    validator = MagentoValidator(magento_root, use_index=use_index)
+    index_seconds = time.perf_counter() - start
+
+    claims = 0
+    for claims_file in claims_files:
+        results = validate_claims_file(claims_file, magento_root, validator=validator)
+        write_results(results, claims_file.with_name(
+            claims_file.name.replace('_claims', '_validation', 1)))
+        claims += results['summary']['total_claims']
+
+    if validator.index is not None:
+        validator.index.close()
+    return {'claims': claims, 'index_seconds': index_seconds,
+            'seconds': time.perf_counter() - start - index_seconds}
+
+
+def run_case(layout: str, modules: int, pages: int, entities: int, output_format: str,
+             seed: int) -> Dict[str, Any]:
+    """Generate one synthetic tree and run the whole pipeline over it"""
+    extension = FORMAT_EXTENSIONS[output_format]
+
+    with tempfile.TemporaryDirectory(prefix='mage-bench-') as tmp:
+        tmp = Path(tmp)
+        magento_root = tmp / 'magento'
+
+        start = time.perf_counter()
+        tree = generate_tree(magento_root, modules, layout, entities, seed)
+        docs = generate_docs(tmp / 'docs', tree, pages, seed=seed)
+        generate_seconds = time.perf_counter() - start
+        stats = tree_stats(magento_root)
+
+        start = time.perf_counter()
+        claims_files = []
+        doc_bytes = 0
+        for page in docs:
+            content = page.read_text(encoding='utf-8')
+            doc_bytes += len(content.encode('utf-8'))
+            claims = extract_claims_from_text(content)
+            output = tmp / 'claims' / page.parent.parent.name / f"{page.stem}_claims{extension}"
+            output.parent.mkdir(parents=True, exist_ok=True)
+            write_claims(format_claims_for_validation(claims, page, content_hash(content)), output)
+            claims_files.append(output)
+        extract_seconds = time.perf_counter() - start
+
+        indexed = _validate_all(claims_files, magento_root, True)
+        searched = _validate_all(claims_files, magento_root, False)
+
+    return {
+        'layout': layout,
+        'modules': modules,
+        'files': stats['files'],
+        'source_mb': round(stats['bytes'] / 1e6, 3),
+        'pages': len(docs),
+        'claims': indexed['claims'],
+        'generate_seconds': round(generate_seconds, 3),
+        'extract_mb_s': round(doc_bytes / 1e6 / max(extract_seconds, 1e-9), 3),
+        'index_seconds': round(indexed['index_seconds'], 3),
+        'validate_index_claims_s': round(indexed['claims'] / max(indexed['seconds'], 1e-9), 1),
+        'validate_search_claims_s': round(searched['claims'] / max(searched['seconds'], 1e-9), 1),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def run_isolated(*args) -> Dict[str, Any]:
+    """Run one case in a fresh process so its peak RSS is its own"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_case, *args).result()
+
+
+def case_key(case: Dict[str, Any]) -> str:
+    return f"{case['layout']}-{case['modules']}"
+
+
+def compare(cases: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every metric that regressed beyond the tolerance"""
+    regressions = []
+    for case in cases:
+        previous = baseline.get('cases', {}).get(case_key(case))
+        if previous is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = previous.get(metric), case[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{case_key(case)} {metric}: {before} -> {after} ({change:+.0%})")
+    return regressions
+
+
+def print_table(cases: List[Dict[str, Any]]):
+    print(f"{'layout':<7} {'modules':>7} {'files':>6} {'claims':>6} {'extract':>10} {'index':>7} "
+          f"{'val/index':>11} {'val/search':>11} {'rss':>8}")
+    for case in cases:
+        print(f"{case['layout']:<7} {case['modules']:>7} {case['files']:>6} {case['claims']:>6} "
+              f"{case['extract_mb_s']:>6.2f}MB/s {case['index_seconds']:>6.2f}s "
+              f"{case['validate_index_claims_s']:>9.0f}/s {case['validate_search_claims_s']:>9.0f}/s "
+              f"{case['peak_rss_mb']:>6.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extraction and validation on synthetic Magento trees')
+    parser.add_argument('--modules', type=int, nargs='+', default=DEFAULT_MODULES,
+                        help=f'tree sizes in modules (default: {" ".join(map(str, DEFAULT_MODULES))})')
+    parser.add_argument('--layout', choices=['vendor', 'app'], nargs='+', default=['vendor', 'app'])
+    parser.add_argument('--pages', type=int, default=2, help='docs pages per module (default: 2)')
+    parser.add_argument('--entities', type=int, default=8, help='entity classes per module (default: 8)')
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='yaml',
+                        help='claims/validation file format (default: yaml)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=Path, help='also write the results to this file')
+    parser.add_argument('--save-baseline', action='store_true', help=f'store the results in {BASELINE_FILE.name}')
+    parser.add_argument('--check', action='store_true', help='fail if a metric regressed against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='allowed relative regression for --check (default: 0.3)')
+    args = parser.parse_args()
+
+    cases = []
+    for layout in args.layout:
+        for modules in args.modules:
+            print(f"Running {layout} layout, {modules} modules...", flush=True)
+            cases.append(run_isolated(layout, modules, args.pages, args.entities, args.format, args.seed))
+
+    print()
+    print_table(cases)
+
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': multiprocessing.cpu_count(),
+        },
+        'settings': {'pages': args.pages, 'entities': args.entities, 'format': args.format, 'seed': args.seed},
+        'cases': {case_key(case): case for case in cases},
+    }
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+
+    if args.check:
+        if not BASELINE_FILE.exists():
+            print(f"\nNo baseline at {BASELINE_FILE}; run with --save-baseline first")
+            sys.exit(1)
+        regressions = compare(cases, json.loads(BASELINE_FILE.read_text(encoding='utf-8')), args.tolerance)
+        print()
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {BASELINE_FILE.name}")
+
+    if args.save_baseline:
+        # Cases not run this time keep their stored baseline
+        if BASELINE_FILE.exists():
+            stored = json.loads(BASELINE_FILE.read_text(encoding='utf-8'))
+            results['cases'] = {**stored.get('cases', {}), **results['cases']}
+        BASELINE_FILE.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+        print(f"\nBaseline saved to {BASELINE_FILE}")
+
+
+if __name__ == '__main__':
+    main()
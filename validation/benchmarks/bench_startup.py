@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Cold-Start Benchmark
+Measures what one mage-validate invocation costs before it does any work.
+
+Shell loops call the tools once per file, so interpreter start and imports
+are paid per file. Every case runs mage_validate.py in a fresh interpreter
+under python -X importtime against a small synthetic tree and reports:
+- wall: milliseconds for the whole process
+- imports: milliseconds spent importing, summed over top-level imports,
+  next to the floor of a bare 'python -c pass'
+- heavy: which of the slow optional modules (PyYAML, asyncio, tarfile,
+  zipfile, ...) the case loaded
+Times are the best of --repeat runs, as with timeit: slower runs measure
+other load on the machine, not the imports.
+
+Each case has a budget: an import time, and heavy modules it must not load
+(e.g. an index-backed validate of ndjson claims must not import PyYAML or
+asyncio). Import budgets are for a machine whose bare interpreter imports
+take REFERENCE_FLOOR_MS, and are scaled by the floor measured in the same
+run, so a slower or busier machine is not failed for being slow. --check
+exits non-zero when a case is over budget or loads a forbidden module.
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+from synthetic_tree import generate_docs, generate_tree
+
+
+MAGE_VALIDATE = Path(__file__).resolve().parent.parent / 'tools' / 'mage_validate.py'
+
+# Imports of 'python -c pass' (site, encodings, ...) on the machine the budgets were set on
+REFERENCE_FLOOR_MS = 8.0
+
+# Slow imports that only some paths need
+HEAVY_MODULES = ('yaml', 'asyncio', 'tarfile', 'zipfile', 'sqlite3', 'html.parser', 'concurrent.futures')
+
+
+class Case(NamedTuple):
+    name: str
+    args: List[str]
+    budget_ms: float
+    forbidden: Tuple[str, ...]
+
+
+def cases(tmp: Path, page: Path) -> List[Case]:
+    """Import budgets are about 1.5x the best runs on the reference machine"""
+    root = str(tmp / 'magento')
+    return [
+        Case('help', ['--help'], 15, HEAVY_MODULES),
+        Case('extract', ['extract', str(page), str(tmp / 'claims.yaml')], 130,
+             ('asyncio', 'tarfile', 'zipfile', 'sqlite3', 'concurrent.futures')),
+        Case('extract-ndjson', ['extract', str(page), str(tmp / 'claims.ndjson')], 100,
+             ('yaml', 'asyncio', 'tarfile', 'zipfile', 'sqlite3', 'concurrent.futures')),
+        Case('validate', ['validate', str(tmp / 'claims.yaml'), root, str(tmp / 'results.yaml')], 150,
+             ('asyncio', 'tarfile', 'zipfile', 'html.parser', 'concurrent.futures')),
+        Case('validate-ndjson', ['validate', str(tmp / 'claims.ndjson'), root, str(tmp / 'results.ndjson')], 120,
+             ('yaml', 'asyncio', 'tarfile', 'zipfile', 'html.parser', 'concurrent.futures')),
+        Case('query', ['query', '--db', str(tmp / 'warehouse.sqlite'), 'runs'], 80,
+             ('yaml', 'asyncio', 'tarfile', 'zipfile', 'html.parser', 'concurrent.futures')),
+    ]
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Set[str]]:
+    """(milliseconds importing, names of every module imported) from -X importtime output"""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            # The header line
+            continue
+        name = fields[2][1:]
+        modules.add(name.strip())
+        if not name.startswith(' '):
+            # Top-level imports; their cumulative time includes everything nested
+            total_us += int(fields[1])
+    return total_us / 1000, modules
+
+
+def run_once(command: List[str]) -> Tuple[float, float, Set[str]]:
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + command,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        errors = '\n'.join(line for line in process.stderr.splitlines() if not line.startswith('import time:'))
+        raise RuntimeError(f"{' '.join(command)} failed:\n{errors}")
+    import_ms, modules = parse_importtime(process.stderr)
+    return wall_ms, import_ms, modules
+
+
+def measure(command: List[str], repeat: int) -> Dict[str, object]:
+    runs = [run_once(command) for _ in range(repeat)]
+    return {
+        'wall_ms': min(run[0] for run in runs),
+        'import_ms': min(run[1] for run in runs),
+        'modules': set.union(*(run[2] for run in runs)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure mage-validate cold start per subcommand')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per case; the best is reported (default: 5)')
+    parser.add_argument('--check', action='store_true',
+                        help='fail if a case exceeds its import budget or loads a forbidden module')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='mage-startup-') as tmp:
+        tmp = Path(tmp)
+        tree = generate_tree(tmp / 'magento', 3)
+        page = generate_docs(tmp / 'docs', tree, 1)[0]
+        all_cases = cases(tmp, page)
+
+        # Untimed first runs write the claims files, symbol index, result cache and warehouse
+        # the later cases read, so every timed run takes the warm-tree path a shell loop does
+        for case in all_cases:
+            if case.name != 'help':
+                run_once([str(MAGE_VALIDATE)] + case.args)
+        run_once([str(MAGE_VALIDATE), 'query', '--db', str(tmp / 'warehouse.sqlite'), 'ingest', str(tmp)])
+
+        floor = measure(['-c', 'pass'], args.repeat)
+        results = [(case, measure([str(MAGE_VALIDATE)] + case.args, args.repeat)) for case in all_cases]
+
+    print(f"Interpreter floor (python -c pass): {floor['wall_ms']:.1f} ms wall, "
+          f"{floor['import_ms']:.1f} ms imports\n")
+    scale = floor['import_ms'] / REFERENCE_FLOOR_MS
+    print(f"{'case':<16} {'wall ms':>8} {'imports ms':>10} {'budget':>7}  heavy modules loaded")
+    failures = []
+    for case, result in results:
+        budget_ms = case.budget_ms * scale
+        heavy = [module for module in HEAVY_MODULES if module in result['modules']]
+        print(f"{case.name:<16} {result['wall_ms']:>8.1f} {result['import_ms']:>10.1f} {budget_ms:>7.1f}  "
+              f"{', '.join(heavy) or '-'}")
+        if result['import_ms'] > budget_ms:
+            failures.append(f"{case.name}: imports took {result['import_ms']:.1f} ms, budget {budget_ms:.1f} ms")
+        for module in heavy:
+            if module in case.forbidden:
+                failures.append(f"{case.name}: imported {module}")
+
+    if args.check:
+        print()
+        if failures:
+            print("Over budget:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("Every case is within its budget")
+
+
+if __name__ == '__main__':
+    main()
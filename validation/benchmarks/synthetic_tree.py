@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+r"""
+Synthetic Magento Source Tree Generator
+Builds reproducible Magento-shaped source trees and documentation pages for benchmarks.
+
+Trees use either layout the validator understands:
+- app: app/code/Magento/<Module>/...
+- vendor: vendor/mage-os/module-<module>/...
+
+Every module gets a composer.json with its PSR-4 mapping, API interfaces,
+models with $_eventPrefix, resource models that dispatch events and call
+getTable(), observers, and etc/events.xml, etc/db_schema.xml, etc/acl.xml
+and etc/di.xml. The first module is always Customer, since the validator
+detects the source root by it.
+
+Documentation pages mimic docs/modules/<Module>/html/*.html and reference a
+seeded mix of claims that exist in the tree and claims that do not, so both
+found and not-found validation paths are exercised.
+"""
+
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+
+KNOWN_MODULES = ['Customer', 'Sales', 'Catalog', 'Quote', 'Eav', 'Checkout', 'Cms', 'Store']
+TABLE_PREFIXES = ('customer_', 'eav_', 'sales_', 'quote_')
+METHOD_NAMES = ['save', 'getById', 'getList', 'delete', 'deleteById', 'load', 'validate', 'execute']
+
+
+class Module(NamedTuple):
+    name: str          # Customer
+    snake: str         # customer
+    path: Path         # .../module-customer or .../Customer
+    classes: List[str]
+    interfaces: List[str]
+    methods: List[str]
+    events: List[str]
+    tables: List[str]
+    acl_resources: List[str]
+
+
+def letters(number: int, width: int = 3) -> str:
+    """0 -> 'aaa', 1 -> 'aab', ...: claim names must be letters only to match the extractor's patterns"""
+    suffix = ''
+    for _ in range(width):
+        number, digit = divmod(number, 26)
+        suffix = chr(ord('a') + digit) + suffix
+    return suffix
+
+
+def module_names(count: int) -> List[str]:
+    names = KNOWN_MODULES[:count]
+    names += [f"Synthetic{letters(i).capitalize()}" for i in range(count - len(names))]
+    return names
+
+
+def _write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+def _php_class(namespace: str, declaration: str, body: List[str]) -> str:
+    return '\n'.join([
+        '<?php',
+        '/**',
+        ' * Copyright © Magento, Inc. All rights reserved.',
+        ' * See COPYING.txt for license details.',
+        ' */',
+        'declare(strict_types=1);',
+        '',
+        f'namespace {namespace};',
+        '',
+        declaration,
+        '{',
+        *body,
+        '}',
+        '',
+    ])
+
+
+def _method(name: str, body: str = 'return null;') -> List[str]:
+    return [
+        '    /**',
+        f'     * {name}',
+        '     */',
+        f'    public function {name}($argument = null)',
+        '    {',
+        f'        {body}',
+        '    }',
+        '',
+    ]
+
+
+def generate_module(base: Path, name: str, entities: int, rng: random.Random) -> Module:
+    """Write one module and return the claims that hold for it"""
+    snake = name.lower()
+    namespace = f"Magento\\{name}"
+    # The extractor only recognises tables with a known prefix
+    table_root = snake if f"{snake}_".startswith(TABLE_PREFIXES) else f"sales_{snake}"
+    entity_table = f"{table_root}_entity"
+
+    _write(base / 'composer.json', json.dumps({
+        'name': f"mage-os/module-{snake}",
+        'type': 'magento2-module',
+        'autoload': {'files': ['registration.php'], 'psr-4': {f"{namespace}\\": ''}},
+    }, indent=4))
+    _write(base / 'registration.php',
+           "<?php\n\\Magento\\Framework\\Component\\ComponentRegistrar::register(\n"
+           f"    \\Magento\\Framework\\Component\\ComponentRegistrar::MODULE, 'Magento_{name}', __DIR__\n);\n")
+
+    classes, interfaces, methods, tables = [], [], set(), [entity_table]
+    events = [f"{snake}_save_after_data_object", f"{snake}_delete_before_data_object"]
+
+    # API and repository
+    repository_methods = METHOD_NAMES[:5]
+    interface = f"{namespace}\\Api\\{name}RepositoryInterface"
+    interfaces.append(interface)
+    _write(base / 'Api' / f"{name}RepositoryInterface.php", _php_class(
+        f"{namespace}\\Api", f"interface {name}RepositoryInterface",
+        [f"    public function {method}($argument = null);" for method in repository_methods]
+    ))
+
+    repository = f"{namespace}\\Model\\ResourceModel\\{name}Repository"
+    classes.append(repository)
+    body = []
+    for method in repository_methods:
+        body += _method(method, f"$this->eventManager->dispatch('{events[0]}', ['entity' => $argument]);"
+                        if method == 'save' else
+                        f"$this->eventManager->dispatch('{events[1]}', ['entity' => $argument]);"
+                        if method == 'delete' else
+                        f"return $this->connection->select()->from($this->getTable('{entity_table}'));")
+    methods.update(repository_methods)
+    _write(base / 'Model' / 'ResourceModel' / f"{name}Repository.php", _php_class(
+        f"{namespace}\\Model\\ResourceModel", f"class {name}Repository implements \\{interface}", body
+    ))
+
+    # Model with standard model events from $_eventPrefix
+    model = f"{namespace}\\Model\\{name}"
+    classes.append(model)
+    events += [f"{snake}_save_after", f"{snake}_load_before", f"{snake}_delete_after"]
+    _write(base / 'Model' / f"{name}.php", _php_class(
+        f"{namespace}\\Model", f"class {name} extends \\Magento\\Framework\\Model\\AbstractModel",
+        [f"    protected $_eventPrefix = '{snake}';", '']
+        + _method('_construct', f"$this->_init('{entity_table}');")
+    ))
+
+    # Bulk entities: models, data interfaces and their resource models
+    for i in range(entities):
+        entity = f"{name}Entity{i:02d}"
+        entity_methods = [f"get{entity}Value{j}" for j in range(rng.randint(2, 6))]
+        table = f"{table_root}_entity_{letters(i, 2)}"
+        tables.append(table)
+        methods.update(entity_methods)
+
+        classes.append(f"{namespace}\\Model\\{entity}")
+        _write(base / 'Model' / f"{entity}.php", _php_class(
+            f"{namespace}\\Model", f"class {entity} extends \\Magento\\Framework\\Model\\AbstractModel",
+            [line for method in entity_methods for line in _method(method)]
+        ))
+
+        interfaces.append(f"{namespace}\\Api\\Data\\{entity}Interface")
+        _write(base / 'Api' / 'Data' / f"{entity}Interface.php", _php_class(
+            f"{namespace}\\Api\\Data", f"interface {entity}Interface",
+            [f"    public function {method}();" for method in entity_methods]
+        ))
+
+        classes.append(f"{namespace}\\Model\\ResourceModel\\{entity}")
+        _write(base / 'Model' / 'ResourceModel' / f"{entity}.php", _php_class(
+            f"{namespace}\\Model\\ResourceModel",
+            f"class {entity} extends \\Magento\\Framework\\Model\\ResourceModel\\Db\\AbstractDb",
+            _method('_construct', f"$this->_init('{table}', 'entity_id');")
+        ))
+
+    # Observer and its events.xml registration
+    observer = f"{namespace}\\Observer\\{name}LoginObserver"
+    classes.append(observer)
+    observed = f"{snake}_login"
+    events.append(observed)
+    _write(base / 'Observer' / f"{name}LoginObserver.php", _php_class(
+        f"{namespace}\\Observer",
+        f"class {name}LoginObserver implements \\Magento\\Framework\\Event\\ObserverInterface",
+        _method('execute')
+    ))
+    methods.add('execute')
+
+    _write(base / 'etc' / 'events.xml', '\n'.join([
+        '<?xml version="1.0"?>',
+        '<config xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:noNamespaceSchemaLocation="urn:magento:framework:Event/etc/events.xsd">',
+        f'    <event name="{observed}">',
+        f'        <observer name="{snake}_login_observer" instance="{observer}" />',
+        '    </event>',
+        f'    <event name="{events[0]}">',
+        f'        <observer name="{snake}_reindex" instance="{observer}" />',
+        '    </event>',
+        '</config>',
+        '',
+    ]))
+
+    _write(base / 'etc' / 'db_schema.xml', '\n'.join(
+        ['<?xml version="1.0"?>',
+         '<schema xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+         'xsi:noNamespaceSchemaLocation="urn:magento:framework:Setup/Declaration/Schema/etc/schema.xsd">']
+        + [line for table in tables for line in (
+            f'    <table name="{table}" resource="default" engine="innodb" comment="{table}">',
+            '        <column xsi:type="int" name="entity_id" unsigned="true" nullable="false" identity="true"/>',
+            '        <constraint xsi:type="primary" referenceId="PRIMARY"><column name="entity_id"/></constraint>',
+            '    </table>',
+        )]
+        + ['</schema>', '']
+    ))
+
+    acl_resources = [f"Magento_{name}::{snake}", f"Magento_{name}::manage"]
+    _write(base / 'etc' / 'acl.xml', '\n'.join([
+        '<?xml version="1.0"?>',
+        '<config xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:noNamespaceSchemaLocation="urn:magento:framework:Acl/etc/acl.xsd">',
+        '    <acl>',
+        '        <resources>',
+        '            <resource id="Magento_Backend::admin">',
+        f'                <resource id="{acl_resources[0]}" title="{name}">',
+        f'                    <resource id="{acl_resources[1]}" title="Manage {name}"/>',
+        '                </resource>',
+        '            </resource>',
+        '        </resources>',
+        '    </acl>',
+        '</config>',
+        '',
+    ]))
+
+    _write(base / 'etc' / 'di.xml', '\n'.join([
+        '<?xml version="1.0"?>',
+        '<config xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:noNamespaceSchemaLocation="urn:magento:framework:ObjectManager/etc/config.xsd">',
+        f'    <preference for="{interface}" type="{repository}"/>',
+        '</config>',
+        '',
+    ]))
+
+    return Module(name, snake, base, classes, interfaces, sorted(methods), events, tables, acl_resources)
+
+
+def generate_tree(root: Path, modules: int, layout: str = 'vendor', entities: int = 8,
+                  seed: int = 0) -> List[Module]:
+    """Write a synthetic Magento tree with the given number of modules"""
+    rng = random.Random(seed)
+    if layout == 'app':
+        base = root / 'app' / 'code' / 'Magento'
+        return [generate_module(base / name, name, entities, rng) for name in module_names(modules)]
+    base = root / 'vendor' / 'mage-os'
+    return [generate_module(base / f"module-{name.lower()}", name, entities, rng)
+            for name in module_names(modules)]
+
+
+def _page(module: Module, page: int, rng: random.Random, claims_per_kind: int) -> str:
+    def pick(items: List[str]) -> List[str]:
+        return rng.sample(items, min(claims_per_kind, len(items)))
+
+    # Roughly one claim in four refers to something that does not exist
+    missing = max(1, claims_per_kind // 4)
+    namespace = f"Magento\\{module.name}"
+    classes = pick(module.classes) + [f"{namespace}\\Model\\Missing{page}{i}" for i in range(missing)]
+    interfaces = pick(module.interfaces) + [f"{namespace}\\Api\\Missing{page}{i}Interface" for i in range(missing)]
+    methods = pick(module.methods) + [f"missingMethod{page}{i}" for i in range(missing)]
+    events = pick(module.events) + [f"{module.snake}_missing_{letters(page * missing + i)}_after"
+                                    for i in range(missing)]
+    tables = pick(module.tables) + [f"{module.tables[0]}_missing_{letters(page * missing + i)}"
+                                    for i in range(missing)]
+
+    sections = [
+        f"<h2>{module.name} {kind}</h2>\n<p>The {module.name} module relies on the following {kind}. "
+        f"Each entry below is referenced by the service contracts and the admin configuration.</p>\n"
+        + '\n'.join(f"<p>See <code>{item}</code> for details.</p>" for item in items)
+        for kind, items in (('classes', classes), ('interfaces', interfaces), ('events', events),
+                            ('tables', tables), ('ACL resources', module.acl_resources))
+    ]
+    calls = '\n'.join(f"$repository-&gt;{method}($argument);" for method in methods)
+
+    return '\n'.join([
+        '<!DOCTYPE html>',
+        '<html lang="en">',
+        f'<head><meta charset="utf-8"><title>Magento_{module.name} - Page {page}</title></head>',
+        '<body>',
+        f'<h1>Magento_{module.name} architecture, part {page}</h1>',
+        *sections,
+        '<h2>Usage</h2>',
+        f'<pre><code class="language-php">{calls}</code></pre>',
+        f'<p>Configuration lives in <code>etc/di.xml</code> and <code>{module.snake}/general/enabled</code>.</p>',
+        '</body>',
+        '</html>',
+        '',
+    ])
+
+
+def generate_docs(docs_root: Path, modules: List[Module], pages_per_module: int = 2,
+                  claims_per_kind: int = 6, seed: int = 0) -> List[Path]:
+    """Write docs/modules/Magento_<Module>/html/page-N.html pages; return their paths"""
+    rng = random.Random(seed)
+    pages = []
+    for module in modules:
+        for page in range(pages_per_module):
+            path = docs_root / 'modules' / f"Magento_{module.name}" / 'html' / f"page-{page}.html"
+            _write(path, _page(module, page, rng, claims_per_kind))
+            pages.append(path)
+    return pages
+
+
+def tree_stats(root: Path) -> Dict[str, Any]:
+    files = [path for path in root.rglob('*') if path.is_file()]
+    return {'files': len(files), 'bytes': sum(path.stat().st_size for path in files)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Magento source tree and docs')
+    parser.add_argument('output', type=Path, help='directory to create the tree in')
+    parser.add_argument('--modules', type=int, default=10, help='number of modules (default: 10)')
+    parser.add_argument('--layout', choices=['vendor', 'app'], default='vendor')
+    parser.add_argument('--entities', type=int, default=8, help='entity classes per module (default: 8)')
+    parser.add_argument('--pages', type=int, default=2, help='documentation pages per module (default: 2)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    modules = generate_tree(args.output / 'magento', args.modules, args.layout, args.entities, args.seed)
+    pages = generate_docs(args.output / 'docs', modules, args.pages, seed=args.seed)
+    stats = tree_stats(args.output / 'magento')
+
+    print(f"Magento root: {args.output / 'magento'} ({args.layout} layout)")
+    print(f"  Modules: {len(modules)}")
+    print(f"  Files: {stats['files']} ({stats['bytes'] / 1e6:.2f} MB)")
+    print(f"Docs: {args.output / 'docs'} ({len(pages)} pages)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+A graph file given as the Magento root validates with the result cache on,
+the cache living next to the graph file.
+
+Run with: python -m pytest validation/tests
+"""
+
+import sys
+import shutil
+import subprocess
+import unittest
+import tempfile
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent / 'tools'
+GRAPH = TOOLS.parent.parent / 'data' / 'Magento_Sales-graph.json'
+
+sys.path.insert(0, str(TOOLS))
+
+from archive_source import sidecar_path
+from claims_io import load_document
+from result_cache import CACHE_FILENAME
+
+
+CLAIMS = """\
+source_document: sales.html
+claims:
+  php_interfaces:
+  - Magento\\Sales\\Api\\Data\\CreditmemoCommentInterface
+  - Magento\\Sales\\Api\\NoSuchInterface
+"""
+
+
+class GraphRootCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='graph-root-'))
+        self.graph = self.tmp / GRAPH.name
+        shutil.copy(GRAPH, self.graph)
+        self.claims = self.tmp / 'sales_claims.yaml'
+        self.claims.write_text(CLAIMS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def run_tool(self, *args: str) -> subprocess.CompletedProcess:
+        process = subprocess.run([sys.executable, str(TOOLS / 'mage_validate.py'), *args],
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        self.assertEqual(process.returncode, 0, process.stdout)
+        return process
+
+    def test_sidecar_of_a_file_is_a_sibling(self):
+        self.assertEqual(sidecar_path(self.graph, CACHE_FILENAME),
+                         self.tmp / f"{GRAPH.name}{CACHE_FILENAME}")
+        self.assertEqual(sidecar_path(self.tmp, CACHE_FILENAME), self.tmp / CACHE_FILENAME)
+
+    def test_validate_uses_a_cache_next_to_the_graph(self):
+        output = self.tmp / 'sales_validation.yaml'
+        for expected in ({'hits': 0, 'misses': 2}, {'hits': 2, 'misses': 0}):
+            self.run_tool('validate', str(self.claims), str(self.graph), str(output))
+            results = load_document(output)
+            self.assertEqual(results['summary']['cache'], expected)
+            self.assertEqual(results['summary']['found'], 1)
+        self.assertTrue(sidecar_path(self.graph, CACHE_FILENAME).is_file())
+
+    def test_batch_uses_a_cache_next_to_the_graph(self):
+        for expected in ('0 hits, 2 misses', '2 hits, 0 misses'):
+            process = self.run_tool('batch', str(self.graph), str(self.claims), '--workers', '1')
+            self.assertIn(f"Cache: {expected}", process.stdout)
+        self.assertEqual(load_document(self.tmp / 'sales_validation.yaml')['summary']['found'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
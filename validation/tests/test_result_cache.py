@@ -0,0 +1,114 @@
+"""
+A rerun reuses cached results until their evidence changes: an edited
+evidence file re-validates the claims it supports, and a new file makes
+not-found claims be validated again.
+
+Run with: python -m pytest validation/tests
+"""
+
+import sys
+import shutil
+import unittest
+import tempfile
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent / 'tools'
+
+sys.path.insert(0, str(TOOLS))
+sys.path.insert(0, str(TOOLS.parent / 'benchmarks'))
+
+from claims_io import dump_document
+from result_cache import ResultCache
+from synthetic_tree import generate_tree
+from validate_claims import MagentoValidator, validate_claims_file
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='result-cache-'))
+        self.root = self.tmp / 'magento'
+        module = generate_tree(self.root, 2)[0]
+        self.module = module
+        self.claims = self.tmp / 'page_claims.yaml'
+        dump_document({
+            'source_document': 'page.html',
+            'claims': {
+                'php_classes': module.classes[:2],
+                'methods': module.methods[:2] + ['missingMethod'],
+            },
+        }, self.claims)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def validate(self, **options) -> dict:
+        validator = MagentoValidator(self.root, index_path=self.tmp / 'index.sqlite', **options)
+        cache = ResultCache(self.tmp / 'cache.sqlite', validator)
+        try:
+            return validate_claims_file(self.claims, self.root, validator=validator, cache=cache)
+        finally:
+            cache.close()
+
+    def records(self, results: dict):
+        for claim_type, summary in results['results_by_type'].items():
+            for record in summary['results']:
+                yield claim_type, record
+
+    def found(self, results: dict, claim_type: str, claim: str) -> bool:
+        return next(record['found'] for kind, record in self.records(results)
+                    if (kind, record['claim']) == (claim_type, claim))
+
+    def check_rerun(self, **options):
+        first = self.validate(**options)
+        self.assertEqual(first['summary']['cache'], {'hits': 0, 'misses': 5})
+        second = self.validate(**options)
+        self.assertEqual(second['summary']['cache'], {'hits': 5, 'misses': 0})
+        self.assertEqual({**second, 'summary': {}}, {**first, 'summary': {}})
+
+    def check_edited_evidence(self, **options):
+        results = self.validate(**options)
+        claim = next(record for kind, record in self.records(results) if kind == 'php_classes')
+        edited_id = claim['evidence'][0][0]
+        edited = Path(results['source_root']) / results['files'][edited_id]
+        # Claims citing the edited file, and not-found claims (any change may make them found), are re-validated
+        stale = sum(1 for _, record in self.records(results)
+                    if not record['found'] or any(file_id == edited_id for file_id, _ in record['evidence']))
+        self.assertLess(stale, 5)
+        with open(edited, 'a') as handle:
+            handle.write('\n// edited\n')
+
+        results = self.validate(**options)
+        self.assertEqual(results['summary']['cache'], {'hits': 5 - stale, 'misses': stale})
+        self.assertTrue(self.found(results, 'php_classes', claim['claim']))
+
+    def check_new_file(self, **options):
+        self.assertFalse(self.found(self.validate(**options), 'methods', 'missingMethod'))
+        added = self.module.path / 'Model' / 'Added.php'
+        added.write_text("<?php\nclass Added\n{\n    public function missingMethod()\n    {\n    }\n}\n")
+
+        results = self.validate(**options)
+        self.assertTrue(self.found(results, 'methods', 'missingMethod'))
+        self.assertEqual(results['summary']['cache']['misses'], 1)
+
+    def test_unchanged_tree_is_served_from_the_cache(self):
+        self.check_rerun()
+
+    def test_unchanged_tree_is_served_from_the_cache_without_index(self):
+        self.check_rerun(use_index=False)
+
+    def test_edited_evidence_file_revalidates_its_claims(self):
+        self.check_edited_evidence()
+
+    def test_edited_evidence_file_revalidates_its_claims_without_index(self):
+        self.check_edited_evidence(use_index=False)
+
+    def test_new_file_revalidates_not_found_claims(self):
+        self.check_new_file()
+
+    def test_new_file_revalidates_not_found_claims_without_index(self):
+        self.check_new_file(use_index=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+The symbol index and every --no-index search tool validate a claims file
+to the same results: same verdicts, evidence, evidence order and notes.
+
+Run with: python -m pytest validation/tests
+"""
+
+import sys
+import shutil
+import unittest
+import tempfile
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent / 'tools'
+
+sys.path.insert(0, str(TOOLS))
+sys.path.insert(0, str(TOOLS.parent / 'benchmarks'))
+
+from claims_io import dump_document
+from synthetic_tree import generate_tree
+from validate_claims import MagentoValidator, validate_claims_file
+
+
+def claims_document(modules) -> dict:
+    """Claims of every kind for two modules, found and not found"""
+    claims = {'php_classes': [], 'php_interfaces': [], 'methods': [], 'events': [], 'database_tables': []}
+    for module in modules[:2]:
+        claims['php_classes'] += module.classes[:3] + [f"Magento\\{module.name}\\Model\\Missing"]
+        claims['php_interfaces'] += module.interfaces[:3] + [f"Magento\\{module.name}\\Api\\MissingInterface"]
+        claims['methods'] += module.methods[:3]
+        claims['events'] += module.events[:3] + [f"{module.snake}_missing_after"]
+        claims['database_tables'] += module.tables[:3] + [f"{module.snake}_missing"]
+    # 'delete' is a prefix of 'deleteById', which the tree also defines
+    claims['methods'] += ['delete', 'deleteById', 'missingMethod']
+    return {'source_document': 'page.html', 'claims': {kind: sorted(set(items)) for kind, items in claims.items()}}
+
+
+class SearchBackendParityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = Path(tempfile.mkdtemp(prefix='search-backends-'))
+        cls.root = cls.tmp / 'magento'
+        modules = generate_tree(cls.root, 4)
+        cls.claims = cls.tmp / 'page_claims.yaml'
+        dump_document(claims_document(modules), cls.claims)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def validate(self, **options) -> dict:
+        validator = MagentoValidator(self.root, index_path=self.tmp / 'index.sqlite', **options)
+        return validate_claims_file(self.claims, self.root, validator=validator)
+
+    def method(self, results: dict, name: str) -> dict:
+        return next(record for record in results['results_by_type']['methods']['results'] if record['claim'] == name)
+
+    def test_index_finds_methods_by_their_whole_name(self):
+        results = self.validate()
+        delete = self.method(results, 'delete')
+        self.assertTrue(delete['found'])
+        delete_by_id = self.method(results, 'deleteById')
+        self.assertFalse(set(delete['evidence']) & set(delete_by_id['evidence']))
+        self.assertFalse(self.method(results, 'missingMethod')['found'])
+
+    def test_search_tools_match_the_index(self):
+        expected = self.validate()
+        tools = ['scan'] + [tool for tool in ('rg', 'grep') if shutil.which(tool)]
+        for tool in tools:
+            with self.subTest(search_tool=tool):
+                self.assertEqual(self.validate(use_index=False, search_tool=tool), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Archive Source Trees
+Read-only access to a Magento source tree packed in a tar or zip archive.
+
+Lets MagentoValidator take a source snapshot (.tar, .tar.gz/.tgz, .tar.bz2,
+.tar.xz, .zip) as its root without extracting it:
+- The source root inside the archive (app/code/Magento, vendor/magento,
+  vendor/mage-os or bare module-* directories, under any wrapper directory)
+  is detected from the member names
+- The symbol index is built from the root's PHP and XML members, read in
+  archive order, and stored next to the archive together with the
+  archive's size and mtime; later runs reuse it without opening the archive.
+  Building it passes over a tar twice: tar has no central directory, so
+  listing the members reads the whole archive, and the member reads then
+  go back to the start (a compressed tar is decompressed twice). A zip is
+  listed from its central directory and read once
+- read() seeks back to a single member, e.g. to show an evidence line
+
+Validation against an archive always uses the symbol index; rg/grep need
+real files.
+"""
+
+import os
+import re
+import sys
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from symbol_index import INDEX_FILENAME, SourceFile, SymbolIndex
+
+if TYPE_CHECKING:
+    # Imported when an archive is first opened; source-tree runs never need them
+    import tarfile
+    import zipfile
+
+
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.zip')
+
+# Same preference order as MagentoValidator's directory detection
+SOURCE_ROOT_PATTERNS = [
+    (re.compile(r'^(?P<root>(?:[^/]+/)*?app/code/Magento)/Customer/'), 'app'),
+    (re.compile(r'^(?P<root>(?:[^/]+/)*?vendor/magento)/module-customer/'), 'vendor'),
+    (re.compile(r'^(?P<root>(?:[^/]+/)*?vendor/mage-os)/module-customer/'), 'vendor'),
+    (re.compile(r'^(?P<root>(?:[^/]+/)*?)module-customer/'), 'vendor'),
+]
+
+Member = Union['tarfile.TarInfo', 'zipfile.ZipInfo']
+
+
+def is_archive(path: Path) -> bool:
+    return path.name.endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def sidecar_path(magento_root: Path, filename: str) -> Path:
+    """Where a per-tree state file (index, cache) lives: inside a directory, next to a file
+
+    A root that is a file (an archive, or a graph JSON) gets a sibling named after it,
+    e.g. data/Magento_Sales-graph.json.validation-cache.sqlite.
+    """
+    if is_archive(magento_root) or magento_root.is_file():
+        return magento_root.with_name(magento_root.name + filename)
+    return magento_root / filename
+
+
+class ArchiveSource:
+    """Members of one tar or zip archive, listed once and read on demand"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._tar: Optional['tarfile.TarFile'] = None
+        self._zip: Optional['zipfile.ZipFile'] = None
+        self._members: Optional[Dict[str, Member]] = None
+
+    def stamp(self) -> str:
+        """Size and mtime of the archive file; the index is refreshed when it changes"""
+        st = os.stat(self.path)
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def _open(self):
+        if self._tar is None and self._zip is None:
+            import tarfile
+            import zipfile
+            if zipfile.is_zipfile(self.path):
+                self._zip = zipfile.ZipFile(self.path)
+            else:
+                # 'r:*' stays seekable, so read() can go back to a member later
+                self._tar = tarfile.open(self.path, 'r:*')
+
+    def members(self) -> Dict[str, Member]:
+        """Regular file members by name, in archive order"""
+        if self._members is None:
+            self._open()
+            if self._zip is not None:
+                self._members = {info.filename: info for info in self._zip.infolist() if not info.is_dir()}
+            else:
+                # One pass over the headers; tar has no central directory
+                self._members = {info.name[2:] if info.name.startswith('./') else info.name: info
+                                 for info in self._tar.getmembers() if info.isfile()}
+        return self._members
+
+    def source_root(self) -> Tuple[str, str]:
+        """(root prefix inside the archive, path style) of the Magento source tree"""
+        names = list(self.members())
+        for pattern, style in SOURCE_ROOT_PATTERNS:
+            roots = [match.group('root').rstrip('/') for match in map(pattern.match, names) if match]
+            if roots:
+                return min(roots, key=len), style
+        raise FileNotFoundError(f"Magento source not found in archive {self.path}")
+
+    def _mtime_ns(self, info: Member) -> int:
+        if self._zip is not None:
+            import calendar
+            return calendar.timegm(info.date_time + (0, 0, 0)) * 10**9
+        return int(info.mtime) * 10**9
+
+    def _read_member(self, info: Member) -> bytes:
+        if self._zip is not None:
+            return self._zip.read(info)
+        return self._tar.extractfile(info).read()
+
+    def source_files(self, prefix: str) -> Iterator[SourceFile]:
+        """(relative_path, mtime_ns, size, read) for the PHP and XML members under prefix
+
+        Members come in archive order, so reading each changed one in turn
+        only moves forward through the archive after the first read.
+        """
+        start = len(prefix) + 1 if prefix else 0
+        for name, info in self.members().items():
+            if name.endswith(('.php', '.xml')) and (not prefix or name.startswith(prefix + '/')):
+                rel_path = name[start:]
+                if any(part.startswith('.') for part in rel_path.split('/')[:-1]):
+                    # Hidden directories are skipped, as in walk_source_files()
+                    continue
+                yield rel_path, self._mtime_ns(info), info.file_size if self._zip else info.size, \
+                    partial(self._read_member, info)
+
+    def read(self, name: str) -> bytes:
+        """Content of one member by its full name inside the archive"""
+        info = self.members().get(name)
+        if info is None:
+            raise FileNotFoundError(f"{name} not in {self.path}")
+        return self._read_member(info)
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+        if self._zip is not None:
+            self._zip.close()
+        self._tar = self._zip = None
+
+
+def open_archive_index(archive: ArchiveSource, index_path: Path = None, rebuild: bool = False,
+                       read_only: bool = False, shared: Sequence[SymbolIndex] = ()) -> Tuple[SymbolIndex, str, str]:
+    """Open the symbol index of an archive, streaming the archive only if it changed
+
+    Returns (index, source root prefix inside the archive, path style). The
+    detected root is stored in the index, so a fresh index needs no archive
+    access at all. A read-only index must already have been built.
+    """
+    if index_path is None:
+        index_path = sidecar_path(archive.path, INDEX_FILENAME)
+
+    index = SymbolIndex(archive.path, index_path, read_only=read_only)
+    stamp = archive.stamp()
+    root = index.meta('archive_root')
+
+    if root is None or rebuild or (not read_only and index.meta('archive_stamp') != stamp):
+        if read_only:
+            raise FileNotFoundError(f"No symbol index built for {archive.path} at {index_path}")
+        prefix, style = archive.source_root()
+        if rebuild:
+            index.clear()
+        index.refresh(files=archive.source_files(prefix), shared=shared)
+        index.set_meta('archive_root', f"{style}:{prefix}")
+        index.set_meta('archive_stamp', stamp)
+    else:
+        style, _, prefix = root.partition(':')
+
+    index.source_path = archive.path / prefix if prefix else archive.path
+    return index, prefix, style
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: archive_source.py <archive> [member ...]")
+        print("Example: archive_source.py magento-2.4.7.tar.gz module-customer/etc/acl.xml")
+        sys.exit(1)
+
+    archive = ArchiveSource(Path(sys.argv[1]))
+    prefix, style = archive.source_root()
+    print(f"Archive: {archive.path}")
+    print(f"  Source root: {prefix or '.'} ({style} layout)")
+    print(f"  PHP/XML files: {sum(1 for _ in archive.source_files(prefix))}")
+
+    # Members are given relative to the source root, like evidence paths
+    for rel_path in sys.argv[2:]:
+        print()
+        print(f"{rel_path}:")
+        sys.stdout.write(archive.read(f"{prefix}/{rel_path}" if prefix else rel_path).decode('utf-8', errors='replace'))
+    archive.close()
+
+
+if __name__ == '__main__':
+    main()
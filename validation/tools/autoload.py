@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+PSR-4 Autoload Map
+Resolves class and interface names to their files the way Composer does.
+
+The map is read from, in order of preference:
+- vendor/composer/autoload_psr4.php (the installed project's generated map)
+- composer.json "autoload.psr-4" sections of the project and of every
+  module/package found under the source tree
+
+Resolving a name is a dictionary lookup per namespace level, longest prefix
+first, so class validation needs no tree search for mapped namespaces.
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+AUTOLOAD_PSR4 = Path('vendor') / 'composer' / 'autoload_psr4.php'
+
+# 'Magento\\Customer\\' => array($vendorDir . '/magento/module-customer'),
+PSR4_ENTRY_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'\s*=>\s*array\((.*?)\)", re.DOTALL)
+PSR4_DIR_PATTERN = re.compile(r"(?:\$(vendorDir|baseDir)\s*\.\s*)?'([^']*)'")
+
+
+class Psr4Map:
+    """Namespace prefix -> base directories, as registered with Composer"""
+
+    def __init__(self):
+        self.prefixes: Dict[str, List[Path]] = {}
+        self.source: Optional[Path] = None
+
+    def add(self, prefix: str, directories: Iterable[Path]):
+        """Register base directories for a namespace prefix ('Magento\\Customer\\')"""
+        prefix = prefix.strip('\\')
+        if not prefix:
+            # Fallback directories would map every name; leave those to search
+            return
+        registered = self.prefixes.setdefault(prefix, [])
+        for directory in directories:
+            if directory not in registered:
+                registered.append(directory)
+
+    def resolve(self, class_name: str) -> Optional[List[Path]]:
+        """Candidate files for a fully qualified class name, longest prefix first
+
+        Returns None when no registered prefix covers the namespace.
+        """
+        parts = class_name.strip('\\').split('\\')
+        candidates = None
+
+        for i in range(len(parts) - 1, 0, -1):
+            directories = self.prefixes.get('\\'.join(parts[:i]))
+            if directories:
+                relative = '/'.join(parts[i:]) + '.php'
+                candidates = (candidates or []) + [directory / relative for directory in directories]
+
+        return candidates
+
+    def __len__(self):
+        return len(self.prefixes)
+
+
+def _load_autoload_psr4(psr4_file: Path, magento_root: Path, psr4: Psr4Map):
+    with open(psr4_file, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    bases = {'vendorDir': magento_root / 'vendor', 'baseDir': magento_root}
+    for prefix, directories in PSR4_ENTRY_PATTERN.findall(text):
+        psr4.add(
+            prefix.replace('\\\\', '\\'),
+            (bases[var] / path.lstrip('/') if var else Path(path)
+             for var, path in PSR4_DIR_PATTERN.findall(directories))
+        )
+
+
+def _load_composer_json(composer_file: Path, psr4: Psr4Map):
+    try:
+        with open(composer_file, 'r', encoding='utf-8') as f:
+            package = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    mapping = (package.get('autoload') or {}).get('psr-4') or {}
+    if not isinstance(mapping, dict):
+        return
+
+    for prefix, paths in mapping.items():
+        if isinstance(paths, str):
+            paths = [paths]
+        psr4.add(prefix, (composer_file.parent / path for path in paths))
+
+
+def load_psr4(magento_root: Path, vendor_path: Path) -> Psr4Map:
+    """Build the PSR-4 map for a Magento tree (empty if nothing is registered)"""
+    psr4 = Psr4Map()
+
+    psr4_file = magento_root / AUTOLOAD_PSR4
+    if psr4_file.is_file():
+        _load_autoload_psr4(psr4_file, magento_root, psr4)
+        psr4.source = psr4_file
+        return psr4
+
+    composer_files = [magento_root / 'composer.json']
+    composer_files.extend(sorted(vendor_path.glob('*/composer.json')))
+    if (magento_root / 'vendor').is_dir():
+        composer_files.extend(sorted((magento_root / 'vendor').glob('*/*/composer.json')))
+
+    for composer_file in dict.fromkeys(composer_files):
+        if composer_file.is_file():
+            _load_composer_json(composer_file, psr4)
+
+    psr4.source = vendor_path
+    return psr4
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: autoload.py <magento_root> <class_name> [class_name ...]")
+        print("Example: autoload.py /path/to/magento 'Magento\\Customer\\Model\\Customer'")
+        sys.exit(1)
+
+    from validate_claims import MagentoValidator
+
+    validator = MagentoValidator(Path(sys.argv[1]), use_index=False)
+    print(f"PSR-4 map: {len(validator.autoload)} prefixes from {validator.autoload.source}")
+
+    for class_name in sys.argv[2:]:
+        candidates = validator.autoload.resolve(class_name)
+        if candidates is None:
+            print(f"  {class_name}: namespace not mapped")
+            continue
+        found = [path for path in candidates if path.is_file()]
+        print(f"  {class_name}: {found[0] if found else 'missing, expected ' + str(candidates[0])}")
+
+
+if __name__ == '__main__':
+    main()
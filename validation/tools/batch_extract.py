@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Batch Claims Extraction
+Regenerates *_claims.yaml for every docs/modules/*/html/*.html page.
+
+Pages are extracted in parallel worker processes. A page is skipped when
+its SHA-256 matches the source_sha256 recorded in its existing claims
+file, and that file was pruned at the same --min-score, so rerunning on
+unchanged docs only hashes the pages.
+
+Output layout mirrors the validation tree:
+  docs/modules/Magento_Customer/html/architecture.html
+  -> validation/Magento_Customer/architecture_claims.yaml
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+from extract_claims import (DEFAULT_MIN_SCORE, content_hash, extract_scored_claims_from_text,
+                            format_claims_for_validation, prune_claims, write_claims)
+from claims_io import load_document
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+VALIDATION_DIR = REPO_ROOT / 'validation'
+
+
+def find_pages(docs_dir: Path) -> List[Path]:
+    """Every module HTML page, excluding .backup copies"""
+    return sorted(path for path in docs_dir.glob('*/html/*.html') if not path.name.endswith('.backup'))
+
+
+def claims_path_for(page: Path, output_dir: Path) -> Path:
+    """docs/modules/<Module>/html/<page>.html -> <output_dir>/<Module>/<page>_claims.yaml"""
+    module = page.parent.parent.name
+    return output_dir / module / f"{page.stem}_claims.yaml"
+
+
+def recorded_hash(claims_file: Path) -> Tuple[Optional[str], Optional[float]]:
+    """source_sha256 and pruning min_score of an existing claims file, if any"""
+    if not claims_file.exists():
+        return None, None
+    claims_data = load_document(claims_file) or {}
+    return claims_data.get('source_sha256'), (claims_data.get('pruning') or {}).get('min_score')
+
+
+def _extract_one(page: Path, output_file: Path, source_hash: str, min_score: float) -> Tuple[Path, int, int]:
+    with open(page, 'r', encoding='utf-8') as f:
+        content = f.read()
+    claims, deferred = prune_claims(*extract_scored_claims_from_text(content), min_score)
+    validation_data = format_claims_for_validation(claims, page, source_hash, deferred, min_score)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    write_claims(validation_data, output_file)
+    total = sum(len(claims) for claims in validation_data['claims'].values())
+    return output_file, total, validation_data['pruning']['deferred']
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Extract claims from every module documentation page in parallel',
+        epilog='Example: batch_extract.py --workers 8'
+    )
+    parser.add_argument('--docs', type=Path, default=REPO_ROOT / 'docs' / 'modules',
+                        help='module docs directory (default: docs/modules)')
+    parser.add_argument('--output-dir', type=Path, default=VALIDATION_DIR,
+                        help='validation directory receiving <Module>/<page>_claims.yaml (default: validation/)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--force', action='store_true',
+                        help='re-extract pages even if their content hash is unchanged')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help=f'defer method, event and table claims whose context score is below this, '
+                             f'0 keeps every claim (default: {DEFAULT_MIN_SCORE})')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    pages = find_pages(args.docs)
+    if not pages:
+        print(f"Error: No HTML pages found under {args.docs}")
+        sys.exit(1)
+
+    pending = []
+    for page in pages:
+        output_file = claims_path_for(page, args.output_dir)
+        source_hash = content_hash(page.read_text(encoding='utf-8'))
+        if args.force or recorded_hash(output_file) != (source_hash, args.min_score):
+            pending.append((page, output_file, source_hash, args.min_score))
+
+    print(f"Pages: {len(pages)} ({len(pages) - len(pending)} unchanged, {len(pending)} to extract)")
+
+    deferred_total = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(pending))) as pool:
+            futures = [pool.submit(_extract_one, *job) for job in pending]
+            for future in as_completed(futures):
+                output_file, total, deferred = future.result()
+                deferred_total += deferred
+                print(f"  {output_file} ({total} claims, {deferred} deferred)")
+        print(f"Deferred: {deferred_total} claims scoring below {args.min_score}")
+
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Batch Validation Driver
+Validates every *_claims.yaml under the validation tree in parallel.
+
+Finds claims files under validation/Magento_* and validation/revalidation/*
+(or the paths given on the command line), builds the symbol index once in
+the parent process and spreads the work across a process pool whose
+workers share that index read-only.
+
+By default a planning stage first collects the unique (claim type, claim)
+pairs across all documents, so an identifier like customer_entity that
+appears in a dozen documents is validated once. Each *_validation.yaml is
+written from the shared results as soon as all of its claims are done.
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Tuple
+
+from validate_claims import (
+    CLAIM_VALIDATORS, FileTable, MagentoValidator, ValidationResult, build_results, validate_claim_list,
+    validate_claims_file, write_results
+)
+from result_cache import ResultCache, CACHE_FILENAME
+from snippets import open_snippet_reader
+from archive_source import sidecar_path
+from search_executor import DEFAULT_TIMEOUT, SearchToolError, require_tool
+from tree_scanner import SCAN_TOOL
+from claims_io import FORMAT_EXTENSIONS, load_document
+
+
+VALIDATION_DIR = Path(__file__).resolve().parent.parent
+
+# Validator, result cache and snippet reader owned by each worker process, created once by _init_worker
+_worker_validator = None
+_worker_cache = None
+_worker_snippets = None
+
+
+def find_claims_files(paths: List[Path]) -> List[Path]:
+    """Collect *_claims.yaml files from files and directories"""
+    found = set()
+    for path in paths:
+        if path.is_file():
+            found.add(path)
+        elif path.is_dir():
+            for extension in FORMAT_EXTENSIONS.values():
+                found.update(path.rglob(f'*_claims{extension}'))
+    return sorted(found)
+
+
+def default_search_paths() -> List[Path]:
+    """Per-module claim directories, first validation and revalidation"""
+    return sorted(VALIDATION_DIR.glob('Magento_*')) + sorted((VALIDATION_DIR / 'revalidation').glob('*'))
+
+
+def output_path_for(claims_file: Path, output_format: str = 'yaml') -> Path:
+    """architecture_claims.yaml -> architecture_validation.yaml (or .ndjson/.msgpack)"""
+    stem = claims_file.name[:-len(f'_claims{claims_file.suffix}')]
+    return claims_file.parent / f"{stem}_validation{FORMAT_EXTENSIONS[output_format]}"
+
+
+def _init_worker(magento_root: Path, use_index: bool, index_path: Path, cache_path: Path,
+                 search_jobs: int, search_timeout: float, snippets: int = 0, search_tool: str = SCAN_TOOL):
+    global _worker_validator, _worker_cache, _worker_snippets
+    _worker_validator = MagentoValidator(magento_root, use_index=use_index, index_path=index_path,
+                                         read_only_index=use_index, search_jobs=search_jobs,
+                                         search_timeout=search_timeout, search_tool=search_tool)
+    if cache_path is not None:
+        _worker_cache = ResultCache(cache_path, _worker_validator)
+    if snippets:
+        _worker_snippets = open_snippet_reader(magento_root, _worker_validator.vendor_path, snippets)
+
+
+def _validate_one(claims_file: Path, magento_root: Path) -> Tuple[Path, Dict[str, Any], int, float]:
+    start = time.perf_counter()
+    if _worker_cache is not None:
+        _worker_cache.hits = _worker_cache.misses = 0
+    results = validate_claims_file(claims_file, magento_root, validator=_worker_validator, cache=_worker_cache,
+                                   snippets=_worker_snippets)
+    return claims_file, results, os.getpid(), time.perf_counter() - start
+
+
+def _validate_pairs(claim_type: str, claims: List[str]) -> Tuple[str, Dict[str, Dict[str, Any]], Dict[str, int], int, float]:
+    start = time.perf_counter()
+    cache_counts = {'hits': 0, 'misses': 0}
+    if _worker_cache is not None:
+        _worker_cache.hits = _worker_cache.misses = 0
+    validated = validate_claim_list(_worker_validator, claim_type, claims, _worker_cache)
+    if _worker_cache is not None:
+        _worker_cache.flush()
+        cache_counts = {'hits': _worker_cache.hits, 'misses': _worker_cache.misses}
+    # Evidence travels as relative paths; file ids are only meaningful inside one process
+    results = {claim: result.to_record(_worker_validator.files) for claim, result in validated.items()}
+    return claim_type, results, cache_counts, os.getpid(), time.perf_counter() - start
+
+
+def plan_claims(claims_files: List[Path]) -> Tuple[Dict[Path, Dict[str, Any]], Dict[str, List[str]], int]:
+    """Load every claims file and collect the unique claims per type
+
+    Returns (claims data per file, unique claims per type, total claim occurrences).
+    """
+    documents = {}
+    unique: Dict[str, set] = {}
+    occurrences = 0
+
+    for claims_file in claims_files:
+        claims_data = load_document(claims_file)
+        documents[claims_file] = claims_data
+
+        for claim_type, claim_list in (claims_data.get('claims') or {}).items():
+            if claim_list and claim_type in CLAIM_VALIDATORS:
+                unique.setdefault(claim_type, set()).update(claim_list)
+                occurrences += len(claim_list)
+
+    return documents, {claim_type: sorted(claims) for claim_type, claims in unique.items()}, occurrences
+
+
+def _document_pairs(claims_data: Dict[str, Any]) -> set:
+    return {
+        (claim_type, claim)
+        for claim_type, claim_list in (claims_data.get('claims') or {}).items()
+        if claim_list and claim_type in CLAIM_VALIDATORS
+        for claim in claim_list
+    }
+
+
+def _prepare_index(magento_root: Path, use_index: bool, index_path: Path,
+                   rebuild_index: bool) -> Tuple[Path, Path]:
+    """Build or refresh the shared index once, before any worker opens it
+
+    Returns (index path, source tree the evidence paths are relative to).
+    """
+    validator = MagentoValidator(magento_root, use_index=use_index, index_path=index_path,
+                                 rebuild_index=rebuild_index)
+    if validator.index is not None:
+        index_path = validator.index.index_path
+        validator.index.close()
+    return index_path, validator.vendor_path
+
+
+def _search_jobs_per_worker(workers: int, search_jobs: int = None) -> int:
+    """Concurrent searches per worker, sharing the cores between worker processes by default"""
+    return search_jobs or max(1, (os.cpu_count() or 1) // workers)
+
+
+def _record_worker(per_worker: Dict[int, Dict[str, float]], pid: int, files: int, claims: int, seconds: float):
+    stats = per_worker.setdefault(pid, {'files': 0, 'claims': 0, 'seconds': 0.0})
+    stats['files'] += files
+    stats['claims'] += claims
+    stats['seconds'] += seconds
+
+
+def run_dedup_batch(claims_files: List[Path], magento_root: Path, workers: int, use_index: bool = True,
+                    index_path: Path = None, rebuild_index: bool = False, cache_path: Path = None,
+                    output_format: str = 'yaml', search_jobs: int = None,
+                    search_timeout: float = DEFAULT_TIMEOUT, snippets: int = 0,
+                    search_tool: str = SCAN_TOOL) -> Dict[str, Any]:
+    """Validate each unique (claim type, claim) once and write every document from the shared results
+
+    Documents are written by this process, so its one snippet reader serves every document.
+    """
+
+    wall_start = time.perf_counter()
+    index_path, vendor_path = _prepare_index(magento_root, use_index, index_path, rebuild_index)
+    index_seconds = time.perf_counter() - wall_start
+
+    documents, unique, occurrences = plan_claims(claims_files)
+    unique_total = sum(len(claims) for claims in unique.values())
+
+    pending = {claims_file: _document_pairs(claims_data) for claims_file, claims_data in documents.items()}
+    validated: Dict[Tuple[str, str], ValidationResult] = {}
+    files = FileTable(vendor_path)
+    snippet_reader = open_snippet_reader(magento_root, vendor_path, snippets) if snippets else None
+    per_worker: Dict[int, Dict[str, float]] = {}
+    cache_totals = {'hits': 0, 'misses': 0}
+    total_claims = 0
+    timed_out = 0
+
+    def write_ready():
+        nonlocal total_claims, timed_out
+        for claims_file in [f for f, pairs in pending.items() if not pairs]:
+            del pending[claims_file]
+            results = build_results(documents[claims_file], magento_root, validated, files, snippet_reader)
+            output_file = output_path_for(claims_file, output_format)
+            write_results(results, output_file)
+            total_claims += results['summary']['total_claims']
+            timed_out += results['summary']['timed_out']
+            print(f"  {output_file} ({results['summary']['total_claims']} claims)")
+
+    # Documents with nothing to validate are written straight away
+    write_ready()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(magento_root, use_index, index_path, cache_path,
+                                       _search_jobs_per_worker(workers, search_jobs), search_timeout,
+                                       0, search_tool)) as pool:
+        futures = {}
+        for claim_type, claims in unique.items():
+            if use_index:
+                # Several chunks per worker keeps the pool busy when claim types differ in cost
+                chunk_size = max(1, math.ceil(len(claims) / (workers * 4)))
+            else:
+                # Search mode reads the whole tree once per chunk (prefetch() batches a chunk's
+                # searches into one pass), so each claim type is validated as one chunk
+                chunk_size = max(1, len(claims))
+            for i in range(0, len(claims), chunk_size):
+                chunk = claims[i:i + chunk_size]
+                futures[pool.submit(_validate_pairs, claim_type, chunk)] = chunk
+
+        for future in as_completed(futures):
+            claim_type, results, cache_counts, pid, seconds = future.result()
+            for claim, record in results.items():
+                validated[(claim_type, claim)] = ValidationResult.from_record(record, files)
+            # Claims of types the validator cannot answer come back without a result
+            done = {(claim_type, claim) for claim in futures[future]}
+            for pairs in pending.values():
+                pairs -= done
+            for key, count in cache_counts.items():
+                cache_totals[key] += count
+            _record_worker(per_worker, pid, 0, len(results), seconds)
+
+            write_ready()
+
+    if snippet_reader is not None:
+        snippet_reader.close()
+
+    return {
+        'files': len(claims_files),
+        'claims': total_claims,
+        'timed_out': timed_out,
+        'unique_claims': unique_total,
+        'dedup_ratio': occurrences / max(unique_total, 1),
+        'workers': workers,
+        'index_seconds': index_seconds,
+        'wall_seconds': time.perf_counter() - wall_start,
+        'per_worker': per_worker,
+        'cache': cache_totals if cache_path is not None else None,
+    }
+
+
+def run_batch(claims_files: List[Path], magento_root: Path, workers: int, use_index: bool = True,
+              index_path: Path = None, rebuild_index: bool = False, cache_path: Path = None,
+              output_format: str = 'yaml', search_jobs: int = None,
+              search_timeout: float = DEFAULT_TIMEOUT, snippets: int = 0,
+              search_tool: str = SCAN_TOOL) -> Dict[str, Any]:
+    """Validate claims files across a process pool, writing each result as it completes"""
+
+    wall_start = time.perf_counter()
+    index_path, _ = _prepare_index(magento_root, use_index, index_path, rebuild_index)
+    index_seconds = time.perf_counter() - wall_start
+
+    per_worker: Dict[int, Dict[str, float]] = {}
+    total_claims = 0
+    timed_out = 0
+    cache_totals = {'hits': 0, 'misses': 0}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(magento_root, use_index, index_path, cache_path,
+                                       _search_jobs_per_worker(workers, search_jobs), search_timeout,
+                                       snippets, search_tool)) as pool:
+        futures = [pool.submit(_validate_one, claims_file, magento_root) for claims_file in claims_files]
+
+        for future in as_completed(futures):
+            claims_file, results, pid, seconds = future.result()
+            output_file = output_path_for(claims_file, output_format)
+            write_results(results, output_file)
+
+            claims = results['summary']['total_claims']
+            total_claims += claims
+            timed_out += results['summary']['timed_out']
+            for key, count in results['summary'].get('cache', {}).items():
+                cache_totals[key] += count
+            _record_worker(per_worker, pid, 1, claims, seconds)
+
+            print(f"  {output_file} ({claims} claims, {seconds:.2f}s)")
+
+    return {
+        'files': len(claims_files),
+        'claims': total_claims,
+        'timed_out': timed_out,
+        'workers': workers,
+        'index_seconds': index_seconds,
+        'wall_seconds': time.perf_counter() - wall_start,
+        'per_worker': per_worker,
+        'cache': cache_totals if cache_path is not None else None,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Validate every *_claims.yaml file in parallel',
+        epilog='Example: batch_validate.py /path/to/magento --workers 8'
+    )
+    parser.add_argument('magento_root', type=Path)
+    parser.add_argument('paths', type=Path, nargs='*',
+                        help='claims files or directories (default: validation/Magento_* and validation/revalidation/*)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--per-file', action='store_true',
+                        help='validate each claims file independently instead of deduplicating claims across files')
+    parser.add_argument('--no-index', action='store_true',
+                        help='search the source tree files instead of using the symbol index')
+    parser.add_argument('--index', type=Path, dest='index_path',
+                        help='symbol index location (default: <magento_root>/.magento-symbols.sqlite)')
+    parser.add_argument('--rebuild-index', action='store_true',
+                        help='discard the symbol index and rebuild it from scratch')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-validate every claim instead of reusing unchanged cached results')
+    parser.add_argument('--cache', type=Path, dest='cache_path',
+                        help='result cache location (default: .validation-cache.sqlite in magento_root, '
+                             'or next to it if it is a file)')
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='yaml',
+                        help='validation output format (default: yaml)')
+    parser.add_argument('--search-tool', choices=[SCAN_TOOL, 'rg', 'grep'], default=SCAN_TOOL,
+                        help='how --no-index searches files: in-process, or with rg/grep subprocesses '
+                             f'(default: {SCAN_TOOL})')
+    parser.add_argument('--search-jobs', type=int,
+                        help='scanner threads or concurrent rg/grep processes per worker with --no-index '
+                             '(default: cores / workers)')
+    parser.add_argument('--search-timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'first deadline per rg/grep search in seconds, doubled on each retry '
+                             f'(default: {DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--snippets', type=int, default=0, metavar='N',
+                        help='attach N lines of source before and after each evidence line')
+    args = parser.parse_args(argv)
+
+    if not args.magento_root.exists():
+        print(f"Error: Magento root not found: {args.magento_root}")
+        sys.exit(1)
+
+    claims_files = find_claims_files(args.paths or default_search_paths())
+    if not claims_files:
+        print("Error: No *_claims files found")
+        sys.exit(1)
+
+    if args.search_tool != SCAN_TOOL:
+        # Checked here rather than in every worker's initializer
+        try:
+            require_tool(args.search_tool)
+        except SearchToolError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    print(f"Validating {len(claims_files)} claims files with {args.workers} workers...")
+    print(f"Magento root: {args.magento_root}")
+    print()
+
+    cache_path = None if args.no_cache else args.cache_path or sidecar_path(args.magento_root, CACHE_FILENAME)
+    run = run_batch if args.per_file else run_dedup_batch
+    stats = run(claims_files, args.magento_root, args.workers, use_index=not args.no_index,
+                index_path=args.index_path, rebuild_index=args.rebuild_index, cache_path=cache_path,
+                output_format=args.format, search_jobs=args.search_jobs, search_timeout=args.search_timeout,
+                snippets=args.snippets, search_tool=args.search_tool)
+
+    print()
+    print("Batch validation complete!")
+    print(f"  Files: {stats['files']}")
+    print(f"  Claims: {stats['claims']}")
+    if stats['timed_out']:
+        print(f"  Timed out: {stats['timed_out']} (searches did not finish; rerun to retry)")
+    if 'unique_claims' in stats:
+        print(f"  Unique claims validated: {stats['unique_claims']} (dedup ratio {stats['dedup_ratio']:.2f}x)")
+    print(f"  Index build/refresh: {stats['index_seconds']:.2f}s")
+    print(f"  Wall clock: {stats['wall_seconds']:.2f}s")
+    print(f"  Throughput: {stats['claims'] / max(stats['wall_seconds'], 1e-9):.1f} claims/s")
+    if stats['cache'] is not None:
+        print(f"  Cache: {stats['cache']['hits']} hits, {stats['cache']['misses']} misses")
+    print()
+    print("Per-worker throughput:")
+    for pid, worker in sorted(stats['per_worker'].items()):
+        rate = worker['claims'] / max(worker['seconds'], 1e-9)
+        files = f"{worker['files']} files, " if worker['files'] else ''
+        print(f"  pid {pid}: {files}{worker['claims']} claims, "
+              f"{worker['seconds']:.2f}s busy, {rate:.1f} claims/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Claims/Validation File I/O
+Fast loading and saving of *_claims and *_validation documents.
+
+Formats are chosen by file extension:
+- .yaml / .yml: YAML, using the libyaml CSafeLoader/CSafeDumper when PyYAML
+  was built with it (falls back to the pure-Python implementation)
+- .ndjson: compact newline-delimited JSON; the first line holds the document
+  without its per-claim results, each following line is one result tagged
+  with its claim_type
+- .msgpack: the document as a single MessagePack map (requires msgpack)
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+FORMAT_EXTENSIONS = {
+    'yaml': '.yaml',
+    'ndjson': '.ndjson',
+    'msgpack': '.msgpack',
+}
+
+
+@lru_cache(maxsize=None)
+def _yaml():
+    """(yaml module, SafeLoader, compact dumper), imported on first YAML use
+
+    PyYAML is the slowest import of any tool; ndjson and msgpack runs skip it.
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeLoader, SafeDumper
+
+    class CompactDumper(SafeDumper):
+        """SafeDumper that writes tuples, e.g. [file_index, line] evidence pairs, inline,
+        and multi-line strings, e.g. evidence snippets, as literal blocks"""
+
+    CompactDumper.add_representer(
+        tuple, lambda dumper, data: dumper.represent_sequence('tag:yaml.org,2002:seq', data, flow_style=True)
+    )
+    CompactDumper.add_representer(
+        str, lambda dumper, data: dumper.represent_scalar('tag:yaml.org,2002:str', data,
+                                                          style='|' if '\n' in data else None)
+    )
+    return yaml, SafeLoader, CompactDumper
+
+
+def format_for(path: Path) -> str:
+    """File format implied by a path's extension"""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.yaml', '.yml'):
+        return 'yaml'
+    if suffix in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if suffix == '.msgpack':
+        return 'msgpack'
+    raise ValueError(f"Unsupported file format: {path}")
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError("msgpack format requires the msgpack package (pip install msgpack)")
+
+
+def _ndjson_lines(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    header = dict(data)
+    results_by_type = data.get('results_by_type')
+    records = []
+
+    if results_by_type:
+        header['results_by_type'] = {}
+        for claim_type, type_data in results_by_type.items():
+            header['results_by_type'][claim_type] = {k: v for k, v in type_data.items() if k != 'results'}
+            records.extend(dict(result, claim_type=claim_type) for result in type_data.get('results', []))
+
+    yield header
+    yield from records
+
+
+def _from_ndjson_lines(lines: Iterator[str]) -> Dict[str, Any]:
+    data = None
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if data is None:
+            data = record
+            for type_data in data.get('results_by_type', {}).values():
+                type_data['results'] = []
+            continue
+        claim_type = record.pop('claim_type')
+        data['results_by_type'][claim_type]['results'].append(record)
+    return data or {}
+
+
+def load_document(path: Path) -> Dict[str, Any]:
+    """Load a claims or validation document in any supported format"""
+    fmt = format_for(path)
+
+    if fmt == 'msgpack':
+        _require_msgpack()
+        with open(path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if fmt == 'ndjson':
+            return _from_ndjson_lines(f)
+        yaml, loader, _ = _yaml()
+        return yaml.load(f, Loader=loader)
+
+
+def dump_document(data: Dict[str, Any], path: Path):
+    """Write a claims or validation document in the format implied by its extension"""
+    fmt = format_for(path)
+
+    if fmt == 'msgpack':
+        _require_msgpack()
+        with open(path, 'wb') as f:
+            f.write(msgpack.packb(data, use_bin_type=True))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'ndjson':
+            for record in _ndjson_lines(data):
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+        else:
+            yaml, _, dumper = _yaml()
+            yaml.dump(data, f, Dumper=dumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
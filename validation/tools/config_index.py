@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Structured Config Index
+In-memory maps of where events, database tables and ACL resources are declared.
+
+Built once per run from a structural parse of every module's config files,
+plus the PHP sites that declare the same names:
+- Events: etc/[area/]events.xml observers, ->dispatch('...') calls and
+  model events generated from AbstractModel::$_eventPrefix
+- Database tables: etc/db_schema.xml declarations, getTable()/_init() references
+- ACL resources: etc/acl.xml resource declarations
+
+Every site records its declaration kind, so a validator can tell "declared
+in db_schema.xml" from "referenced in PHP" instead of matching bare names.
+"""
+
+import sys
+import xml.parsers.expat
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from symbol_index import MODEL_EVENT_SUFFIXES, scan_source, walk_source_files
+
+
+# Config file -> (element, name attribute, site kind)
+CONFIG_DECLARATIONS = {
+    'events.xml': ('event', 'name', 'observer'),
+    'db_schema.xml': ('table', 'name', 'db_schema'),
+    'acl.xml': ('resource', 'id', 'acl'),
+}
+
+# Config file -> symbol kind the symbol index records for its declarations
+INDEXED_CONFIG_KINDS = {
+    'events.xml': 'event',
+    'db_schema.xml': 'table',
+    'acl.xml': 'acl_resource',
+}
+
+# Symbol kinds scanned from PHP (see symbol_index.PHP_SYMBOL_PATTERN)
+PHP_SITE_KINDS = ('dispatch', 'event_prefix', 'table')
+PHP_SITE_MARKERS = ('->dispatch(', '_eventPrefix', 'getTable(', '_init(')
+
+# (kind, file path, line)
+Site = Tuple[str, Path, int]
+
+
+def parse_config_file(path: Path, element: str, attribute: str) -> List[Tuple[str, int]]:
+    """(name, line) for every <element attribute="name"> in an XML file"""
+    found = []
+
+    parser = xml.parsers.expat.ParserCreate()
+
+    def start_element(tag, attributes):
+        if tag == element and attribute in attributes:
+            found.append((attributes[attribute], parser.CurrentLineNumber))
+
+    parser.StartElementHandler = start_element
+    try:
+        with open(path, 'rb') as f:
+            parser.ParseFile(f)
+    except (OSError, xml.parsers.expat.ExpatError):
+        # A malformed config file is not loaded by Magento either
+        return []
+    return found
+
+
+class ConfigIndex:
+    """Declaration sites of events, tables and ACL resources in one source tree"""
+
+    def __init__(self, source_path: Path):
+        self.source_path = source_path
+        self.events: Dict[str, List[Site]] = {}
+        self.event_prefixes: Dict[str, List[Site]] = {}
+        self.tables: Dict[str, List[Site]] = {}
+        self.acl_resources: Dict[str, List[Site]] = {}
+
+    def _maps(self) -> Dict[str, Dict[str, List[Site]]]:
+        return {
+            'observer': self.events,
+            'dispatch': self.events,
+            'event_prefix': self.event_prefixes,
+            'db_schema': self.tables,
+            'table': self.tables,
+            'acl': self.acl_resources,
+        }
+
+    def load_config_files(self):
+        """Parse every module's events.xml, db_schema.xml and acl.xml"""
+        maps = self._maps()
+        patterns = ('*/etc/events.xml', '*/etc/*/events.xml', '*/etc/db_schema.xml', '*/etc/acl.xml')
+
+        for pattern in patterns:
+            for path in sorted(self.source_path.glob(pattern)):
+                element, attribute, kind = CONFIG_DECLARATIONS[path.name]
+                for name, line in parse_config_file(path, element, attribute):
+                    maps[kind].setdefault(name, []).append((kind, path, line))
+
+    def load_indexed_config(self, symbol_index):
+        """Take the config declarations from the symbol index's XML scan instead of parsing files
+
+        For trees whose files cannot be opened in place, such as archives.
+        """
+        maps = self._maps()
+        for file_name, symbol_kind in INDEXED_CONFIG_KINDS.items():
+            _, _, kind = CONFIG_DECLARATIONS[file_name]
+            declarations = []
+            for _, name, rel_path, line in symbol_index.sites([symbol_kind], '/' + file_name):
+                parts = rel_path.split('/')
+                # Same files as load_config_files(): <module>/etc/[<area>/]events.xml, <module>/etc/acl.xml, ...
+                if parts[1:2] == ['etc'] and (len(parts) == 3 or (len(parts) == 4 and file_name == 'events.xml')):
+                    declarations.append((len(parts), parts, line, name, rel_path))
+
+            # In the order load_config_files() globs them
+            for _, _, line, name, rel_path in sorted(declarations):
+                maps[kind].setdefault(name, []).append((kind, self.source_path / rel_path, line))
+
+    def load_php_sites(self, sites: Iterator[Tuple[str, str, str, int]]):
+        """Record (kind, name, relative_path, line) PHP sites, e.g. from the symbol index"""
+        maps = self._maps()
+        for kind, name, rel_path, line in sites:
+            maps[kind].setdefault(name, []).append((kind, self.source_path / rel_path, line))
+
+    def scan_php_sites(self):
+        """Scan the tree's PHP files for dispatches, event prefixes and table references"""
+        self.load_php_sites(self._scan_php())
+
+    def _scan_php(self) -> Iterator[Tuple[str, str, str, int]]:
+        # In path, then line order, as SymbolIndex.sites() returns them, so evidence (and which
+        # sites make the top three) is the same with or without the index on any filesystem
+        for rel_path, _ in sorted(walk_source_files(self.source_path), key=lambda entry: entry[0]):
+            if not rel_path.endswith('.php'):
+                continue
+            try:
+                with open(self.source_path / rel_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+            except OSError:
+                continue
+            if not any(marker in text for marker in PHP_SITE_MARKERS):
+                continue
+            sites = [(kind, name, rel_path, line) for kind, name, _, line in scan_source(rel_path, text)
+                     if kind in PHP_SITE_KINDS]
+            yield from sorted(sites, key=lambda site: site[3])
+
+    def event_sites(self, event_name: str) -> List[Site]:
+        """Dispatch and observer sites of an event, or the _eventPrefix that generates it"""
+        sites = list(self.events.get(event_name, ()))
+        for suffix in MODEL_EVENT_SUFFIXES:
+            if event_name.endswith(suffix):
+                sites.extend(self.event_prefixes.get(event_name[:-len(suffix)], ()))
+                break
+        return sites
+
+    def table_sites(self, table_name: str) -> List[Site]:
+        return self.tables.get(table_name, [])
+
+    def acl_sites(self, resource_id: str) -> List[Site]:
+        return self.acl_resources.get(resource_id, [])
+
+
+def build_config_index(source_path: Path, symbol_index=None, config_from_index: bool = False) -> ConfigIndex:
+    """Build the config index, taking PHP sites from the symbol index when one is open
+
+    With config_from_index the config declarations come from the index too.
+    """
+    config = ConfigIndex(source_path)
+    if config_from_index:
+        config.load_indexed_config(symbol_index)
+    else:
+        config.load_config_files()
+    if symbol_index is not None:
+        config.load_php_sites(symbol_index.sites(PHP_SITE_KINDS, '.php'))
+    else:
+        config.scan_php_sites()
+    return config
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: config_index.py <magento_root>")
+        print("Example: config_index.py /path/to/magento")
+        sys.exit(1)
+
+    from validate_claims import MagentoValidator
+
+    validator = MagentoValidator(Path(sys.argv[1]), use_index=False)
+    config = build_config_index(validator.vendor_path)
+
+    print(f"Config index: {validator.vendor_path}")
+    print(f"  Events: {len(config.events)}")
+    print(f"  Model event prefixes: {len(config.event_prefixes)}")
+    print(f"  Tables: {len(config.tables)}")
+    print(f"  ACL resources: {len(config.acl_resources)}")
+
+
+if __name__ == '__main__':
+    main()
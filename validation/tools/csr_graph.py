@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+CSR Graph
+Compact array-backed form of the architecture graphs (data/*-graph.json) for
+dependency and plugin-chain queries.
+
+The graph files are lists of node and edge objects; answering "which plugins
+wrap OrderRepositoryInterface" from them means scanning every edge, and
+holding every module's graph as dicts costs hundreds of bytes per edge:
+- Files are decoded one node or edge object at a time and folded into flat
+  arrays; no file's object lists are ever held whole
+- Node ids are interned once: a node is an int index into one list of ids,
+  and everything per node or per edge is an array of small ints
+- Edges are stored twice in compressed sparse row form (forward and reverse:
+  offsets per node, target and edge type per edge), so neighbours are one
+  slice and reverse reachability costs the same as forward
+- Traversals take edge type filters as bitmasks
+
+Edge targets that are not nodes themselves (a virtual type's base class, an
+injected argument) become Reference nodes, so they can be queried like any
+other.
+"""
+
+import re
+import sys
+import json
+import argparse
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from graph_index import graph_files
+
+
+NODE_TYPES = ['Reference', 'Interface', 'Class', 'VirtualType', 'Plugin', 'Observer', 'Event', 'Module']
+EDGE_TYPES = ['PREFERS', 'INTERCEPTS', 'EXTENDS_VIRTUAL', 'INJECTS', 'OBSERVES', 'DEPENDS_ON']
+# Edge type filters are bitmasks over the type codes, held per node in one byte
+MAX_EDGE_TYPES = 8
+
+# Plugins declared on any of these wrap the queried type: the interfaces it is
+# preferred for, the class preferred for it and, for a virtual type, its base
+PLUGIN_SCOPE_FORWARD = ('PREFERS', 'EXTENDS_VIRTUAL')
+PLUGIN_SCOPE_REVERSE = ('PREFERS',)
+
+# sortOrder of a plugin that declares none (or 0), as src/commands/plugins.js orders them
+DEFAULT_SORT_ORDER = 10
+
+_scan = json.JSONDecoder().scan_once
+_whitespace = re.compile(r'[ \t\n\r]*')
+_separator = re.compile(r'[ \t\n\r]*(?:,[ \t\n\r]*)?')
+
+
+def iter_graph_items(text: str) -> Iterator[Tuple[str, dict]]:
+    """('nodes' or 'edges', object) for each element of a graph document's top-level arrays
+
+    Elements are decoded one at a time by the json module's scanner, so only
+    the current object exists as Python data; other top-level members are
+    skipped.
+    """
+
+    def expect(pos: int, char: str) -> int:
+        pos = _whitespace.match(text, pos).end()
+        if text[pos:pos + 1] != char:
+            raise ValueError(f"Malformed graph JSON: expected {char!r} at offset {pos}")
+        return _whitespace.match(text, pos + 1).end()
+
+    def scan(pos: int):
+        try:
+            return _scan(text, pos)
+        except StopIteration:
+            raise ValueError(f"Malformed graph JSON: expected a value at offset {pos}") from None
+
+    separator = _separator.match
+    pos = expect(0, '{')
+    while text[pos:pos + 1] != '}':
+        key, pos = scan(pos)
+        pos = expect(pos, ':')
+        if key in ('nodes', 'edges') and text[pos:pos + 1] == '[':
+            pos = _whitespace.match(text, pos + 1).end()
+            while text[pos:pos + 1] != ']':
+                item, pos = scan(pos)
+                yield key, item
+                pos = separator(text, pos).end()
+            pos += 1
+        else:
+            _, pos = scan(pos)
+        pos = separator(text, pos).end()
+
+
+class Csr:
+    """One direction of the edge set: node v's edges are offsets[v]:offsets[v + 1]
+
+    present[v] has bit t set when v has an edge of type code t, so a search
+    skips nodes without matching edges before touching their slice.
+    """
+
+    __slots__ = ('offsets', 'targets', 'types', 'edges', 'present')
+
+    def __init__(self, node_count: int, sources: array, targets: array, types: array):
+        # Counting sort of the edges by source node
+        counts = array('i', bytes(4 * (node_count + 1)))
+        for source in sources:
+            counts[source + 1] += 1
+        for v in range(node_count):
+            counts[v + 1] += counts[v]
+        self.offsets = counts
+
+        fill = array('i', counts)
+        self.targets = array('i', bytes(4 * len(sources)))
+        self.types = array('b', bytes(len(sources)))
+        self.edges = array('i', bytes(4 * len(sources)))
+        self.present = array('B', bytes(node_count))
+        for edge, source in enumerate(sources):
+            slot = fill[source]
+            fill[source] = slot + 1
+            self.targets[slot] = targets[edge]
+            self.types[slot] = types[edge]
+            self.edges[slot] = edge
+            self.present[source] |= 1 << types[edge]
+
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.targets, self.types, self.edges, self.present))
+
+
+class CsrGraph:
+    """Immutable graph over interned node ids with forward and reverse CSR adjacency"""
+
+    def __init__(self, index: Dict[str, int], node_types: array, type_names: List[str], edge_type_names: List[str],
+                 sources: array, targets: array, edge_types: array, sort_orders: array):
+        self.index = index
+        self.ids = list(index)
+        self.node_types = node_types
+        self.type_names = type_names
+        self.edge_type_names = edge_type_names
+        self.sort_orders = sort_orders
+        self.edge_count = len(sources)
+        self._masks: Dict[Tuple[str, ...], int] = {}
+        self.forward = Csr(len(self.ids), sources, targets, edge_types)
+        self.reverse = Csr(len(self.ids), targets, sources, edge_types)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def node(self, node_id: str) -> Optional[int]:
+        """Index of a node id, or None"""
+        return self.index.get(node_id)
+
+    def type_of(self, node: int) -> str:
+        return self.type_names[self.node_types[node]]
+
+    def edge_mask(self, edge_types: Optional[Iterable[str]]) -> int:
+        """Bitmask of edge type codes; None selects every type"""
+        if edge_types is None:
+            return -1
+        key = tuple(edge_types)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = 0
+            for name in key:
+                if name in self.edge_type_names:
+                    mask |= 1 << self.edge_type_names.index(name)
+            self._masks[key] = mask
+        return mask
+
+    def neighbors(self, node_id: str, edge_types: Iterable[str] = None, reverse: bool = False) -> List[str]:
+        """Ids of the nodes one edge away (edges into the node with reverse=True)"""
+        node = self.node(node_id)
+        if node is None:
+            return []
+        csr = self.reverse if reverse else self.forward
+        mask = self.edge_mask(edge_types)
+        return [self.ids[csr.targets[k]] for k in range(csr.offsets[node], csr.offsets[node + 1])
+                if mask >> csr.types[k] & 1]
+
+    def traverse(self, starts: Sequence[int], forward_mask: int, reverse_mask: int = 0,
+                 max_depth: int = None) -> List[int]:
+        """Breadth-first order of the nodes reachable from starts (excluded)
+
+        Follows edges of forward_mask types outward and edges of reverse_mask
+        types backwards, in the same search.
+        """
+        # Most searches touch a handful of nodes; a set beats a per-search array of len(graph)
+        seen = set(starts)
+        frontier = list(starts)
+        order = []
+        depth = 0
+        directions = [(csr.present, csr.offsets, csr.targets, csr.types, mask)
+                      for csr, mask in ((self.forward, forward_mask), (self.reverse, reverse_mask)) if mask]
+
+        while frontier and (max_depth is None or depth < max_depth):
+            following = []
+            for v in frontier:
+                for present, offsets, targets, types, mask in directions:
+                    kinds = present[v]
+                    if not kinds & mask:
+                        continue
+                    start, end = offsets[v], offsets[v + 1]
+                    if kinds & ~mask:
+                        for w, edge_type in zip(targets[start:end], types[start:end]):
+                            if mask >> edge_type & 1 and w not in seen:
+                                seen.add(w)
+                                following.append(w)
+                    else:
+                        # Every edge of v matches; no per-edge type test
+                        for w in targets[start:end]:
+                            if w not in seen:
+                                seen.add(w)
+                                following.append(w)
+            order.extend(following)
+            frontier = following
+            depth += 1
+        return order
+
+    def reachable(self, node_ids: Iterable[str], edge_types: Iterable[str] = None, reverse: bool = False,
+                  max_depth: int = None) -> List[str]:
+        """Ids reachable from node_ids along edge_types (against them with reverse=True), nearest first"""
+        index = self.index
+        starts = [index[node_id] for node_id in node_ids if node_id in index]
+        mask = self.edge_mask(edge_types)
+        ids = self.ids
+        return [ids[node] for node in self.traverse(starts, 0 if reverse else mask, mask if reverse else 0, max_depth)]
+
+    def _plugin_scope(self, node: int) -> List[int]:
+        return [node] + self.traverse([node], self.edge_mask(PLUGIN_SCOPE_FORWARD),
+                                      self.edge_mask(PLUGIN_SCOPE_REVERSE))
+
+    def plugin_scope(self, node_id: str) -> List[str]:
+        """The type itself plus every type whose plugins also wrap it"""
+        node = self.node(node_id)
+        if node is None:
+            return []
+        return [self.ids[v] for v in self._plugin_scope(node)]
+
+    def plugin_chain(self, node_id: str) -> List[Tuple[str, str, int]]:
+        """(plugin id, intercepted type, sortOrder) of every plugin wrapping a type, in execution order
+
+        A plugin declared in several areas is listed once.
+        """
+        node = self.node(node_id)
+        if node is None:
+            return []
+        intercepts = self.edge_mask(['INTERCEPTS'])
+        reverse = self.reverse
+        chain: Dict[Tuple[int, int], int] = {}
+        for target in self._plugin_scope(node):
+            for k in range(reverse.offsets[target], reverse.offsets[target + 1]):
+                if intercepts >> reverse.types[k] & 1:
+                    key = (reverse.targets[k], target)
+                    sort_order = self.sort_orders[reverse.edges[k]]
+                    chain[key] = min(sort_order, chain.get(key, sort_order))
+        return sorted(((self.ids[plugin], self.ids[target], sort_order)
+                       for (plugin, target), sort_order in chain.items()),
+                      key=lambda plugin: (plugin[2], plugin[0]))
+
+    def nbytes(self) -> int:
+        """Size of the arrays (node id strings excluded)"""
+        return (self.forward.nbytes() + self.reverse.nbytes() + len(self.node_types)
+                + self.sort_orders.itemsize * len(self.sort_orders))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        node_counts: Dict[str, int] = {}
+        for code in self.node_types:
+            node_counts[self.type_names[code]] = node_counts.get(self.type_names[code], 0) + 1
+        edge_counts: Dict[str, int] = {}
+        for code in self.forward.types:
+            edge_counts[self.edge_type_names[code]] = edge_counts.get(self.edge_type_names[code], 0) + 1
+        return {'nodes': node_counts, 'edges': edge_counts}
+
+
+class CsrGraphBuilder:
+    """Accumulates graph files into flat arrays; build() freezes them into a CsrGraph"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._types = array('b')
+        self._type_names = list(NODE_TYPES)
+        self._edge_type_names = list(EDGE_TYPES)
+        self._sources = array('i')
+        self._targets = array('i')
+        self._edge_types = array('b')
+        self._sort_orders = array('i')
+
+    def _intern(self, node_id: str) -> int:
+        node = self._ids.get(node_id)
+        if node is None:
+            node = self._ids[node_id] = len(self._types)
+            self._types.append(0)
+        return node
+
+    def _code(self, names: List[str], name: str) -> int:
+        if name not in names:
+            if names is self._edge_type_names and len(names) == MAX_EDGE_TYPES:
+                raise ValueError(f"More than {MAX_EDGE_TYPES} edge types; cannot add {name}")
+            names.append(name)
+        return names.index(name)
+
+    def add_node(self, node_id: str, node_type: str):
+        node = self._intern(node_id)
+        self._types[node] = self._code(self._type_names, node_type)
+
+    def add_edge(self, source: str, target: str, edge_type: str, sort_order: int = DEFAULT_SORT_ORDER):
+        self._sources.append(self._intern(source))
+        self._targets.append(self._intern(target))
+        self._edge_types.append(self._code(self._edge_type_names, edge_type))
+        self._sort_orders.append(sort_order)
+
+    def add_file(self, path: Path):
+        for kind, item in iter_graph_items(path.read_text(encoding='utf-8')):
+            if kind == 'nodes':
+                self.add_node(item['id'], item['type'])
+            else:
+                properties = item.get('properties') or {}
+                self.add_edge(item['from'], item['to'], item['type'], properties.get('sortOrder') or DEFAULT_SORT_ORDER)
+
+    def build(self) -> CsrGraph:
+        """Lay out both CSR directions over the nodes interned so far"""
+        return CsrGraph(self._ids, self._types, self._type_names, self._edge_type_names,
+                        self._sources, self._targets, self._edge_types, self._sort_orders)
+
+
+def load_csr_graph(paths: Sequence[Path]) -> CsrGraph:
+    """One CsrGraph over every graph file given directly or found in a given directory
+
+    Raises FileNotFoundError for a path that does not exist, or if no path holds a graph.
+    """
+    files = [graph for path in paths for graph in graph_files(Path(path))]
+    if not files:
+        raise FileNotFoundError(f"No graph files in {', '.join(str(path) for path in paths)}")
+    builder = CsrGraphBuilder()
+    for path in files:
+        builder.add_file(path)
+    return builder.build()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Query the architecture graphs (data/*-graph.json)',
+        epilog="Example: csr_graph.py data/ --plugins 'Magento\\Sales\\Api\\OrderRepositoryInterface'"
+    )
+    parser.add_argument('graphs', type=Path, nargs='+', help='*-graph.json files or directories of them')
+    parser.add_argument('--edges', help='comma-separated edge types to follow (default: all)')
+    parser.add_argument('--reverse', action='store_true', help='follow edges backwards (what reaches the node)')
+    parser.add_argument('--depth', type=int, help='maximum number of edges from the node')
+    parser.add_argument('--reach', metavar='NODE', help='list the nodes reachable from NODE')
+    parser.add_argument('--plugins', metavar='TYPE', help='list the plugins wrapping TYPE in sortOrder')
+    args = parser.parse_args()
+
+    try:
+        graph = load_csr_graph(args.graphs)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    edge_types = args.edges.split(',') if args.edges else None
+
+    if args.reach:
+        if graph.node(args.reach) is None:
+            print(f"Error: no node {args.reach}")
+            sys.exit(1)
+        for node_id in graph.reachable([args.reach], edge_types, args.reverse, args.depth):
+            print(f"{graph.type_of(graph.node(node_id))}\t{node_id}")
+    elif args.plugins:
+        scope = graph.plugin_scope(args.plugins)
+        if not scope:
+            print(f"Error: no node {args.plugins}")
+            sys.exit(1)
+        print(f"Scope: {', '.join(scope)}")
+        for plugin, target, sort_order in graph.plugin_chain(args.plugins):
+            print(f"  {sort_order:>5}  {plugin}  (on {target})")
+    else:
+        stats = graph.stats()
+        print(f"Nodes: {len(graph)}")
+        for name, count in sorted(stats['nodes'].items()):
+            print(f"  {name}: {count}")
+        print(f"Edges: {graph.edge_count}")
+        for name, count in sorted(stats['edges'].items()):
+            print(f"  {name}: {count}")
+        print(f"Arrays: {graph.nbytes() / 1024:.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,14 +12,107 @@ Extracts:
 - Database table names
 - Configuration paths
 - ACL resource identifiers
+
+Method, event and table claims come from loose patterns, so each one is also
+scored from its context: the enclosing tag (code block, inline code, prose),
+the code language (language-php class, or PHP/SQL/XML read from the text)
+and the text around it. Claims scoring under --min-score are deferred: they
+are listed under deferred_claims with their score instead of being validated.
 """
 
 import re
 import sys
-import yaml
+import hashlib
+import argparse
 from pathlib import Path
 from html.parser import HTMLParser
-from typing import List, Dict, Set, Any
+from typing import List, Dict, Set, Any, Optional, Tuple
+
+from claims_io import dump_document
+from profiler import NULL_PROFILER, Profiler
+
+
+EVENT_KEYWORDS = ['save', 'delete', 'load', 'login', 'logout', 'customer', 'before', 'after']
+TABLE_PREFIXES = ('customer_', 'eav_', 'sales_', 'quote_')
+
+# Output claim type of each extractor claim kind
+CLAIM_TYPES = {
+    'classes': 'php_classes',
+    'interfaces': 'php_interfaces',
+    'methods': 'methods',
+    'events': 'events',
+    'tables': 'database_tables',
+    'acl_resources': 'acl_resources',
+    'config_paths': 'config_paths',
+    'file_paths': 'file_paths',
+}
+
+# Claims scoring below this are deferred rather than validated
+DEFAULT_MIN_SCORE = 0.5
+
+# Base score of a claim kind by the context it appears in. Contexts are a code
+# language (php, sql, xml, bash, ...), 'code' for unlabelled code blocks,
+# 'inline' for inline <code>, 'css' and 'javascript' for the page's own
+# <style> and <script>, and 'prose' for everything else.
+METHOD_CONTEXT_SCORES = {'php': 0.7, 'inline': 0.6, 'code': 0.5, 'prose': 0.4, 'css': 0.0, 'javascript': 0.0}
+EVENT_CONTEXT_SCORES = {'xml': 0.6, 'php': 0.6, 'inline': 0.6, 'code': 0.5, 'prose': 0.4, 'sql': 0.1,
+                        'css': 0.0, 'javascript': 0.0}
+TABLE_CONTEXT_SCORES = {'sql': 0.8, 'php': 0.6, 'xml': 0.6, 'inline': 0.6, 'code': 0.5, 'prose': 0.5,
+                        'css': 0.0, 'javascript': 0.0}
+OTHER_CONTEXT_SCORE = 0.3
+PAGE_CONTEXTS = {'style': 'css', 'script': 'javascript'}
+
+# Unlabelled code blocks are read as PHP, SQL or XML when they look like it
+LANGUAGE_HINTS = [
+    ('php', re.compile(r'<\?php|\$[a-zA-Z_]\w*|->\w|\bfunction\s|\bnamespace\s|\b(?:public|private|protected)\s')),
+    ('sql', re.compile(r'\b(?:SELECT|INSERT INTO|UPDATE|DELETE FROM|CREATE TABLE|ALTER TABLE|JOIN)\b')),
+    ('xml', re.compile(r'<[a-z][\w:-]*(?:\s+[\w:-]+="[^"]*")*\s*/?>')),
+]
+
+# Calls on an object or class, and declarations, are methods beyond doubt
+METHOD_RECEIVER = re.compile(r'(?:->|::|\bfunction\s+)$')
+# A lowercase letter followed by an uppercase one: getById, afterSave
+CAMEL_CASE = re.compile(r'[a-z][A-Z]')
+# save(), getById($id), load($customer, 'email'): arguments that read as a call
+CALL_ARGUMENTS = re.compile(r'\((?:\)|\$|\d|[\'"])')
+# Words near an event name that say it is one
+EVENT_CUES = re.compile(r'dispatch|event|observer', re.IGNORECASE)
+TABLE_CUES = re.compile(r'(?i:getTable|table)|\b(?:FROM|JOIN|INTO)\b')
+EVENT_SUFFIXES = ('_before', '_after', '_success', '_save', '_load', '_delete', '_login', '_logout', '_commit')
+COLUMN_SUFFIXES = ('_id', '_at', '_email', '_hash', '_count', '_token', '_key', '_code', '_name', '_date')
+TABLE_SUFFIXES = ('_entity', '_grid', '_flat', '_item', '_index', '_log', '_address', '_link', '_website',
+                  '_varchar', '_int', '_text', '_decimal', '_datetime')
+# How far around a claim to look for cue words
+CUE_WINDOW = 60
+
+# Method signatures: methodName(...): ReturnType or methodName(...)
+METHOD_PATTERN = re.compile(r'([a-z][a-zA-Z0-9_]*)\s*\([^)]*\)(?:\s*:\s*[A-Za-z\\]+)?')
+
+# File paths: etc/di.xml, etc/events.xml, Model/Customer.php
+FILE_PATTERN = re.compile(r'(?:etc|Model|Block|Controller|Helper|Observer|Plugin)/[A-Za-z0-9_/]+\.(?:xml|php)')
+
+# All claim kinds in one compiled scanner. Each alternative consumes only the
+# leading token of its claim and captures the rest in a lookahead, so claims
+# of other kinds that begin inside it are still found. Kinds that can start
+# at the same position share one alternative. Lowercase-initial claims are
+# only tried where a lowercase run begins, which keeps the scan linear.
+CLAIM_SCANNER = re.compile(
+    # PHP class/interface names (Magento\Module\Path\ClassName) and
+    # ACL resource identifiers (Magento_Module::resource)
+    r'(?P<magento_token>Magento(?=(?P<class_rest>\\[A-Za-z0-9\\]+[A-Za-z0-9]+)|(?P<acl_rest>_[A-Za-z]+::[a-z_]+)))'
+    # File paths (etc/di.xml, Model/Customer.php); etc/x also reads as a config path
+    r'|(?P<file_token>(?=(?P<file_path>(?:etc|Model|Block|Controller|Helper|Observer|Plugin)/[A-Za-z0-9_/]+\.(?:xml|php)))'
+    r'(?=(?P<file_config>\b[a-z]+/[a-z_]+(?:/[a-z_]+)?\b))?[A-Za-z]+)'
+    r'|(?<![a-z])(?:'
+    # Method calls, optionally also a snake_case event/table name
+    r'(?=(?P<method>[a-z][a-zA-Z0-9_]*)(?P<method_tail>\s*\([^)]*\)(?:\s*:\s*[A-Za-z\\]+)?))'
+    r'(?:(?P<method_snake>\b[a-z]+_[a-z_]+\b)|(?P<method_token>[a-z][a-zA-Z0-9_]*))'
+    # Config paths (section/group/field)
+    r'|(?P<config_token>(?=(?P<config_path>\b[a-z]+/[a-z_]+(?:/[a-z_]+)?\b))[a-z]+)'
+    # snake_case words: event names and database table names
+    r'|(?P<snake>\b[a-z]+_[a-z_]+\b)'
+    r')'
+)
 
 
 class ClaimExtractor(HTMLParser):
@@ -39,16 +132,40 @@ class ClaimExtractor(HTMLParser):
         }
         self.current_data = ""
         self.in_code = False
+        self.code_block = False
+        self.code_language = None
+        self.page_context = None
+        # Best context score of every method, event and table claim
+        self.scores = {'methods': {}, 'events': {}, 'tables': {}}
+        self.context = 'prose'
+        # Scan statistics reported by --profile
+        self.buffers_scanned = 0
+        self.buffers_skipped = 0
+        self.chars_scanned = 0
 
     def handle_starttag(self, tag, attrs):
-        if tag == 'code' or tag == 'pre':
+        if tag in PAGE_CONTEXTS:
+            self.page_context = PAGE_CONTEXTS[tag]
+        elif tag == 'code' or tag == 'pre':
+            if not self.in_code:
+                # Prose buffered for a class name ends where the code starts
+                self._extract_from_buffer()
+                self.current_data = ""
             self.in_code = True
+            self.code_block = self.code_block or tag == 'pre'
+            for name, value in attrs:
+                if name == 'class' and value and 'language-' in value:
+                    self.code_language = value.split('language-', 1)[1].split()[0]
 
     def handle_endtag(self, tag):
-        if tag == 'code' or tag == 'pre':
-            self.in_code = False
+        if tag in PAGE_CONTEXTS:
+            self.page_context = None
+        elif tag == 'code' or tag == 'pre':
             self._extract_from_buffer()
             self.current_data = ""
+            self.in_code = False
+            self.code_block = False
+            self.code_language = None
 
     def handle_data(self, data):
         if self.in_code or 'Magento\\' in data:
@@ -59,60 +176,203 @@ class ClaimExtractor(HTMLParser):
             self._extract_from_buffer()
             self.current_data = ""
 
+    def _buffer_context(self, text: str) -> str:
+        """Code language of the buffer, 'code', 'inline' or 'prose'"""
+        if not self.in_code:
+            return self.page_context or 'prose'
+        if self.code_language:
+            return self.code_language
+        for language, hint in LANGUAGE_HINTS:
+            if hint.search(text):
+                return language
+        return 'code' if self.code_block else 'inline'
+
     def _extract_from_buffer(self):
-        """Extract claims from current data buffer"""
+        """Extract claims from current data buffer in a single scan"""
         if not self.current_data:
             return
 
         text = self.current_data
+        claims = self.claims
+
+        # Every claim kind needs one of these; most prose fragments have none
+        if not ('(' in text or '/' in text or '_' in text or 'Magento' in text):
+            self.buffers_skipped += 1
+            return
+        self.buffers_scanned += 1
+        self.chars_scanned += len(text)
+        self.context = self._buffer_context(text)
+
+        # Each claim kind is matched without overlapping itself, as if it were
+        # scanned on its own: later candidates that start inside the previous
+        # match of the same kind are skipped.
+        class_end = acl_end = file_end = config_end = method_end = 0
+
+        for match in CLAIM_SCANNER.finditer(text):
+            kind = match.lastgroup
+            start = match.start()
+
+            if kind == 'magento_token':
+                if match.group('class_rest'):
+                    if start >= class_end:
+                        class_end = match.end('class_rest')
+                        classname = 'Magento' + match.group('class_rest')
+                        if 'Interface' in classname:
+                            claims['interfaces'].add(classname)
+                        else:
+                            claims['classes'].add(classname)
+                elif start >= acl_end:
+                    acl_end = match.end('acl_rest')
+                    claims['acl_resources'].add('Magento' + match.group('acl_rest'))
+
+            elif kind == 'file_token':
+                if start >= file_end:
+                    file_end = match.end('file_path')
+                    claims['file_paths'].add(match.group('file_path'))
+                if match.group('file_config') and start >= config_end:
+                    config_end = match.end('file_config')
+                    self._add_config_path(match.group('file_config'))
+
+            elif kind == 'method_token' or kind == 'method_snake':
+                method = match.group('method')
+                if start >= method_end:
+                    method_end = match.end('method_tail')
+                    self._add_method(method, text, start)
+                elif method_end < match.end('method'):
+                    # The previous call ends inside this identifier; resume there
+                    resumed = METHOD_PATTERN.search(text, method_end)
+                    if resumed and resumed.start() < match.end('method'):
+                        method_end = resumed.end()
+                        self._add_method(resumed.group(1), text, resumed.start())
+                if kind == 'method_snake':
+                    self._add_snake_word(match.group('method_snake'), text, start)
+
+            elif kind == 'config_token':
+                if start >= config_end:
+                    config_end = match.end('config_path')
+                    self._add_config_path(match.group('config_path'))
+
+            elif kind == 'snake':
+                self._add_snake_word(match.group('snake'), text, start)
+
+            if kind in ('config_token', 'snake') and text.startswith('/', match.end()):
+                # A lowercase word ending in "etc/" may hide a file path start
+                inner = FILE_PATTERN.search(text, start + 1)
+                if inner and inner.start() < match.end() and inner.start() >= file_end:
+                    file_end = inner.end()
+                    self.claims['file_paths'].add(inner.group(0))
+
+    def _add_method(self, method: str, text: str, start: int):
+        if len(method) > 2 and method not in ['function', 'public', 'private', 'protected']:
+            self.claims['methods'].add(method)
+            self._score('methods', method, self._method_score(method, text, start))
+
+    def _add_snake_word(self, word: str, text: str, start: int):
+        # Event names (lowercase_with_underscores); filter common words that match pattern
+        is_event = (word not in ['the_core', 'full_page', 'per_website', 'primary_key'] and
+                    any(keyword in word for keyword in EVENT_KEYWORDS))
+        # Database table names
+        is_table = word.startswith(TABLE_PREFIXES)
+        if not (is_event or is_table):
+            return
+
+        end = start + len(word)
+        before, after = text[start - 1:start], text[end:end + 1]
+        window = text[max(0, start - CUE_WINDOW):end + CUE_WINDOW]
+        # $customer_id, ->customer_id, customer_data(), customer_id/..., eav_entity_{type}:
+        # a variable, call, path or name prefix rather than the name itself
+        misused = (before in ('$', '/') or after in ('(', '/') or word.endswith('_') or
+                   text.endswith('->', 0, start))
+        quoted = before in ('"', "'") and after == before
+        # A word both kinds accept leans to whichever kind its neighbourhood names
+        event_cue = bool(EVENT_CUES.search(window))
+        # customer_log.last_login_at: a table qualifying a column
+        table_cue = (after == '.' and text[end + 1:end + 2].isalpha()) or bool(TABLE_CUES.search(window))
+
+        if is_event:
+            self.claims['events'].add(word)
+            score = EVENT_CONTEXT_SCORES.get(self.context, OTHER_CONTEXT_SCORE)
+            score += 0.2 * quoted + 0.2 * event_cue + 0.1 * word.endswith(EVENT_SUFFIXES)
+            score -= 0.3 * word.endswith(COLUMN_SUFFIXES + TABLE_SUFFIXES) + 0.3 * misused
+            score -= 0.2 * (is_table and table_cue and not event_cue)
+            self._score('events', word, score)
+
+        if is_table:
+            self.claims['tables'].add(word)
+            score = TABLE_CONTEXT_SCORES.get(self.context, OTHER_CONTEXT_SCORE)
+            score += 0.2 * quoted + 0.2 * table_cue + 0.1 * word.endswith(TABLE_SUFFIXES)
+            score -= 0.3 * word.endswith(COLUMN_SUFFIXES + EVENT_SUFFIXES) + 0.3 * misused
+            score -= 0.2 * (is_event and event_cue and not table_cue)
+            self._score('tables', word, score)
+
+    def _method_score(self, method: str, text: str, start: int) -> float:
+        if start and (text[start - 1].isalnum() or text[start - 1] in '_$'):
+            # Tail of a word or variable: odel( from Model(, data from $data
+            return 0.0
+        score = METHOD_CONTEXT_SCORES.get(self.context, OTHER_CONTEXT_SCORE)
+        score += 0.3 * bool(METHOD_RECEIVER.search(text, max(0, start - 12), start))
+        score += 0.2 * bool(CAMEL_CASE.search(method))
+        end = start + len(method)
+        score += 0.1 * bool(CALL_ARGUMENTS.match(text, end))
+        # "algorithm (bcrypt)" is prose; calls have no space before the parenthesis
+        score -= 0.3 * text[end:end + 1].isspace()
+        # Magento methods are camelCase; session_start() is PHP's own
+        score -= 0.2 * ('_' in method)
+        return score
+
+    def _score(self, kind: str, claim: str, score: float):
+        """Keep the best score a claim gets anywhere in the document"""
+        score = round(min(max(score, 0.0), 1.0), 2)
+        scores = self.scores[kind]
+        if score > scores.get(claim, -1.0):
+            scores[claim] = score
+
+    def _add_config_path(self, path: str):
+        if not path.startswith('http'):
+            self.claims['config_paths'].add(path)
+
+
+def _parse(content: str, profiler: Profiler) -> ClaimExtractor:
+    parser = ClaimExtractor()
+    with profiler.span('parse'):
+        parser.feed(content)
+
+    profiler.count('bytes_scanned', len(content.encode('utf-8')) if profiler.enabled else 0)
+    profiler.count('buffers_scanned', parser.buffers_scanned)
+    profiler.count('buffers_skipped', parser.buffers_skipped)
+    profiler.count('buffer_chars_scanned', parser.chars_scanned)
+    for kind, found in parser.claims.items():
+        profiler.count(f"claims.{kind}", len(found))
+
+    return parser
+
+
+def extract_claims_from_text(content: str, profiler: Profiler = NULL_PROFILER) -> Dict[str, Set[str]]:
+    """Extract all technical claims from HTML documentation content"""
+    return _parse(content, profiler).claims
+
 
-        # Extract PHP class/interface names (Magento\Module\Path\ClassName)
-        class_pattern = r'Magento\\[A-Za-z0-9\\]+[A-Za-z0-9]+'
-        for match in re.finditer(class_pattern, text):
-            classname = match.group(0)
-            if 'Interface' in classname:
-                self.claims['interfaces'].add(classname)
-            else:
-                self.claims['classes'].add(classname)
-
-        # Extract method signatures (methodName(...): ReturnType or methodName(...))
-        method_pattern = r'([a-z][a-zA-Z0-9_]*)\s*\([^)]*\)(?:\s*:\s*[A-Za-z\\]+)?'
-        for match in re.finditer(method_pattern, text):
-            method = match.group(1)
-            if len(method) > 2 and method not in ['function', 'public', 'private', 'protected']:
-                self.claims['methods'].add(method)
-
-        # Extract event names (lowercase_with_underscores)
-        event_pattern = r'\b([a-z]+_[a-z_]+)\b'
-        for match in re.finditer(event_pattern, text):
-            event = match.group(1)
-            # Filter common words that match pattern
-            if (event.count('_') >= 1 and
-                event not in ['the_core', 'full_page', 'per_website', 'primary_key'] and
-                any(keyword in event for keyword in ['save', 'delete', 'load', 'login', 'logout', 'customer', 'before', 'after'])):
-                self.claims['events'].add(event)
-
-        # Extract database table names
-        table_pattern = r'\b(customer_[a-z_]+|eav_[a-z_]+|sales_[a-z_]+|quote_[a-z_]+)\b'
-        for match in re.finditer(table_pattern, text):
-            self.claims['tables'].add(match.group(1))
-
-        # Extract ACL resource identifiers (Magento_Module::resource)
-        acl_pattern = r'Magento_[A-Za-z]+::[a-z_]+'
-        for match in re.finditer(acl_pattern, text):
-            self.claims['acl_resources'].add(match.group(0))
-
-        # Extract config paths (section/group/field)
-        config_pattern = r'\b([a-z]+/[a-z_]+(?:/[a-z_]+)?)\b'
-        for match in re.finditer(config_pattern, text):
-            path = match.group(1)
-            if path.count('/') >= 1 and not path.startswith('http'):
-                self.claims['config_paths'].add(path)
-
-        # Extract file paths (etc/di.xml, etc/events.xml, Model/Customer.php)
-        file_pattern = r'(?:etc|Model|Block|Controller|Helper|Observer|Plugin)/[A-Za-z0-9_/]+\.(?:xml|php)'
-        for match in re.finditer(file_pattern, text):
-            self.claims['file_paths'].add(match.group(0))
+def extract_scored_claims_from_text(content: str, profiler: Profiler = NULL_PROFILER
+                                    ) -> Tuple[Dict[str, Set[str]], Dict[str, Dict[str, float]]]:
+    """All technical claims, and the context score of every method, event and table claim"""
+    parser = _parse(content, profiler)
+    return parser.claims, parser.scores
+
+
+def prune_claims(claims: Dict[str, Set[str]], scores: Dict[str, Dict[str, float]], min_score: float,
+                 profiler: Profiler = NULL_PROFILER
+                 ) -> Tuple[Dict[str, Set[str]], Dict[str, Dict[str, float]]]:
+    """Split claims into those scoring at least min_score and the deferred rest (claim -> score)"""
+    kept = {}
+    deferred = {}
+    for kind, found in claims.items():
+        kind_scores = scores.get(kind, {})
+        low = {claim: kind_scores[claim] for claim in found if kind_scores.get(claim, 1.0) < min_score}
+        kept[kind] = found - low.keys()
+        if low:
+            deferred[kind] = low
+        profiler.count(f"claims_deferred.{kind}", len(low))
+    return kept, deferred
 
 
 def extract_claims_from_html(html_path: Path) -> Dict[str, Set[str]]:
@@ -121,43 +381,72 @@ def extract_claims_from_html(html_path: Path) -> Dict[str, Set[str]]:
     with open(html_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    parser = ClaimExtractor()
-    parser.feed(content)
+    return extract_claims_from_text(content)
+
 
-    return parser.claims
+def content_hash(content: str) -> str:
+    """SHA-256 of a source document, recorded so unchanged documents can be skipped"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
-def format_claims_for_validation(claims: Dict[str, Set[str]], source_file: Path) -> Dict[str, Any]:
-    """Format extracted claims into validation-ready structure"""
+def format_claims_for_validation(claims: Dict[str, Set[str]], source_file: Path, source_hash: str = None,
+                                 deferred: Optional[Dict[str, Dict[str, float]]] = None,
+                                 min_score: float = None) -> Dict[str, Any]:
+    """Format extracted claims into validation-ready structure
 
-    return {
+    With deferred claims (see prune_claims) the document also lists them,
+    with their scores, under deferred_claims; validators only read claims.
+    """
+
+    validation_data = {
         'source_document': str(source_file),
+        'source_sha256': source_hash,
         'extracted_at': '2025-01-07',
-        'claims': {
-            'php_classes': sorted(list(claims['classes'])),
-            'php_interfaces': sorted(list(claims['interfaces'])),
-            'methods': sorted(list(claims['methods'])),
-            'events': sorted(list(claims['events'])),
-            'database_tables': sorted(list(claims['tables'])),
-            'acl_resources': sorted(list(claims['acl_resources'])),
-            'config_paths': sorted(list(claims['config_paths'])),
-            'file_paths': sorted(list(claims['file_paths'])),
-        },
-        'validation_status': {
-            'validated': False,
-            'validation_date': None,
-            'validator': None,
+        'claims': {claim_type: sorted(claims[kind]) for kind, claim_type in CLAIM_TYPES.items()},
+    }
+
+    if deferred is not None:
+        validation_data['pruning'] = {
+            'min_score': min_score,
+            'extracted': sum(len(found) for found in claims.values()) + sum(len(low) for low in deferred.values()),
+            'deferred': sum(len(low) for low in deferred.values()),
         }
+        validation_data['deferred_claims'] = {
+            CLAIM_TYPES[kind]: [{'claim': claim, 'score': score} for claim, score in sorted(low.items())]
+            for kind, low in deferred.items()
+        }
+
+    validation_data['validation_status'] = {
+        'validated': False,
+        'validation_date': None,
+        'validator': None,
     }
+    return validation_data
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: extract_claims.py <html_file> [output_yaml]")
-        print("Example: extract_claims.py architecture.html architecture_claims.yaml")
-        sys.exit(1)
+def write_claims(validation_data: Dict[str, Any], output_file: Path):
+    """Write extracted claims in the format implied by the file extension"""
+    dump_document(validation_data, output_file)
 
-    html_file = Path(sys.argv[1])
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Extract technical claims from an HTML documentation file',
+        epilog='Example: extract_claims.py architecture.html architecture_claims.yaml'
+    )
+    parser.add_argument('html_file', type=Path)
+    parser.add_argument('output_yaml', type=Path, nargs='?')
+    parser.add_argument('--profile', action='store_true',
+                        help='record phase timings and scan counters in the output under profile')
+    parser.add_argument('--trace', type=Path,
+                        help='also write a Chrome trace-event JSON file (implies --profile)')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help=f'defer method, event and table claims whose context score is below this, '
+                             f'0 keeps every claim (default: {DEFAULT_MIN_SCORE})')
+    args = parser.parse_args(argv)
+
+    html_file = args.html_file
+    profiler = Profiler() if args.profile or args.trace else NULL_PROFILER
 
     if not html_file.exists():
         print(f"Error: File not found: {html_file}")
@@ -165,20 +454,32 @@ def main():
 
     # Extract claims
     print(f"Extracting claims from {html_file}...")
-    claims = extract_claims_from_html(html_file)
+    with profiler.span('read_html'):
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    claims, scores = extract_scored_claims_from_text(content, profiler)
+    with profiler.span('prune'):
+        claims, deferred = prune_claims(claims, scores, args.min_score, profiler)
 
     # Format for output
-    validation_data = format_claims_for_validation(claims, html_file)
+    with profiler.span('format'):
+        validation_data = format_claims_for_validation(claims, html_file, content_hash(content),
+                                                       deferred, args.min_score)
 
     # Determine output file
-    if len(sys.argv) >= 3:
-        output_file = Path(sys.argv[2])
+    if args.output_yaml:
+        output_file = args.output_yaml
     else:
         output_file = html_file.parent / f"{html_file.stem}_claims.yaml"
 
+    if profiler.enabled:
+        validation_data['profile'] = profiler.summary()
+
     # Write YAML
-    with open(output_file, 'w', encoding='utf-8') as f:
-        yaml.dump(validation_data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    with profiler.span('write_claims'):
+        write_claims(validation_data, output_file)
+    if args.trace:
+        profiler.write_trace(args.trace)
 
     # Print summary
     print(f"\nExtraction complete!")
@@ -192,6 +493,18 @@ def main():
     print(f"  ACL Resources: {len(validation_data['claims']['acl_resources'])}")
     print(f"  Config Paths: {len(validation_data['claims']['config_paths'])}")
     print(f"  File Paths: {len(validation_data['claims']['file_paths'])}")
+    pruning = validation_data['pruning']
+    if pruning['deferred']:
+        print(f"\nDeferred (score < {args.min_score}): {pruning['deferred']} of {pruning['extracted']} claims")
+        for claim_type, low in validation_data['deferred_claims'].items():
+            print(f"  {claim_type}: {', '.join(entry['claim'] for entry in low)}")
+
+    if profiler.enabled:
+        print("\nProfile:")
+        for name, seconds in profiler.phases.items():
+            print(f"  {name}: {seconds * 1000:.1f} ms")
+        for counter, value in profiler.counters.items():
+            print(f"  {counter}: {value}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Graph Index
+Hash indexes over the architecture graphs written by src/graph/GraphBuilder.js.
+
+`parse` writes one data/<Module>-graph.json per module with Interface, Class
+and VirtualType nodes from di.xml, Plugin nodes with INTERCEPTS edges and
+Observer nodes with OBSERVES edges. Loading them into dicts lets
+MagentoValidator answer class, interface, plugin and observer claims on a
+machine without a Magento checkout:
+- classes: every class or interface a graph names (preference, plugin target,
+  plugin or observer class, virtual type base, injected argument)
+- plugins by id (Target\\Class::name), plugin name and plugin class
+- observers by id (event::name), observer name and observer class
+
+Locations are (graph file, line of the node in the file), so evidence points
+at the node that declares the claim.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+
+GRAPH_SUFFIX = '-graph.json'
+
+# JSON.stringify(graph, null, 2) puts each node id on its own line
+NODE_ID_LINE = re.compile(r'^\s*"id": ("(?:[^"\\]|\\.)*"),?$')
+
+# How a class is named by the graph, strongest first
+ROLE_DESCRIPTIONS = {
+    'interface': 'DI preference interface',
+    'class': 'DI type',
+    'plugin': 'plugin class',
+    'observer': 'observer class',
+    'virtual_base': 'virtual type base',
+    'injected': 'injected argument',
+}
+ROLE_ORDER = list(ROLE_DESCRIPTIONS)
+
+Location = Tuple[Path, int]
+
+
+class Declaration(NamedTuple):
+    """A plugin or observer node: where it is and whether the config disables it"""
+    location: Location
+    disabled: bool
+
+
+def graph_files(path: Path) -> List[Path]:
+    """A graph file itself, or the graph files directly inside a directory
+
+    Raises FileNotFoundError for a path that is neither, so a mistyped path is
+    not silently dropped from a list of graphs.
+    """
+    if path.is_file():
+        return [path]
+    if path.is_dir():
+        return sorted(entry for entry in path.glob(f'*{GRAPH_SUFFIX}') if not entry.name.startswith('._'))
+    raise FileNotFoundError(f"Graph file or directory not found: {path}")
+
+
+def is_graph_source(path: Path) -> bool:
+    """True for a *-graph.json file or a directory holding some (like data/)"""
+    if path.is_file():
+        return path.name.endswith(GRAPH_SUFFIX)
+    return path.is_dir() and bool(graph_files(path))
+
+
+def node_lines(text: str) -> Dict[str, int]:
+    """Node id -> line of its "id" member; every node is on line 1 of a compact file"""
+    lines = {}
+    for number, line in enumerate(text.split('\n'), 1):
+        match = NODE_ID_LINE.match(line)
+        if match:
+            lines.setdefault(json.loads(match.group(1)), number)
+    return lines
+
+
+class GraphIndex:
+    """Classes, plugins and observers of one or more graph files, keyed for O(1) lookup"""
+
+    def __init__(self, paths: Sequence[Path]):
+        self.paths = [Path(path) for path in paths]
+        self.classes: Dict[str, List[Tuple[str, Location]]] = {}
+        self.plugins: Dict[str, List[Declaration]] = {}
+        self.observers: Dict[str, List[Declaration]] = {}
+        self.node_count = 0
+        for path in self.paths:
+            self._load(path)
+
+    def _add_class(self, name: str, role: str, location: Location):
+        if name:
+            self.classes.setdefault(name, []).append((role, location))
+
+    def _load(self, path: Path):
+        text = path.read_text(encoding='utf-8')
+        graph = json.loads(text)
+        lines = node_lines(text)
+
+        def location(node_id: str) -> Location:
+            return path, lines.get(node_id, 1)
+
+        for node in graph.get('nodes', []):
+            self.node_count += 1
+            node_id = node['id']
+            kind = node.get('type')
+            properties = node.get('properties') or {}
+
+            if kind in ('Interface', 'Class'):
+                self._add_class(node_id, kind.lower(), location(node_id))
+            elif kind == 'VirtualType':
+                self._add_class(properties.get('baseType'), 'virtual_base', location(node_id))
+            elif kind in ('Plugin', 'Observer'):
+                role = kind.lower()
+                self._add_class(properties.get('class'), role, location(node_id))
+                declaration = Declaration(location(node_id), bool(properties.get('disabled')))
+                table = self.plugins if kind == 'Plugin' else self.observers
+                for key in {node_id, properties.get('name'), properties.get('class')}:
+                    if key:
+                        table.setdefault(key, []).append(declaration)
+
+        for edge in graph.get('edges', []):
+            if edge.get('type') == 'INJECTS':
+                self._add_class(edge.get('to'), 'injected', location(edge.get('from')))
+
+    def lookup_class(self, class_name: str) -> List[Tuple[str, Location]]:
+        """(role, location) of every mention of a class, strongest role first"""
+        return sorted(self.classes.get(class_name.lstrip('\\'), []), key=lambda mention: ROLE_ORDER.index(mention[0]))
+
+    def lookup_plugin(self, claim: str) -> List[Declaration]:
+        """Plugin nodes whose id, name or class is the claim"""
+        return self.plugins.get(claim.lstrip('\\'), [])
+
+    def lookup_observer(self, claim: str) -> List[Declaration]:
+        """Observer nodes whose id, name or class is the claim"""
+        return self.observers.get(claim.lstrip('\\'), [])
+
+    def stamp(self) -> str:
+        """Hash of every graph file's path, mtime and size"""
+        digest = hashlib.sha1()
+        for path in self.paths:
+            st = os.stat(path)
+            digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+        return digest.hexdigest()
+
+
+def load_graphs(paths: Sequence[Path]) -> GraphIndex:
+    """One index over every graph file given directly or found in a given directory"""
+    files = [graph for path in paths for graph in graph_files(Path(path))]
+    if not files:
+        raise FileNotFoundError(f"No *{GRAPH_SUFFIX} files in {', '.join(str(path) for path in paths)}")
+    return GraphIndex(files)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: graph_index.py <graph.json|directory> [class|plugin|observer ...]")
+        print("Example: graph_index.py data/ 'Magento\\Sales\\Model\\Order'")
+        sys.exit(1)
+
+    graph = load_graphs([Path(sys.argv[1])])
+    print(f"Graphs: {len(graph.paths)} ({graph.node_count} nodes)")
+    print(f"  Classes: {len(graph.classes)}")
+    print(f"  Plugin keys: {len(graph.plugins)}")
+    print(f"  Observer keys: {len(graph.observers)}")
+
+    for claim in sys.argv[2:]:
+        print()
+        print(f"{claim}:")
+        for role, (path, line) in graph.lookup_class(claim):
+            print(f"  {ROLE_DESCRIPTIONS[role]}: {path.name}:{line}")
+        for label, declarations in (('plugin', graph.lookup_plugin(claim)), ('observer', graph.lookup_observer(claim))):
+            for (path, line), disabled in declarations:
+                print(f"  {label}{' (disabled)' if disabled else ''}: {path.name}:{line}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+mage-validate
+One entry point for the claim tools, cheap enough to call once per file.
+
+Each subcommand is the CLI of an existing tool, with the same arguments:
+- extract: extract_claims.py
+- validate: validate_claims.py
+- batch: batch_validate.py, or batch_extract.py as 'batch extract'
+- query: results_warehouse.py (ingest, runs, rates, regressions, ...)
+
+Nothing but sys is imported before the subcommand is known, and then only
+that tool's module is imported. The tools themselves import PyYAML,
+asyncio and tarfile/zipfile on first use, so e.g. an index-backed validate
+writing ndjson never loads any of them. ../benchmarks/bench_startup.py
+measures this with python -X importtime against a budget.
+"""
+
+import sys
+
+
+COMMANDS = {
+    'extract': ('extract_claims', 'extract claims from an HTML page'),
+    'validate': ('validate_claims', 'validate a claims file against a Magento root'),
+    'batch': ('batch_validate', "validate many claims files ('batch extract' extracts many pages)"),
+    'query': ('results_warehouse', 'ingest and query validation results'),
+}
+
+BATCH_COMMANDS = {
+    'extract': 'batch_extract',
+    'validate': 'batch_validate',
+}
+
+PROG = 'mage-validate'
+
+
+def usage() -> str:
+    lines = [f"usage: {PROG} <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<10}{description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", f"'{PROG} <command> --help' shows the arguments of a command."]
+    return '\n'.join(lines)
+
+
+def resolve(argv: list) -> tuple:
+    """(module name, program name, remaining arguments) for a command line"""
+    command, args = argv[0], argv[1:]
+    module = COMMANDS[command][0]
+    prog = f"{PROG} {command}"
+    if command == 'batch' and args and args[0] in BATCH_COMMANDS:
+        module = BATCH_COMMANDS[args[0]]
+        prog = f"{prog} {args[0]}"
+        args = args[1:]
+    return module, prog, args
+
+
+def main(argv: list = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        sys.exit(0 if argv else 2)
+    if argv[0] not in COMMANDS:
+        print(f"{PROG}: unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+
+    module_name, prog, args = resolve(argv)
+    # argparse in each tool names itself after argv[0]
+    sys.argv[0] = prog
+    __import__(module_name).main(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Run Profiler
+Hot-path timings and counters for --profile runs of the claims tools.
+
+Records:
+- Phase spans (load, prefetch, validate, dump, ...)
+- Per-claim timings with the strategy path each claim went through,
+  e.g. "exact_path>search" for a class whose expected file was missing
+- Counters: subprocesses, bytes scanned, fallbacks, cache hits/misses
+
+summary() condenses these into a dict for the output document's summary,
+and write_trace() saves Chrome trace-event JSON (chrome://tracing, Perfetto).
+A disabled profiler turns every call into a no-op.
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+
+class ClaimTiming(NamedTuple):
+    claim_type: str
+    claim: str
+    seconds: float
+    strategy: str
+
+
+class Profiler:
+    """Collects spans, per-claim timings and counters for one run"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.claims: List[ClaimTiming] = []
+        self.events: List[Dict[str, Any]] = []
+        self._strategy: List[str] = []
+
+    def _trace(self, name: str, category: str, start: float, seconds: float, args: Dict[str, Any]):
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - self.origin) * 1e6, 1),
+            'dur': round(seconds * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def span(self, name: str, category: str = 'phase', **args):
+        """Context manager timing one phase or operation"""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name: str, category: str, args: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if category == 'phase':
+                self.phases[name] = self.phases.get(name, 0.0) + seconds
+            self._trace(name, category, start, seconds, args)
+
+    def claim(self, claim_type: str, claim: str):
+        """Context manager timing the validation of one claim"""
+        if not self.enabled:
+            return nullcontext()
+        return self._claim(claim_type, claim)
+
+    @contextmanager
+    def _claim(self, claim_type: str, claim: str):
+        self._strategy = []
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            strategy = '>'.join(self._strategy) or 'none'
+            self.claims.append(ClaimTiming(claim_type, claim, seconds, strategy))
+            self._trace(claim, claim_type, start, seconds, {'strategy': strategy})
+
+    def strategy(self, name: str):
+        """Note a lookup strategy taken by the claim being timed"""
+        if self.enabled:
+            self._strategy.append(name)
+
+    def count(self, counter: str, amount: int = 1):
+        if self.enabled:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def summary(self) -> Dict[str, Any]:
+        """Phase totals, per-claim-type statistics, counters and the slowest 1% of claims"""
+        by_type: Dict[str, List[ClaimTiming]] = {}
+        for timing in self.claims:
+            by_type.setdefault(timing.claim_type, []).append(timing)
+
+        claim_types = {}
+        for claim_type, timings in by_type.items():
+            seconds = sorted(timing.seconds for timing in timings)
+            strategies: Dict[str, int] = {}
+            for timing in timings:
+                strategies[timing.strategy] = strategies.get(timing.strategy, 0) + 1
+            claim_types[claim_type] = {
+                'claims': len(seconds),
+                'seconds': round(sum(seconds), 6),
+                'mean_ms': round(sum(seconds) / len(seconds) * 1000, 3),
+                'p99_ms': round(seconds[min(len(seconds) - 1, math.ceil(len(seconds) * 0.99) - 1)] * 1000, 3),
+                'max_ms': round(seconds[-1] * 1000, 3),
+                'strategies': strategies,
+            }
+
+        slowest = sorted(self.claims, key=lambda timing: timing.seconds, reverse=True)
+        slowest = slowest[:max(1, math.ceil(len(slowest) * 0.01))] if slowest else []
+
+        return {
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'claim_types': claim_types,
+            'counters': dict(sorted(self.counters.items())),
+            'slowest_claims': [
+                {'claim_type': timing.claim_type, 'claim': timing.claim,
+                 'ms': round(timing.seconds * 1000, 3), 'strategy': timing.strategy}
+                for timing in slowest
+            ],
+        }
+
+    def write_trace(self, path: Path):
+        """Write Chrome trace-event JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+
+# Shared disabled profiler for runs without --profile
+NULL_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Claim Pruning Report
+Measures what extract_claims.py --min-score saves in validation.
+
+For every claims file written with pruning (batch_extract.py or
+extract_claims.py record deferred_claims), validates the kept claims and
+then the deferred ones against one source root, uncached, and reports per
+document:
+- claims extracted, kept and deferred (the volume pruning removed)
+- seconds validating the kept claims took, and the seconds the deferred
+  claims would have added (the time pruning saved)
+- deferred claims the root does have, i.e. what a lower --min-score would
+  have kept, listed with their scores
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+from validate_claims import CLAIM_VALIDATORS, MagentoValidator, validate_claim_list
+from batch_validate import default_search_paths, find_claims_files
+from search_executor import SearchToolError
+from tree_scanner import SCAN_TOOL
+from claims_io import dump_document, load_document
+
+
+def _timed_validation(validator: MagentoValidator, claims: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Validate claim lists by type; seconds spent and the results that were found"""
+    start = time.perf_counter()
+    found = {}
+    for claim_type, claim_list in claims.items():
+        if claim_list and claim_type in CLAIM_VALIDATORS:
+            for claim, result in validate_claim_list(validator, claim_type, claim_list).items():
+                if result.found:
+                    found.setdefault(claim_type, []).append(claim)
+    return {'seconds': time.perf_counter() - start, 'found': found}
+
+
+def report_document(validator: MagentoValidator, claims_file: Path) -> Dict[str, Any]:
+    """Kept vs deferred claim counts and validation seconds of one claims file"""
+    claims_data = load_document(claims_file) or {}
+    kept_claims = claims_data.get('claims') or {}
+    deferred_claims = claims_data.get('deferred_claims') or {}
+    scores = {(claim_type, entry['claim']): entry['score']
+              for claim_type, entries in deferred_claims.items() for entry in entries}
+
+    kept = _timed_validation(validator, kept_claims)
+    deferred = _timed_validation(validator, {claim_type: [entry['claim'] for entry in entries]
+                                             for claim_type, entries in deferred_claims.items()})
+
+    kept_count = sum(len(claim_list) for claim_list in kept_claims.values())
+    deferred_count = len(scores)
+    return {
+        'claims_file': str(claims_file),
+        'source_document': claims_data.get('source_document'),
+        'min_score': (claims_data.get('pruning') or {}).get('min_score'),
+        'extracted': kept_count + deferred_count,
+        'kept': kept_count,
+        'deferred': deferred_count,
+        'deferred_by_type': {claim_type: len(entries) for claim_type, entries in deferred_claims.items()},
+        'kept_seconds': round(kept['seconds'], 4),
+        'saved_seconds': round(deferred['seconds'], 4),
+        'deferred_found': {claim_type: [{'claim': claim, 'score': scores[(claim_type, claim)]}
+                                        for claim in sorted(claim_list)]
+                           for claim_type, claim_list in deferred['found'].items()},
+    }
+
+
+def summarize(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    extracted = sum(document['extracted'] for document in documents)
+    deferred = sum(document['deferred'] for document in documents)
+    kept_seconds = sum(document['kept_seconds'] for document in documents)
+    saved_seconds = sum(document['saved_seconds'] for document in documents)
+    return {
+        'documents': len(documents),
+        'extracted': extracted,
+        'deferred': deferred,
+        'deferred_percent': round(100 * deferred / max(extracted, 1), 1),
+        'kept_seconds': round(kept_seconds, 3),
+        'saved_seconds': round(saved_seconds, 3),
+        'saved_percent': round(100 * saved_seconds / max(kept_seconds + saved_seconds, 1e-9), 1),
+        'deferred_found': sum(len(claim_list) for document in documents
+                              for claim_list in document['deferred_found'].values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report the claims and validation time that claim pruning removes, per document',
+        epilog='Example: prune_report.py /path/to/magento ../Magento_Customer --output prune_report.yaml'
+    )
+    parser.add_argument('magento_root', type=Path)
+    parser.add_argument('paths', type=Path, nargs='*',
+                        help='claims files or directories (default: validation/Magento_* and revalidation/*)')
+    parser.add_argument('--no-index', action='store_true',
+                        help='search the source tree files instead of using the symbol index')
+    parser.add_argument('--search-tool', choices=[SCAN_TOOL, 'rg', 'grep'], default=SCAN_TOOL,
+                        help='how --no-index searches files: in-process, or with rg/grep subprocesses '
+                             f'(default: {SCAN_TOOL})')
+    parser.add_argument('--graph', type=Path, action='append', default=[], dest='graph_paths',
+                        help='*-graph.json file or directory of them (repeatable)')
+    parser.add_argument('--output', type=Path,
+                        help='also write the report, in the format implied by the extension')
+    args = parser.parse_args()
+
+    if not args.magento_root.exists():
+        print(f"Error: Magento root not found: {args.magento_root}")
+        sys.exit(1)
+
+    claims_files = find_claims_files(args.paths or default_search_paths())
+    try:
+        validator = MagentoValidator(args.magento_root, use_index=not args.no_index, graph_paths=args.graph_paths,
+                                     search_tool=args.search_tool)
+    except SearchToolError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    documents = []
+    for claims_file in claims_files:
+        if 'deferred_claims' not in (load_document(claims_file) or {}):
+            continue
+        documents.append(report_document(validator, claims_file))
+
+    if validator.index is not None:
+        validator.index.close()
+
+    if not documents:
+        print("No pruned claims files (re-extract with extract_claims.py or batch_extract.py)")
+        sys.exit(1)
+
+    print(f"{'document':<56} {'claims':>6} {'deferred':>8} {'kept s':>8} {'saved s':>8} {'lost':>5}")
+    for document in documents:
+        name = '/'.join(Path(document['claims_file']).parts[-2:])
+        lost = sum(len(claim_list) for claim_list in document['deferred_found'].values())
+        print(f"{name:<56} {document['extracted']:>6} {document['deferred']:>8} "
+              f"{document['kept_seconds']:>8.3f} {document['saved_seconds']:>8.3f} {lost:>5}")
+
+    summary = summarize(documents)
+    print()
+    print(f"Deferred: {summary['deferred']} of {summary['extracted']} claims ({summary['deferred_percent']}%)")
+    print(f"Validation: {summary['kept_seconds']:.3f}s kept, {summary['saved_seconds']:.3f}s saved "
+          f"({summary['saved_percent']}%)")
+    print(f"Deferred claims the root has: {summary['deferred_found']}")
+
+    if args.output:
+        dump_document({'magento_root': str(args.magento_root), 'summary': summary, 'documents': documents},
+                      args.output)
+        print(f"Report: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
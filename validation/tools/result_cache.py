@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Validation Result Cache
+Persistent cache of ValidationResults for incremental revalidation.
+
+Each result is keyed on (source tree, search backend, claim type, claim) and
+stored, with evidence paths relative to the source root, together with a
+fingerprint of the files that produced it:
+- found claims: mtime and size of every evidence file
+- not-found claims: fingerprint of the whole source tree (and of the graph
+  files, when a graph is used), since any new or changed file could make
+  them found
+
+A cached result is reused only while its fingerprint still matches, so a
+rerun re-validates just the claims that are new or whose evidence changed.
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from symbol_index import tree_fingerprint
+
+
+CACHE_FILENAME = '.validation-cache.sqlite'
+SCHEMA_VERSION = '6'
+
+
+class ResultCache:
+    """SQLite-backed ValidationResult cache bound to one validator"""
+
+    def __init__(self, cache_path: Path, validator):
+        self.cache_path = cache_path
+        self.validator = validator
+        self.source_key = f"{validator.vendor_path}|{'index' if validator.index is not None else 'search'}"
+        if validator.graph is not None:
+            self.source_key += '+graph'
+
+        self.hits = 0
+        self.misses = 0
+        self._tree_fingerprint: Optional[str] = None
+        self._file_stats: Dict[str, Optional[Tuple[int, int]]] = {}
+
+        # Batch workers share one cache file; wait on each other's writes
+        self.conn = sqlite3.connect(str(cache_path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                source TEXT NOT NULL,
+                claim_type TEXT NOT NULL,
+                claim TEXT NOT NULL,
+                result TEXT NOT NULL,
+                files TEXT NOT NULL,
+                tree TEXT,
+                PRIMARY KEY (source, claim_type, claim)
+            );
+        """)
+
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or row[0] != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.execute("DELETE FROM results")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (SCHEMA_VERSION,))
+
+    def tree_fingerprint(self) -> str:
+        """Fingerprint of the whole source tree, computed once per run"""
+        if self._tree_fingerprint is None:
+            if self.validator.index is not None:
+                self._tree_fingerprint = self.validator.index.fingerprint()
+            else:
+                self._tree_fingerprint = tree_fingerprint(self.validator.vendor_path)
+            if self.validator.graph is not None:
+                # A graph answers not-found claims too; a regenerated graph may now name them
+                self._tree_fingerprint += self.validator.graph.stamp()
+        return self._tree_fingerprint
+
+    def _stat(self, path: str) -> Optional[Tuple[int, int]]:
+        if path not in self._file_stats:
+            if self.validator.archive is not None:
+                # Archive members are only known to the index
+                self._file_stats[path] = self.validator.index.file_stat(path)
+                return self._file_stats[path]
+            try:
+                st = os.stat(self.validator.vendor_path / path)
+                self._file_stats[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                self._file_stats[path] = None
+        return self._file_stats[path]
+
+    def _fingerprint_files(self, evidence: List[List[Any]]) -> List[Tuple[str, Optional[Tuple[int, int]]]]:
+        """(path, (mtime_ns, size)) for each distinct [relative_path, line] evidence file"""
+        return [(path, self._stat(path)) for path in sorted({path for path, _ in evidence})]
+
+    def get(self, claim_type: str, claim: str) -> Optional[Dict[str, Any]]:
+        """Return the cached ValidationResult record if its evidence is unchanged, else None"""
+
+        row = self.conn.execute(
+            "SELECT result, files, tree FROM results WHERE source = ? AND claim_type = ? AND claim = ?",
+            (self.source_key, claim_type, claim)
+        ).fetchone()
+
+        if row is not None:
+            result = json.loads(row[0])
+            if result['found']:
+                stored = [(path, tuple(stat) if stat else None) for path, stat in json.loads(row[1])]
+                fresh = stored == self._fingerprint_files(result['evidence'])
+            else:
+                fresh = row[2] == self.tree_fingerprint()
+            if fresh:
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, claim_type: str, claim: str, result):
+        """Store a freshly validated result with its evidence fingerprint (until flush())"""
+        record = result.to_record(self.validator.files)
+        files = self._fingerprint_files(record['evidence']) if result.found else []
+        tree = None if result.found else self.tree_fingerprint()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (self.source_key, claim_type, claim, json.dumps(record), json.dumps(files), tree)
+        )
+
+    def flush(self):
+        """Commit stored results in one transaction"""
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Validation Results Warehouse
+One indexed SQLite database over every *_validation file, for queries
+across modules and runs without loading YAML.
+
+ingest loads validate_claims_file output (yaml, ndjson or msgpack; both the
+current [file_index, line] evidence and the older "path:line" strings) into
+tables keyed by run, module, document, claim type and claim:
+- runs: one per named validation run. By default a file under
+  validation/revalidation/ belongs to run 'revalidation' and any other to
+  'validation'; --run names a run explicitly, e.g. for an older checkout of
+  the outputs
+- documents: one per (run, module, document) with the file's mtime and size,
+  so a re-ingest only parses files that are new or changed
+- claims: every distinct (claim type, claim), interned once
+- results: found, confidence, status, notes and evidence per document and claim
+
+A claim whose search timed out (status 'timeout') is unknown, not missing:
+the queries count it as timed out and never as not found.
+
+Queries: runs, rates (not-found rate per module and claim type), regressions
+(claims found in one run and not found in a later one, or --fixed for the
+reverse), not-found (claims not found in a run, by how many documents make
+them) and sql for anything else.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from claims_io import FORMAT_EXTENSIONS, load_document
+
+
+VALIDATION_DIR = Path(__file__).resolve().parent.parent
+WAREHOUSE_FILENAME = '.validation-warehouse.sqlite'
+SCHEMA_VERSION = '1'
+
+MODULE_DIR = re.compile(r'^[A-Z][A-Za-z0-9]*_[A-Za-z0-9]+$')
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        module TEXT NOT NULL,
+        document TEXT NOT NULL,
+        path TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        source_document TEXT,
+        magento_root TEXT,
+        validation_date TEXT,
+        total INTEGER NOT NULL,
+        found INTEGER NOT NULL,
+        UNIQUE (run_id, module, document)
+    );
+    CREATE TABLE IF NOT EXISTS claims (
+        id INTEGER PRIMARY KEY,
+        claim_type TEXT NOT NULL,
+        claim TEXT NOT NULL,
+        UNIQUE (claim_type, claim)
+    );
+    CREATE TABLE IF NOT EXISTS results (
+        document_id INTEGER NOT NULL REFERENCES documents(id),
+        claim_id INTEGER NOT NULL REFERENCES claims(id),
+        found INTEGER NOT NULL,
+        confidence TEXT,
+        status TEXT,
+        notes TEXT,
+        evidence TEXT NOT NULL,
+        PRIMARY KEY (document_id, claim_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS results_claim ON results (claim_id, found);
+    CREATE INDEX IF NOT EXISTS documents_module ON documents (module, document);
+"""
+
+
+def validation_files(paths: Sequence[Path]) -> List[Path]:
+    """*_validation files given directly, or found in Magento_* module directories under directories
+
+    Other *_validation files under a directory, such as tools/demo_validation.yaml, are not
+    per-module results and are skipped.
+    """
+    found = set()
+    for path in paths:
+        if path.is_file():
+            found.add(path)
+        elif path.is_dir():
+            for extension in FORMAT_EXTENSIONS.values():
+                found.update(file for file in path.rglob(f'*_validation{extension}')
+                             if MODULE_DIR.match(file.parent.name))
+    return sorted(found)
+
+
+def default_run(path: Path) -> str:
+    return 'revalidation' if 'revalidation' in path.parts else 'validation'
+
+
+def module_and_document(path: Path) -> Tuple[str, str]:
+    """validation/Magento_Customer/architecture_validation.yaml -> (Magento_Customer, architecture)"""
+    module = next((part for part in reversed(path.parts[:-1]) if MODULE_DIR.match(part)), path.parent.name)
+    document = path.name[:-len(f'_validation{path.suffix}')] if '_validation' in path.name else path.stem
+    return module, document
+
+
+def evidence_strings(results: Dict[str, Any], entry: Dict[str, Any]) -> List[str]:
+    """Evidence of one result as "path:line" strings, whichever layout the file uses"""
+    files = results.get('files')
+    evidence = []
+    for item in entry.get('evidence') or ():
+        if isinstance(item, str):
+            evidence.append(item)
+        elif files is not None:
+            file_index, line = item
+            evidence.append(f"{files[file_index]}:{line}")
+        else:
+            # Records written before files were interned: [relative_path, line]
+            evidence.append(f"{item[0]}:{item[1]}")
+    return evidence
+
+
+class ResultsWarehouse:
+    """SQLite store of validation results across runs"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
+        self.conn.executescript("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is not None and row[0] != SCHEMA_VERSION:
+            # Everything here is derived from the validation files; re-ingest into the new layout
+            with self.conn:
+                for table in ('results', 'claims', 'documents', 'runs'):
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (SCHEMA_VERSION,))
+        self._claim_ids: Dict[Tuple[str, str], int] = {}
+
+    def run_id(self, name: str, create: bool = False) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM runs WHERE name = ?", (name,)).fetchone()
+        if row is None and create:
+            return self.conn.execute("INSERT INTO runs (name) VALUES (?)", (name,)).lastrowid
+        return row[0] if row else None
+
+    def _claim_id(self, claim_type: str, claim: str) -> int:
+        key = (claim_type, claim)
+        claim_id = self._claim_ids.get(key)
+        if claim_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO claims (claim_type, claim) VALUES (?, ?)", key)
+            claim_id = self._claim_ids[key] = self.conn.execute(
+                "SELECT id FROM claims WHERE claim_type = ? AND claim = ?", key).fetchone()[0]
+        return claim_id
+
+    def ingest(self, paths: Sequence[Path], run: str = None, force: bool = False) -> Dict[str, int]:
+        """Load new or changed validation files; return counts of files loaded, skipped and results"""
+        stats = {'loaded': 0, 'unchanged': 0, 'results': 0}
+        with self.conn:
+            for path in validation_files(paths):
+                path = path.resolve()
+                st = os.stat(path)
+                run_id = self.run_id(run or default_run(path), create=True)
+                module, document = module_and_document(path)
+                row = self.conn.execute(
+                    "SELECT id, path, mtime_ns, size FROM documents WHERE run_id = ? AND module = ? AND document = ?",
+                    (run_id, module, document)).fetchone()
+                if row is not None and not force and tuple(row[1:]) == (str(path), st.st_mtime_ns, st.st_size):
+                    stats['unchanged'] += 1
+                    continue
+                if row is not None:
+                    self.conn.execute("DELETE FROM results WHERE document_id = ?", (row[0],))
+                    self.conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+                stats['results'] += self._load(path, st, run_id, module, document)
+                stats['loaded'] += 1
+        return stats
+
+    def _load(self, path: Path, st: os.stat_result, run_id: int, module: str, document: str) -> int:
+        results = load_document(path) or {}
+        summary = results.get('summary') or {}
+        document_id = self.conn.execute(
+            "INSERT INTO documents (run_id, module, document, path, mtime_ns, size, source_document, "
+            "magento_root, validation_date, total, found) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, module, document, str(path), st.st_mtime_ns, st.st_size, results.get('source_document'),
+             results.get('magento_root'), results.get('validation_date'),
+             summary.get('total_claims', 0), summary.get('found', 0))).lastrowid
+
+        rows = []
+        for claim_type, type_data in (results.get('results_by_type') or {}).items():
+            for entry in type_data.get('results') or ():
+                rows.append((document_id, self._claim_id(claim_type, str(entry['claim'])), int(bool(entry['found'])),
+                             entry.get('confidence'), entry.get('status'), entry.get('notes'),
+                             json.dumps(evidence_strings(results, entry))))
+        # A claim listed twice in one document keeps its last result
+        self.conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> Tuple[List[str], List[Tuple]]:
+        cursor = self.conn.execute(sql, params)
+        return [column[0] for column in cursor.description or ()], cursor.fetchall()
+
+    def read_only_query(self, sql: str) -> Tuple[List[str], List[Tuple]]:
+        """Run arbitrary SQL on a read-only connection, so no statement can change the warehouse"""
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            conn.execute("PRAGMA query_only=ON")
+            # ATTACH would create the file it names
+            conn.setlimit(sqlite3.SQLITE_LIMIT_ATTACHED, 0)
+            cursor = conn.execute(sql)
+            return [column[0] for column in cursor.description or ()], cursor.fetchall()
+        finally:
+            conn.close()
+
+    def runs(self) -> Tuple[List[str], List[Tuple]]:
+        return self.query("""
+            SELECT r.name AS run, COUNT(DISTINCT d.id) AS documents, COUNT(*) AS results,
+                   SUM(res.found) AS found, SUM(NOT res.found AND res.status IS NOT 'timeout') AS not_found,
+                   SUM(res.status IS 'timeout') AS timed_out
+            FROM runs r JOIN documents d ON d.run_id = r.id JOIN results res ON res.document_id = d.id
+            GROUP BY r.id ORDER BY r.id
+        """)
+
+    def rates(self, run: str, module: str = None, claim_type: str = None) -> Tuple[List[str], List[Tuple]]:
+        """Not-found rate per module and claim type in one run, over the claims whose search completed"""
+        return self.query("""
+            SELECT d.module, c.claim_type, COUNT(*) AS claims,
+                   SUM(NOT r.found AND r.status IS NOT 'timeout') AS not_found,
+                   SUM(r.status IS 'timeout') AS timed_out,
+                   ROUND(100.0 * SUM(NOT r.found AND r.status IS NOT 'timeout')
+                         / NULLIF(SUM(r.status IS NOT 'timeout'), 0), 1) AS not_found_pct
+            FROM results r
+            JOIN documents d ON d.id = r.document_id
+            JOIN claims c ON c.id = r.claim_id
+            WHERE d.run_id = :run AND (:module IS NULL OR d.module = :module)
+              AND (:claim_type IS NULL OR c.claim_type = :claim_type)
+            GROUP BY d.module, c.claim_type
+            ORDER BY d.module, c.claim_type
+        """, {'run': self.run_id(run), 'module': module, 'claim_type': claim_type})
+
+    def regressions(self, before: str, after: str, fixed: bool = False,
+                    module: str = None, claim_type: str = None) -> Tuple[List[str], List[Tuple]]:
+        """Claims of a document found in run before and not found in run after (or the reverse)
+
+        A timed-out result is neither, so it is never reported as a regression or a fix.
+        """
+        return self.query("""
+            SELECT d2.module, d2.document, c.claim_type, c.claim, r2.notes
+            FROM documents d1
+            JOIN results r1 ON r1.document_id = d1.id AND r1.found = :was AND r1.status IS NOT 'timeout'
+            JOIN documents d2 ON d2.run_id = :after AND d2.module = d1.module AND d2.document = d1.document
+            JOIN results r2 ON r2.document_id = d2.id AND r2.claim_id = r1.claim_id AND r2.found = :now
+                           AND r2.status IS NOT 'timeout'
+            JOIN claims c ON c.id = r1.claim_id
+            WHERE d1.run_id = :before AND (:module IS NULL OR d1.module = :module)
+              AND (:claim_type IS NULL OR c.claim_type = :claim_type)
+            ORDER BY d2.module, d2.document, c.claim_type, c.claim
+        """, {'before': self.run_id(before), 'after': self.run_id(after), 'was': int(not fixed), 'now': int(fixed),
+              'module': module, 'claim_type': claim_type})
+
+    def not_found(self, run: str, module: str = None, claim_type: str = None,
+                  limit: int = 50) -> Tuple[List[str], List[Tuple]]:
+        """Claims not found in a run, most widely claimed first; timed-out results are left out"""
+        return self.query("""
+            SELECT c.claim_type, c.claim, COUNT(*) AS documents, GROUP_CONCAT(DISTINCT d.module) AS modules
+            FROM results r
+            JOIN documents d ON d.id = r.document_id
+            JOIN claims c ON c.id = r.claim_id
+            WHERE d.run_id = :run AND r.found = 0 AND r.status IS NOT 'timeout'
+              AND (:module IS NULL OR d.module = :module)
+              AND (:claim_type IS NULL OR c.claim_type = :claim_type)
+            GROUP BY r.claim_id
+            ORDER BY documents DESC, c.claim_type, c.claim
+            LIMIT :limit
+        """, {'run': self.run_id(run), 'module': module, 'claim_type': claim_type, 'limit': limit})
+
+    def close(self):
+        self.conn.close()
+
+
+def print_table(columns: List[str], rows: List[Tuple]):
+    if not columns:
+        return
+    cells = [[('' if value is None else str(value)) for value in row] for row in rows]
+    widths = [min(max([len(column)] + [len(row[i]) for row in cells]), 60) for i, column in enumerate(columns)]
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in cells:
+        print('  '.join(cell[:60].ljust(width) for cell, width in zip(row, widths)))
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Load validation results into SQLite and query them across modules and runs',
+        epilog='Example: results_warehouse.py ingest && results_warehouse.py regressions'
+    )
+    parser.add_argument('--db', type=Path, default=VALIDATION_DIR / WAREHOUSE_FILENAME,
+                        help=f'warehouse location (default: validation/{WAREHOUSE_FILENAME})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='load new or changed *_validation files')
+    ingest_parser.add_argument('paths', type=Path, nargs='*',
+                               help='validation files or directories (default: validation/)')
+    ingest_parser.add_argument('--run', help="run to load them into (default: 'revalidation' for files under "
+                                             "revalidation/, else 'validation')")
+    ingest_parser.add_argument('--force', action='store_true', help='reload files even if unchanged')
+
+    commands.add_parser('runs', help='list runs with document and result counts')
+
+    for name, description in (('rates', 'not-found and timed-out counts per module and claim type'),
+                              ('not-found', 'claims not found in a run, most widely claimed first')):
+        query_parser = commands.add_parser(name, help=description)
+        query_parser.add_argument('--run', default='revalidation', help='run to query (default: revalidation)')
+        query_parser.add_argument('--module', help='only this module, e.g. Magento_Customer')
+        query_parser.add_argument('--type', dest='claim_type', help='only this claim type, e.g. methods')
+        if name == 'not-found':
+            query_parser.add_argument('--limit', type=int, default=50, help='rows to show (default: 50)')
+
+    regressions_parser = commands.add_parser('regressions', help='claims found in one run and not found in another')
+    regressions_parser.add_argument('--before', default='validation', help='earlier run (default: validation)')
+    regressions_parser.add_argument('--after', default='revalidation', help='later run (default: revalidation)')
+    regressions_parser.add_argument('--fixed', action='store_true',
+                                    help='list claims not found before and found after instead')
+    regressions_parser.add_argument('--module', help='only this module, e.g. Magento_Customer')
+    regressions_parser.add_argument('--type', dest='claim_type', help='only this claim type, e.g. methods')
+
+    sql_parser = commands.add_parser('sql', help='run a read-only SQL query')
+    sql_parser.add_argument('query')
+    args = parser.parse_args(argv)
+
+    warehouse = ResultsWarehouse(args.db)
+    start = time.perf_counter()
+
+    if args.command == 'ingest':
+        stats = warehouse.ingest(args.paths or [VALIDATION_DIR], args.run, args.force)
+        print(f"Loaded {stats['loaded']} files ({stats['results']} results), {stats['unchanged']} unchanged "
+              f"in {time.perf_counter() - start:.2f}s")
+        warehouse.close()
+        return
+
+    if args.command in ('rates', 'not-found', 'regressions'):
+        for run in ((args.before, args.after) if args.command == 'regressions' else (args.run,)):
+            if warehouse.run_id(run) is None:
+                print(f"Error: no run named {run!r}; ingest first or see 'runs'")
+                sys.exit(1)
+
+    if args.command == 'runs':
+        columns, rows = warehouse.runs()
+    elif args.command == 'rates':
+        columns, rows = warehouse.rates(args.run, args.module, args.claim_type)
+    elif args.command == 'not-found':
+        columns, rows = warehouse.not_found(args.run, args.module, args.claim_type, args.limit)
+    elif args.command == 'regressions':
+        columns, rows = warehouse.regressions(args.before, args.after, args.fixed, args.module, args.claim_type)
+    else:
+        try:
+            columns, rows = warehouse.read_only_query(args.query)
+        except sqlite3.Error as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    seconds = time.perf_counter() - start
+
+    print_table(columns, rows)
+    print(f"({len(rows)} rows in {seconds * 1000:.1f} ms)")
+    warehouse.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Concurrent Search Executor
+Runs rg/grep searches as asyncio subprocesses with a bounded concurrency limit.
+
+Each search gets its own deadline. A search that misses its deadline is
+killed and retried with a longer one (exponential backoff), and the first
+deadline adapts to how long completed searches have actually taken, so a
+loaded machine slows the run down instead of silently dropping results.
+A search that still times out after its retries is reported as timed out,
+never as "no matches", and neither is a search whose tool is missing or
+exits with an error (status 2 or more; 1 only means nothing matched).
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 2.0
+
+# First deadline is at least this multiple of the slowest completed search
+ADAPTIVE_FACTOR = 4.0
+
+
+class Search(NamedTuple):
+    """One search command and its optional stdin"""
+    command: List[str]
+    input: Optional[str] = None
+
+
+class SearchOutcome(NamedTuple):
+    """Output of a search; returncode is None if it timed out or the tool is missing"""
+    returncode: Optional[int]
+    stdout: str
+    timed_out: bool = False
+    attempts: int = 1
+
+    @property
+    def failed(self) -> bool:
+        """The tool could not run or reported an error: the output is not a list of matches"""
+        if self.timed_out:
+            return False
+        return self.returncode is None or self.returncode >= 2
+
+
+class SearchToolError(RuntimeError):
+    """An rg/grep search could not run or failed, so its output says nothing about matches"""
+
+
+def require_tool(tool: str):
+    """Raise SearchToolError unless the rg/grep executable is on PATH"""
+    import shutil
+    if shutil.which(tool) is None:
+        raise SearchToolError(f"{tool} is not installed; use --search-tool scan to search in-process")
+
+
+def search_command(tool: str, paths: Sequence[Path], file_pattern: str = '*.php', pattern: str = None) -> List[str]:
+    """rg/grep command for a regex pattern, or fixed-string patterns on stdin when pattern is None"""
+    if tool == 'rg':
+        command = ['rg', '-n', '--no-heading', '--with-filename',
+                   '--type', 'php' if file_pattern == '*.php' else 'xml']
+        command += ['-e', pattern] if pattern is not None else ['-F', '-f', '-']
+    else:
+        command = ['grep', '-rn', '--include', file_pattern]
+        # Extended syntax, so a pattern reads the same to grep as to rg and re
+        command += ['-E', '-e', pattern] if pattern is not None else ['-F', '-f', '-']
+    return command + [str(path) for path in paths]
+
+
+class SearchExecutor:
+    """Bounded-concurrency runner for search subprocesses"""
+
+    def __init__(self, concurrency: int = None, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF):
+        self.concurrency = max(1, concurrency or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.slowest = 0.0
+        self.timeouts = 0
+        self.retried = 0
+
+    def run(self, searches: List[Search]) -> List[SearchOutcome]:
+        """Run searches concurrently; outcomes are returned in the same order"""
+        if not searches:
+            return []
+        # Imported on the first search; index-backed runs never spawn one
+        import asyncio
+        return asyncio.run(self._run_all(searches))
+
+    def run_one(self, search: Search) -> SearchOutcome:
+        return self.run([search])[0]
+
+    async def _run_all(self, searches: List[Search]) -> List[SearchOutcome]:
+        import asyncio
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self._run_search(search, semaphore) for search in searches))
+
+    async def _run_search(self, search: Search, semaphore: 'asyncio.Semaphore') -> SearchOutcome:
+        import asyncio
+        deadline = max(self.timeout, self.slowest * ADAPTIVE_FACTOR)
+        stdin_data = search.input.encode() if search.input is not None else None
+
+        for attempt in range(1, self.retries + 2):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *search.command,
+                        stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
+                    )
+                except FileNotFoundError:
+                    return SearchOutcome(None, '', attempts=attempt)
+
+                try:
+                    stdout, _ = await asyncio.wait_for(process.communicate(stdin_data), deadline)
+                except asyncio.TimeoutError:
+                    try:
+                        process.kill()
+                    except ProcessLookupError:
+                        # Finished just as the deadline passed
+                        pass
+                    await process.wait()
+                else:
+                    self.slowest = max(self.slowest, time.perf_counter() - start)
+                    return SearchOutcome(process.returncode, stdout.decode('utf-8', errors='replace'),
+                                         attempts=attempt)
+
+            if attempt <= self.retries:
+                # Back off outside the semaphore so other searches can use the slot
+                self.retried += 1
+                await asyncio.sleep(min(deadline, 1.0) * (attempt / 2))
+                deadline *= self.backoff
+
+        self.timeouts += 1
+        return SearchOutcome(None, '', timed_out=True, attempts=self.retries + 1)
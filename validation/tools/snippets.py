@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Evidence Snippets
+Source lines around evidence sites, for validate_claims.py --snippets N.
+
+Evidence is a (file, line) pair, and thousands of them can point into the
+same few files (Model/Customer.php, di.xml). So a file is read at most
+once per run:
+- The first snippet from a file memory-maps it and builds its line-offset
+  table (the byte offset at which every line starts) in one scan
+- Every later snippet from that file is two lookups in the table and one
+  slice of the map; nothing else is read or copied
+- Tables live as long as the SnippetReader, which is shared by every
+  claims file of a run. Maps are bounded (MAX_OPEN_MAPS, least recently
+  used closed first), since each one holds a file descriptor
+
+Archive roots have no files to map: a member is read once with
+ArchiveSource.read() and its bytes are kept in place of the map.
+"""
+
+import re
+import sys
+import mmap
+from array import array
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from archive_source import ArchiveSource, is_archive
+
+
+# Open memory maps kept at once; their line tables are kept regardless
+MAX_OPEN_MAPS = 256
+
+NEWLINE = re.compile(rb'\n')
+
+Buffer = Union[mmap.mmap, bytes]
+
+
+def line_offsets(data: Buffer) -> array:
+    """Byte offset of the start of every line: line n starts at offsets[n - 1]"""
+    offsets = array('Q', [0])
+    offsets.extend(match.end() for match in NEWLINE.finditer(data))
+    if offsets[-1] == len(data) and len(offsets) > 1:
+        # A final newline ends the last line rather than starting another
+        offsets.pop()
+    return offsets
+
+
+class SnippetReader:
+    """Context lines around evidence lines, from mapped files and cached line tables"""
+
+    def __init__(self, root: Path, context: int, archive: ArchiveSource = None, archive_prefix: str = ''):
+        self.root = root
+        self.context = context
+        self.archive = archive
+        self.archive_prefix = archive_prefix
+        self._maps: 'OrderedDict[str, Buffer]' = OrderedDict()
+        self._offsets: Dict[str, Optional[array]] = {}
+        # Counters reported by the validation summary
+        self.snippets = 0
+        self.files_read = 0
+
+    def _open(self, path: str) -> Optional[Buffer]:
+        if self.archive is not None:
+            name = f"{self.archive_prefix}/{path}" if self.archive_prefix else path
+            try:
+                return self.archive.read(name)
+            except FileNotFoundError:
+                return None
+        try:
+            with open(self.root / path, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing, unreadable, or empty (an empty file cannot be mapped)
+            return None
+
+    def _buffer(self, path: str) -> Optional[Buffer]:
+        data = self._maps.get(path)
+        if data is not None:
+            self._maps.move_to_end(path)
+            return data
+        data = self._open(path)
+        if data is None:
+            return None
+        self._maps[path] = data
+        if len(self._maps) > MAX_OPEN_MAPS:
+            _, evicted = self._maps.popitem(last=False)
+            if isinstance(evicted, mmap.mmap):
+                evicted.close()
+        return data
+
+    def snippet(self, path: str, line: int) -> Optional[Dict[str, Any]]:
+        """{'line': first line shown, 'text': lines line-N .. line+N} of a file relative to the root"""
+        offsets = self._offsets.get(path, False)
+        data = self._buffer(path) if offsets is not None else None
+        if offsets is False:
+            self.files_read += 1
+            offsets = self._offsets[path] = line_offsets(data) if data is not None else None
+        if data is None or offsets is None or not 1 <= line <= len(offsets):
+            return None
+
+        first = max(1, line - self.context)
+        last = min(len(offsets), line + self.context)
+        end = offsets[last] if last < len(offsets) else len(data)
+        self.snippets += 1
+        text = data[offsets[first - 1]:end].decode('utf-8', errors='replace')
+        return {'line': first, 'text': text.rstrip('\r\n')}
+
+    def forget(self, paths):
+        """Drop the maps and line tables of changed files; they are rebuilt when next touched"""
+        for path in paths:
+            self._offsets.pop(path, None)
+            data = self._maps.pop(path, None)
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    @property
+    def cached_files(self) -> int:
+        return len(self._offsets)
+
+    def close(self):
+        for data in self._maps.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._maps.clear()
+        if self.archive is not None:
+            self.archive.close()
+
+
+def open_snippet_reader(magento_root: Path, source_root: Path, context: int) -> SnippetReader:
+    """Reader for evidence paths relative to source_root (a validator's vendor_path)
+
+    For an archive root, source_root is <archive>/<prefix of the source tree>,
+    and members are read from the archive instead.
+    """
+    if is_archive(magento_root):
+        prefix = Path(source_root).relative_to(magento_root).as_posix()
+        return SnippetReader(source_root, context, ArchiveSource(magento_root), '' if prefix == '.' else prefix)
+    return SnippetReader(source_root, context)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: snippets.py <file> <line> [context]")
+        sys.exit(1)
+
+    path = Path(sys.argv[1])
+    reader = SnippetReader(path.parent, int(sys.argv[3]) if len(sys.argv) > 3 else 3)
+    snippet = reader.snippet(path.name, int(sys.argv[2]))
+    if snippet is None:
+        print(f"No line {sys.argv[2]} in {path}")
+        sys.exit(1)
+    for number, text in enumerate(snippet['text'].split('\n'), snippet['line']):
+        print(f"{number:>6}  {text}")
+    reader.close()
+
+
+if __name__ == '__main__':
+    main()
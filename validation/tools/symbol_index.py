@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Persistent Symbol Index
+One-time indexing pass over a Magento source tree, stored in SQLite.
+
+Records every declaration the validator asks about, with file:line:
+- PHP classes, interfaces and traits (short name and FQCN)
+- Function/method declarations
+- Event names (events.xml observers, ->dispatch() calls, model _eventPrefix)
+- Database tables (db_schema.xml declarations, getTable()/_init() references)
+- ACL resource identifiers (acl.xml)
+
+The index lives next to the source tree and is refreshed incrementally:
+only files whose mtime or size changed since the last pass are re-scanned.
+Files are also recorded by content digest, so a file whose content is
+already indexed (here or in another tree's index) copies its symbols
+instead of being scanned.
+"""
+
+import os
+import re
+import hashlib
+import sys
+import sqlite3
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+INDEX_FILENAME = '.magento-symbols.sqlite'
+SCHEMA_VERSION = '2'
+
+# Standard model events derived from AbstractModel::$_eventPrefix
+MODEL_EVENT_SUFFIXES = (
+    '_load_before', '_load_after',
+    '_save_before', '_save_after', '_save_commit_after',
+    '_delete_before', '_delete_after', '_delete_commit_after',
+)
+
+# (relative_path, mtime_ns, size, read) where read() returns the file's bytes
+SourceFile = Tuple[str, int, int, Callable[[], bytes]]
+
+PHP_SYMBOL_PATTERN = re.compile(
+    r'^[ \t]*namespace[ \t]+(?P<namespace>[A-Za-z0-9_\\]+)[ \t]*;'
+    r'|^[ \t]*(?:(?:abstract|final|readonly)[ \t]+)*(?P<type_kind>class|interface|trait)[ \t]+(?P<type_name>[A-Za-z_][A-Za-z0-9_]*)'
+    r'|\bfunction[ \t]+&?[ \t]*(?P<function>[A-Za-z_][A-Za-z0-9_]*)[ \t]*\('
+    r'|->dispatch\(\s*[\'"](?P<dispatch>[A-Za-z0-9_]+)[\'"]'
+    r'|\$_eventPrefix\s*=\s*[\'"](?P<event_prefix>[a-z0-9_]+)[\'"]'
+    r'|(?:getTable|_init)\(\s*[\'"](?P<table>[a-z0-9_]+)[\'"]',
+    re.MULTILINE
+)
+
+XML_SYMBOL_PATTERN = re.compile(
+    r'<event\s+name="(?P<event>[^"]+)"'
+    r'|<table\s+name="(?P<table>[^"]+)"'
+    r'|<resource\s+id="(?P<acl_resource>[^"]+)"'
+)
+
+
+def scan_source(rel_path: str, text: str) -> Iterator[Tuple[str, str, Optional[str], int]]:
+    """Yield (kind, name, fqcn, line) symbols declared in one source file"""
+
+    if rel_path.endswith('.php'):
+        pattern = PHP_SYMBOL_PATTERN
+    elif rel_path.endswith('.xml'):
+        pattern = XML_SYMBOL_PATTERN
+    else:
+        return
+
+    namespace = ''
+    line = 1
+    last_pos = 0
+
+    for match in pattern.finditer(text):
+        line += text.count('\n', last_pos, match.start())
+        last_pos = match.start()
+        group = match.lastgroup
+
+        if group == 'namespace':
+            namespace = match.group('namespace')
+        elif group == 'type_name':
+            name = match.group('type_name')
+            fqcn = f"{namespace}\\{name}" if namespace else name
+            yield match.group('type_kind'), name, fqcn, line
+        elif group:
+            yield group, match.group(group), None, line
+
+
+def walk_source_files(source_path: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (relative_path, stat) for every PHP and XML file in the tree"""
+    stack = [str(source_path)]
+    root_len = len(str(source_path)) + 1
+
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.'):
+                    stack.append(entry.path)
+            elif entry.name.endswith(('.php', '.xml')):
+                try:
+                    yield entry.path[root_len:], entry.stat()
+                except OSError:
+                    continue
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def directory_files(source_path: Path) -> Iterator[SourceFile]:
+    """(relative_path, mtime_ns, size, read) for every PHP and XML file in a directory tree"""
+    root = str(source_path)
+    for rel_path, st in walk_source_files(source_path):
+        yield rel_path, st.st_mtime_ns, st.st_size, partial(_read_bytes, os.path.join(root, rel_path))
+
+
+def tree_fingerprint(source_path: Path) -> str:
+    """Hash of every source file's path, mtime and size"""
+    digest = hashlib.sha1()
+    for rel_path, st in sorted(walk_source_files(source_path)):
+        digest.update(f"{rel_path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+class SymbolIndex:
+    """SQLite-backed symbol index for one Magento source tree"""
+
+    def __init__(self, source_path: Path, index_path: Path, read_only: bool = False):
+        self.source_path = source_path
+        self.index_path = index_path
+
+        if read_only:
+            # Shared by worker processes: no schema changes, no refresh
+            self.conn = sqlite3.connect(f"{Path(index_path).resolve().as_uri()}?mode=ro", uri=True)
+            return
+
+        self.conn = sqlite3.connect(str(index_path))
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or row[0] != SCHEMA_VERSION:
+            # Older layouts are rebuilt from scratch rather than migrated
+            self.conn.executescript("DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;")
+
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS symbols (
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                fqcn TEXT,
+                file_id INTEGER NOT NULL,
+                line INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS symbols_by_name ON symbols (kind, name);
+            CREATE INDEX IF NOT EXISTS symbols_by_fqcn ON symbols (fqcn);
+            CREATE INDEX IF NOT EXISTS symbols_by_file ON symbols (file_id);
+        """)
+
+        if row is None or row[0] != SCHEMA_VERSION:
+            self.clear()
+
+    def clear(self):
+        """Drop all indexed data"""
+        with self.conn:
+            self.conn.execute("DELETE FROM symbols")
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (SCHEMA_VERSION,))
+
+    def refresh(self, changed: List[str] = None, shared: Sequence['SymbolIndex'] = (),
+                files: Iterable[SourceFile] = None) -> Dict[str, int]:
+        """Bring the index up to date with the source tree; return change counts
+
+        Relative paths of re-scanned and removed files are appended to changed.
+        Files whose content is already indexed here or in one of the shared
+        indexes (other editions of the same code) copy those symbols instead
+        of being scanned again. files replaces the walk of source_path, e.g.
+        with members streamed from an archive.
+        """
+
+        if files is None:
+            files = directory_files(self.source_path)
+
+        known = {}
+        # Content digest -> file id, here and in each shared index
+        own_digests: Dict[str, int] = {}
+        for file_id, path, mtime_ns, size, digest in self.conn.execute(
+                "SELECT id, path, mtime_ns, size, digest FROM files"):
+            known[path] = (file_id, mtime_ns, size, digest)
+            own_digests.setdefault(digest, file_id)
+        sources = [(self, own_digests), *((index, index.digests()) for index in shared)]
+        stats = {'scanned': 0, 'reused': 0, 'unchanged': 0, 'removed': 0}
+
+        with self.conn:
+            for rel_path, mtime_ns, size, read in files:
+                previous = known.pop(rel_path, None)
+                if previous and previous[1] == mtime_ns and previous[2] == size:
+                    stats['unchanged'] += 1
+                    continue
+
+                try:
+                    data = read()
+                except OSError:
+                    continue
+
+                # scan_source only looks at the extension, so it is part of the content key
+                digest = hashlib.sha1(data + rel_path[rel_path.rfind('.'):].encode()).hexdigest()
+                for source, digests in sources:
+                    if digest in digests:
+                        symbols = source.file_symbols(digests[digest])
+                        stats['reused'] += 1
+                        break
+                else:
+                    symbols = list(scan_source(rel_path, data.decode('utf-8', errors='ignore')))
+                    stats['scanned'] += 1
+
+                if previous and own_digests.get(previous[3]) == previous[0]:
+                    # This file no longer has the content it was indexed under
+                    del own_digests[previous[3]]
+                file_id = self._store(rel_path, mtime_ns, size, digest, symbols,
+                                      previous[0] if previous else None)
+                own_digests.setdefault(digest, file_id)
+                if changed is not None:
+                    changed.append(rel_path)
+
+            for rel_path, (file_id, _, _, _) in known.items():
+                self.conn.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+                self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                stats['removed'] += 1
+                if changed is not None:
+                    changed.append(rel_path)
+
+        return stats
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def file_stat(self, rel_path: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of an indexed file as of the last refresh, or None"""
+        return self.conn.execute("SELECT mtime_ns, size FROM files WHERE path = ?", (rel_path,)).fetchone()
+
+    def digests(self) -> Dict[str, int]:
+        """Content digest -> id of one indexed file with that content"""
+        digests: Dict[str, int] = {}
+        for digest, file_id in self.conn.execute("SELECT digest, id FROM files"):
+            digests.setdefault(digest, file_id)
+        return digests
+
+    def file_symbols(self, file_id: int) -> List[Tuple[str, str, Optional[str], int]]:
+        """(kind, name, fqcn, line) symbols recorded for one indexed file"""
+        return self.conn.execute(
+            "SELECT kind, name, fqcn, line FROM symbols WHERE file_id = ? ORDER BY rowid", (file_id,)
+        ).fetchall()
+
+    def _store(self, rel_path: str, mtime_ns: int, size: int, digest: str,
+               symbols: Iterable[Tuple[str, str, Optional[str], int]], file_id: Optional[int] = None) -> int:
+        """Replace the recorded symbols for one file; return its file id"""
+        if file_id is None:
+            file_id = self.conn.execute(
+                "INSERT INTO files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                (rel_path, mtime_ns, size, digest)
+            ).lastrowid
+        else:
+            self.conn.execute("UPDATE files SET mtime_ns = ?, size = ?, digest = ? WHERE id = ?",
+                              (mtime_ns, size, digest, file_id))
+            self.conn.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+
+        self.conn.executemany(
+            "INSERT INTO symbols (kind, name, fqcn, file_id, line) VALUES (?, ?, ?, ?, ?)",
+            ((kind, name, fqcn, file_id, line) for kind, name, fqcn, line in symbols)
+        )
+        return file_id
+
+    def fingerprint(self) -> str:
+        """Hash of the indexed files' paths, mtimes and sizes
+
+        Matches tree_fingerprint() for the same tree once the index is fresh.
+        """
+        digest = hashlib.sha1()
+        for rel_path, mtime_ns, size in self.conn.execute("SELECT path, mtime_ns, size FROM files ORDER BY path"):
+            digest.update(f"{rel_path}\0{mtime_ns}\0{size}\n".encode())
+        return digest.hexdigest()
+
+    def lookup(self, kinds: Iterable[str], name: str) -> List[Tuple[Path, int]]:
+        """Return (file_path, line_number) declarations of a symbol by short name"""
+        kinds = list(kinds)
+        rows = self.conn.execute(
+            f"SELECT f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+            f"WHERE s.kind IN ({','.join('?' * len(kinds))}) AND s.name = ? ORDER BY f.path, s.line",
+            (*kinds, name)
+        )
+        return [(self.source_path / path, line) for path, line in rows]
+
+    def lookup_fqcn(self, fqcn: str) -> List[Tuple[Path, int]]:
+        """Return (file_path, line_number) declarations of a class, interface or trait"""
+        rows = self.conn.execute(
+            "SELECT f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+            "WHERE s.fqcn = ? ORDER BY f.path, s.line",
+            (fqcn.lstrip('\\'),)
+        )
+        return [(self.source_path / path, line) for path, line in rows]
+
+    def sites(self, kinds: Iterable[str], suffix: str = '') -> Iterator[Tuple[str, str, str, int]]:
+        """Yield (kind, name, relative_path, line) for every symbol of the given kinds"""
+        kinds = list(kinds)
+        yield from self.conn.execute(
+            f"SELECT s.kind, s.name, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+            f"WHERE s.kind IN ({','.join('?' * len(kinds))}) AND f.path LIKE ? ORDER BY f.path, s.line",
+            (*kinds, f'%{suffix}')
+        )
+
+    def lookup_model_event(self, event_name: str) -> List[Tuple[Path, int]]:
+        """Return _eventPrefix declarations that generate a standard model event"""
+        for suffix in MODEL_EVENT_SUFFIXES:
+            if event_name.endswith(suffix):
+                return self.lookup(['event_prefix'], event_name[:-len(suffix)])
+        return []
+
+    def close(self):
+        self.conn.close()
+
+
+def open_index(source_path: Path, magento_root: Path, index_path: Path = None, rebuild: bool = False,
+               read_only: bool = False, shared: Sequence[SymbolIndex] = ()) -> SymbolIndex:
+    """Open (or create) the on-disk index for a source tree and refresh it
+
+    A read-only index is opened as-is; it must already have been built.
+    Shared indexes of other trees supply symbols for identical files.
+    """
+    if index_path is None:
+        index_path = magento_root / INDEX_FILENAME
+
+    if read_only:
+        return SymbolIndex(source_path, index_path, read_only=True)
+
+    index = SymbolIndex(source_path, index_path)
+    if rebuild:
+        index.clear()
+    index.refresh(shared=shared)
+    return index
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: symbol_index.py <magento_root> [index_path]")
+        print("Example: symbol_index.py /path/to/magento")
+        sys.exit(1)
+
+    from validate_claims import MagentoValidator
+
+    magento_root = Path(sys.argv[1])
+    index_path = Path(sys.argv[2]) if len(sys.argv) >= 3 else magento_root / INDEX_FILENAME
+
+    validator = MagentoValidator(magento_root, use_index=False)
+    index = SymbolIndex(validator.vendor_path, index_path)
+    stats = index.refresh()
+
+    print(f"Index: {index_path}")
+    print(f"  Files scanned: {stats['scanned']}")
+    print(f"  Files reused (identical content): {stats['reused']}")
+    print(f"  Files unchanged: {stats['unchanged']}")
+    print(f"  Files removed: {stats['removed']}")
+    for kind, count in index.conn.execute("SELECT kind, COUNT(*) FROM symbols GROUP BY kind ORDER BY kind"):
+        print(f"  {kind}: {count}")
+
+
+if __name__ == '__main__':
+    main()
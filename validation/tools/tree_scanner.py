@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+In-Process Tree Search
+The rg/grep searches of --no-index validation, without starting a process.
+
+Search mode asks two kinds of question of every PHP (or XML) file in the
+source tree: one pattern ("class Customer") for a single claim, and a batch
+for a whole claim type, either fixed strings ("class Customer", "class
+Order", ...) or one regex whose group names the claim a line belongs to
+(the definitions of save, getById, ...). TreeScanner answers both
+in-process:
+- The file manifest is walked once (walk_source_files(), so hidden
+  directories are skipped as in the symbol index) and kept, with sizes,
+  per extension for the scanner's lifetime
+- A batch of fixed strings is compiled into one bytes alternation, so the
+  tree is read once per batch, and each file is searched with it directly.
+  Line numbers are only counted in files that match
+- Files of MMAP_MIN_SIZE or more are memory-mapped. Smaller ones, nearly
+  all of a Magento tree, are read with one os.read(): mapping and
+  unmapping a few kilobytes costs more than copying them
+- Files are scanned in chunks on a thread pool of --search-jobs threads.
+  Opening and reading a file release the GIL and CPython's re does not,
+  so threads overlap file I/O with matching rather than matching in
+  parallel; with one core the scan runs inline
+
+Matches are reported per line, like rg -n and grep -n, as (Path, line)
+tuples in path order, the same form _parse_search_output() returns.
+"""
+
+import os
+import re
+import sys
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple, Union
+
+from symbol_index import walk_source_files
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+# The search tool name MagentoValidator uses for this backend, next to 'rg' and 'grep'
+SCAN_TOOL = 'scan'
+
+# Files at least this large are mapped instead of read
+MMAP_MIN_SIZE = 256 * 1024
+
+# Files handed to a worker thread at a time
+CHUNK_FILES = 64
+
+# (relative path, size) of one manifest file
+Entry = Tuple[str, int]
+# (line number, line bytes)
+LineHit = Tuple[int, bytes]
+
+
+def _load(path: str, size: int) -> Union[bytes, mmap.mmap]:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if size < MMAP_MIN_SIZE:
+            data = os.read(fd, size + 1)
+            if len(data) <= size:
+                return data
+            # Grew since the manifest was walked; map all of it instead
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def scan_file(path: str, size: int, pattern: Pattern[bytes]) -> List[LineHit]:
+    """Every line of a file that pattern matches, once per line"""
+    try:
+        data = _load(path, size)
+    except (OSError, ValueError):
+        # Missing, unreadable, or empty (an empty file cannot be mapped)
+        return []
+
+    try:
+        hits = []
+        line = 1
+        counted = 0
+        match = pattern.search(data)
+        while match is not None:
+            start = data.rfind(b'\n', 0, match.start()) + 1
+            end = data.find(b'\n', match.start())
+            if end < 0:
+                end = len(data)
+            line += data[counted:start].count(b'\n')
+            counted = start
+            hits.append((line, data[start:end]))
+            # The rest of the line is already reported
+            match = pattern.search(data, end + 1)
+        return hits
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def _scan_chunk(files: Sequence[Tuple[str, int]], pattern: Pattern[bytes]) -> List[Tuple[str, List[LineHit]]]:
+    return [(path, hits) for path, size in files for hits in (scan_file(path, size, pattern),) if hits]
+
+
+class TreeScanner:
+    """rg/grep over a source tree: cached manifest, read or mapped files, one compiled pattern per search"""
+
+    def __init__(self, root: Path, jobs: int = None):
+        self.root = root
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self._manifest: Optional[Dict[str, List[Entry]]] = None
+        self._pool: Optional['ThreadPoolExecutor'] = None
+        # Counters reported by the profiler
+        self.files_scanned = 0
+        self.bytes_scanned = 0
+
+    def _entries(self, file_pattern: str) -> List[Entry]:
+        if self._manifest is None:
+            self._manifest = {}
+            for rel_path, st in walk_source_files(self.root):
+                self._manifest.setdefault(os.path.splitext(rel_path)[1], []).append((rel_path, st.st_size))
+            for entries in self._manifest.values():
+                entries.sort()
+        return self._manifest.get(file_pattern.lstrip('*'), [])
+
+    def manifest(self, file_pattern: str = '*.php') -> List[str]:
+        """Relative paths of the tree's '*.php' or '*.xml' files, sorted"""
+        return [rel_path for rel_path, _ in self._entries(file_pattern)]
+
+    def _scan(self, pattern: Pattern[bytes], file_pattern: str,
+              under: Path = None) -> List[Tuple[Path, List[LineHit]]]:
+        """(path, hits) of every file with a match, in manifest order"""
+        entries = self._entries(file_pattern)
+        if under is not None and Path(under) != self.root:
+            prefix = os.path.relpath(under, self.root) + os.sep
+            entries = [entry for entry in entries if entry[0].startswith(prefix)]
+        self.files_scanned += len(entries)
+        self.bytes_scanned += sum(size for _, size in entries)
+
+        root = str(self.root) + os.sep
+        files = [(root + rel_path, size) for rel_path, size in entries]
+        chunks = [files[i:i + CHUNK_FILES] for i in range(0, len(files), CHUNK_FILES)]
+        if self.jobs == 1 or len(chunks) < 2:
+            results = [_scan_chunk(chunk, pattern) for chunk in chunks]
+        else:
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._pool = ThreadPoolExecutor(self.jobs, thread_name_prefix='scan')
+            results = self._pool.map(_scan_chunk, chunks, [pattern] * len(chunks))
+        return [(Path(path), hits) for chunk in results for path, hits in chunk]
+
+    def search(self, pattern: str, under: Path = None, file_pattern: str = '*.php') -> List[Tuple[Path, int]]:
+        """(file, line) of every line matching a regex, as rg -n / grep -rn would report it"""
+        compiled = re.compile(pattern.encode('utf-8'), re.MULTILINE)
+        return [(path, line) for path, hits in self._scan(compiled, file_pattern, under) for line, _ in hits]
+
+    def search_fixed(self, patterns: Iterable[str], file_pattern: str = '*.php') -> Dict[str, List[Tuple[Path, int]]]:
+        """(file, line) of every line containing each fixed string, from one pass over the tree"""
+        patterns = sorted(set(patterns))
+        matches = {pattern: [] for pattern in patterns}
+        if not patterns:
+            return matches
+        encoded = [(pattern, pattern.encode('utf-8')) for pattern in patterns]
+        # The alternation only finds the lines; each is then credited to every pattern it contains,
+        # as _search_many() does with rg -F -f output
+        alternation = re.compile(b'|'.join(re.escape(data) for _, data in encoded))
+
+        for path, hits in self._scan(alternation, file_pattern):
+            for line, text in hits:
+                for pattern, data in encoded:
+                    if data in text:
+                        matches[pattern].append((path, line))
+        return matches
+
+    def search_grouped(self, pattern: str, file_pattern: str = '*.php') -> Dict[str, List[Tuple[Path, int]]]:
+        """(file, line) of every line matching a regex, keyed by what its first group matched there"""
+        compiled = re.compile(pattern.encode('utf-8'), re.MULTILINE)
+        matches = {}
+        for path, hits in self._scan(compiled, file_pattern):
+            for line, text in hits:
+                for key in {match.group(1).decode('utf-8') for match in compiled.finditer(text)}:
+                    matches.setdefault(key, []).append((path, line))
+        return matches
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: tree_scanner.py <source_dir> <pattern> [*.php|*.xml]")
+        sys.exit(1)
+
+    scanner = TreeScanner(Path(sys.argv[1]))
+    for path, line in scanner.search(sys.argv[2], file_pattern=sys.argv[3] if len(sys.argv) > 3 else '*.php'):
+        print(f"{path}:{line}")
+    scanner.close()
+
+
+if __name__ == '__main__':
+    main()
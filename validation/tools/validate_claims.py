@@ -9,35 +9,237 @@ Searches the Magento core installation to verify:
 - Events are dispatched
 - Database tables are referenced
 - Configuration paths are defined
+
+Lookups are answered from a persistent symbol index (see symbol_index.py)
+built once per source tree; pass --no-index to search the files instead,
+in-process (see tree_scanner.py) or with --search-tool rg/grep.
+
+Graphs written by the Node.js parser (data/*-graph.json, see graph_index.py)
+answer class, interface, plugin and observer claims: give one with --graph
+next to a source tree, or pass a graph file or directory as the Magento root
+to validate those claim types without a checkout.
+
+--snippets N attaches the N source lines before and after every evidence
+line to the results (see snippets.py).
 """
 
 import os
+import re
 import sys
-import yaml
-import subprocess
+import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+
+from symbol_index import SymbolIndex, open_index, scan_source
+from autoload import Psr4Map, load_psr4
+from archive_source import ArchiveSource, is_archive, open_archive_index, sidecar_path
+from snippets import SnippetReader, open_snippet_reader
+from graph_index import ROLE_DESCRIPTIONS, Declaration, GraphIndex, is_graph_source, load_graphs
+from config_index import ConfigIndex, Site, build_config_index
+from search_executor import (DEFAULT_TIMEOUT, Search, SearchExecutor, SearchOutcome, SearchToolError,
+                             require_tool, search_command)
+from tree_scanner import SCAN_TOOL, TreeScanner
+from profiler import NULL_PROFILER, Profiler
+from result_cache import ResultCache, CACHE_FILENAME
+from claims_io import FORMAT_EXTENSIONS, dump_document, load_document
+
+
+class FileTable:
+    """Interned table of evidence files, stored relative to the source root
+
+    Evidence refers to files by id, so a path shared by many claims is held
+    once per run no matter how many results point into it.
+    """
+
+    __slots__ = ('root', 'paths', '_ids')
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.paths: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, path) -> int:
+        """Id of a file path (absolute or relative to the root), adding it if new"""
+        path = str(path)
+        root = str(self.root)
+        if path.startswith(root + os.sep):
+            path = path[len(root) + 1:]
+        file_id = self._ids.get(path)
+        if file_id is None:
+            path = sys.intern(path)
+            file_id = self._ids[path] = len(self.paths)
+            self.paths.append(path)
+        return file_id
+
+    def path(self, file_id: int) -> str:
+        return self.paths[file_id]
+
+    def absolute(self, file_id: int) -> Path:
+        return self.root / self.paths[file_id]
 
 
-@dataclass
 class ValidationResult:
-    """Result of validating a single claim"""
-    claim: str
-    claim_type: str
-    found: bool
-    confidence: str  # high, medium, low
-    evidence: List[str] = field(default_factory=list)
-    notes: str = ""
+    """Result of validating a single claim
+
+    evidence holds (file_id, line) pairs into the validator's FileTable.
+    timed_out marks a claim whose search never completed, so found=False is unknown.
+    """
+
+    __slots__ = ('claim', 'claim_type', 'found', 'confidence', 'evidence', 'notes', 'timed_out')
+
+    def __init__(self, claim: str, claim_type: str, found: bool, confidence: str,
+                 evidence: List[Tuple[int, int]] = None, notes: str = "", timed_out: bool = False):
+        self.claim = claim
+        self.claim_type = claim_type
+        self.found = found
+        self.confidence = confidence  # high, medium, low
+        self.evidence = evidence if evidence is not None else []
+        self.notes = notes
+        self.timed_out = timed_out
+
+    def __eq__(self, other):
+        if not isinstance(other, ValidationResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"ValidationResult({fields})"
+
+    def to_record(self, files: FileTable) -> Dict[str, Any]:
+        """Plain dict with evidence as [relative_path, line], independent of any FileTable"""
+        record = {name: getattr(self, name) for name in self.__slots__}
+        record['evidence'] = [[files.path(file_id), line] for file_id, line in self.evidence]
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], files: FileTable) -> 'ValidationResult':
+        fields = dict(record)
+        fields['evidence'] = [(files.intern(path), line) for path, line in record['evidence']]
+        return cls(**fields)
+
+
+# Config index site kind -> evidence description, strongest evidence first
+SITE_DESCRIPTIONS = {
+    'dispatch': '->dispatch() call',
+    'event_prefix': 'model $_eventPrefix',
+    'db_schema': 'db_schema.xml declaration',
+    'acl': 'acl.xml declaration',
+    'observer': 'events.xml observer',
+    'table': 'getTable()/_init() reference',
+}
+SITE_KIND_ORDER = list(SITE_DESCRIPTIONS)
+
+# Claims-file type -> MagentoValidator method (config_paths and file_paths are not validated yet)
+CLAIM_VALIDATORS = {
+    'php_classes': 'validate_class',
+    'php_interfaces': 'validate_interface',
+    'methods': 'validate_method',
+    'events': 'validate_event',
+    'database_tables': 'validate_table',
+    'acl_resources': 'validate_acl_resource',
+    'plugins': 'validate_plugin',
+    'observers': 'validate_observer',
+}
+
+# Claim types a graph can answer; the only ones validated against a graph-only root
+GRAPH_CLAIM_TYPES = ('php_classes', 'php_interfaces', 'plugins', 'observers')
+# Claim types only a graph can answer
+GRAPH_ONLY_CLAIM_TYPES = ('plugins', 'observers')
+
+
+# A method definition as the symbol index records one: 'function name(' (or '&name('), not a
+# longer name starting with it. rg, grep -E and re all read it; the group is the method name.
+METHOD_DEFINITION = r'\bfunction[ \t]+&?[ \t]*({})[ \t]*\('
+
+
+def method_pattern(*names: str) -> str:
+    """Search-mode regex for the definition of a method, or of any of several"""
+    return METHOD_DEFINITION.format('|'.join(re.escape(name) for name in names))
+
+
+def search_order(location: Tuple[Path, int]) -> Tuple[str, int]:
+    """Sort key putting search results in the same (path, line) order for every search tool"""
+    return str(location[0]), location[1]
 
 
 class MagentoValidator:
     """Validates claims against Magento core source"""
 
-    def __init__(self, magento_root: Path):
+    def __init__(self, magento_root: Path, use_index: bool = True, index_path: Path = None,
+                 rebuild_index: bool = False, read_only_index: bool = False,
+                 search_jobs: int = None, search_timeout: float = DEFAULT_TIMEOUT, profiler: Profiler = None,
+                 shared_indexes: Sequence[SymbolIndex] = (), graph_paths: Sequence[Path] = (),
+                 search_tool: str = SCAN_TOOL):
         self.magento_root = magento_root
+        self.profiler = profiler or NULL_PROFILER
         self.path_style = None  # 'vendor' (module-customer) or 'app' (Customer)
 
+        # Source snapshot archives are read through their symbol index, see archive_source.py
+        self.archive = ArchiveSource(magento_root) if is_archive(magento_root) else None
+
+        # Parsed DI/event graphs, see graph_index.py. A graph given as the root
+        # replaces the source tree: only GRAPH_CLAIM_TYPES are validated.
+        self.source_tree = not is_graph_source(magento_root)
+        self.graph: Optional[GraphIndex] = None
+        if not self.source_tree:
+            graph_paths = [magento_root, *graph_paths]
+        if graph_paths:
+            with self.profiler.span('load_graph'):
+                self.graph = load_graphs(graph_paths)
+
+        self.index = None
+        if not self.source_tree:
+            # Evidence paths are relative to the directory holding the graphs
+            self.vendor_path = magento_root if magento_root.is_dir() else magento_root.parent
+            use_index = False
+        elif self.archive is not None:
+            if not use_index:
+                raise ValueError(f"{magento_root} is an archive; it can only be validated with the symbol index")
+            with self.profiler.span('open_index'):
+                self.index, _, self.path_style = open_archive_index(
+                    self.archive, index_path, rebuild=rebuild_index, read_only=read_only_index,
+                    shared=shared_indexes)
+            self.vendor_path = self.index.source_path
+        else:
+            self._detect_source_tree(magento_root)
+
+        # Evidence files seen this run, relative to vendor_path
+        self.files = FileTable(self.vendor_path)
+
+        # Composer PSR-4 map: resolves class claims to files without searching.
+        # Archives have no files to resolve to; their classes come from the index.
+        with self.profiler.span('load_psr4'):
+            if self.archive is None and self.source_tree:
+                self.autoload = load_psr4(magento_root, self.vendor_path)
+            else:
+                self.autoload = Psr4Map()
+
+        # Event/table/ACL declaration sites, see _config_index()
+        self._config: Optional[ConfigIndex] = None
+
+        # (pattern, file_pattern) -> results gathered by prefetch() in one tree pass
+        self._prefetched: Dict[Tuple[str, str], List[Tuple[Path, int]]] = {}
+        # (pattern, file_pattern) searches that timed out; their claims are reported as timed out
+        self._timed_out = set()
+
+        # Search mode backend: the in-process scanner, or rg/grep subprocesses run concurrently.
+        # A missing rg/grep is an error up front, not an empty result for every searched claim.
+        if search_tool != SCAN_TOOL and self.source_tree and self.archive is None:
+            require_tool(search_tool)
+        self._tool = search_tool
+        self.scanner = TreeScanner(self.vendor_path, search_jobs)
+        self.search = SearchExecutor(search_jobs, search_timeout)
+        self._shards: Optional[List[List[Path]]] = None
+
+        if use_index and self.index is None:
+            with self.profiler.span('open_index'):
+                self.index = open_index(self.vendor_path, magento_root, index_path, rebuild=rebuild_index,
+                                        read_only=read_only_index, shared=shared_indexes)
+
+    def _detect_source_tree(self, magento_root: Path):
+        """Find the module directory of a Magento checkout and its path style"""
+
         # Support multiple Magento source structures
         possible_paths = [
             (magento_root / "app" / "code" / "Magento", "app"),  # Official Magento 2 repo
@@ -61,34 +263,169 @@ class MagentoValidator:
         if not self.vendor_path:
             raise FileNotFoundError(f"Magento source not found. Tried: {[p[0] for p in possible_paths]}")
 
-    def _search_in_files(self, pattern: str, module_dir: Path = None, file_pattern: str = "*.php") -> List[Tuple[Path, int]]:
-        """Search for pattern in files using ripgrep or grep"""
-
+    def _search_in_files(self, pattern: str, module_dir: Path = None,
+                         file_pattern: str = "*.php") -> Optional[List[Tuple[Path, int]]]:
+        """Search for pattern in files in-process or with ripgrep or grep; None if the search timed out"""
+
+        if module_dir is None:
+            if (pattern, file_pattern) in self._timed_out:
+                self.profiler.strategy('search_timeout')
+                return None
+            if (pattern, file_pattern) in self._prefetched:
+                self.profiler.strategy('search_prefetched')
+                return self._prefetched[(pattern, file_pattern)]
+
+        self.profiler.strategy('search')
+        if self._tool == SCAN_TOOL:
+            return self._scan(self.scanner.search, pattern, module_dir, file_pattern)
         search_path = module_dir if module_dir else self.vendor_path
+        outcome = self._run_searches([Search(search_command(self._tool, [search_path], file_pattern, pattern))])[0]
+        if outcome.timed_out:
+            return None
+        if outcome.failed:
+            raise SearchToolError(f"{self._tool} failed searching for {pattern!r} "
+                                  f"(exit status {outcome.returncode})")
+        return self._parse_search_output(outcome.stdout)
+
+    def _scan(self, search, *args):
+        files, size = self.scanner.files_scanned, self.scanner.bytes_scanned
+        with self.profiler.span(SCAN_TOOL, 'scan'):
+            results = search(*args)
+        self.profiler.count('scanned_files', self.scanner.files_scanned - files)
+        self.profiler.count('scanned_bytes', self.scanner.bytes_scanned - size)
+        return results
 
-        try:
-            # Try ripgrep first (faster)
-            result = subprocess.run(
-                ['rg', '-n', '--type', 'php' if file_pattern == '*.php' else 'xml', pattern, str(search_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                return self._parse_search_output(result.stdout)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+    def _run_searches(self, searches: List[Search]) -> List[SearchOutcome]:
+        with self.profiler.span(self._tool, 'subprocess', searches=len(searches)):
+            outcomes = self.search.run(searches)
+        self.profiler.count('subprocesses', sum(outcome.attempts for outcome in outcomes))
+        self.profiler.count('search_output_bytes', sum(len(outcome.stdout) for outcome in outcomes))
+        self.profiler.count('search_timeouts', sum(1 for outcome in outcomes if outcome.timed_out))
+        return outcomes
+
+    def _search_shards(self) -> List[List[Path]]:
+        """Top-level entries of the source tree split into one group per concurrent search"""
+        if self._shards is None:
+            entries = sorted(entry for entry in self.vendor_path.iterdir() if not entry.name.startswith('.'))
+            count = max(1, min(self.search.concurrency, len(entries)))
+            self._shards = [shard for shard in (entries[i::count] for i in range(count)) if shard]
+        return self._shards
+
+    def _search_many(self, patterns: List[str], file_pattern: str = "*.php") -> Dict[str, List[Tuple[Path, int]]]:
+        """Search for many fixed-string patterns in one pass over the tree
+
+        Runs one rg (or grep) per shard of the tree concurrently, with all
+        patterns read from stdin, then attributes each matching line back to
+        every pattern it contains. Patterns left without matches because a
+        shard timed out are recorded as timed out rather than not found.
+        Returns None if any search failed, leaving the claims to the
+        per-claim search, which reports the error. The in-process scanner
+        does the same in one pass and never times out.
+        """
+
+        if self._tool == SCAN_TOOL:
+            return self._scan(self.scanner.search_fixed, patterns, file_pattern)
+
+        patterns = sorted(set(patterns))
+        pattern_input = '\n'.join(patterns) + '\n'
+        outcomes = self._run_searches([
+            Search(search_command(self._tool, shard, file_pattern), pattern_input)
+            for shard in self._search_shards()
+        ])
+        if any(outcome.failed for outcome in outcomes):
+            return None
+
+        matches = {pattern: [] for pattern in patterns}
+        for location, text in self._output_lines(outcomes):
+            for pattern in patterns:
+                if pattern in text:
+                    matches[pattern].append(location)
+        return self._sharded_matches(matches, outcomes, file_pattern)
+
+    def _search_methods(self, names: List[str]) -> Optional[Dict[str, List[Tuple[Path, int]]]]:
+        """Search for the definitions of many methods in one pass over the tree
+
+        One method_pattern() regex over all the names finds every definition
+        line, which is credited to the method it defines, so 'delete' does
+        not also count 'deleteById'. Results are keyed by each method's own
+        method_pattern(). Sharding, timeouts and failures are handled as in
+        _search_many().
+        """
+
+        names = sorted(set(names))
+        pattern = method_pattern(*names)
+        if self._tool == SCAN_TOOL:
+            by_name = self._scan(self.scanner.search_grouped, pattern)
+            return {method_pattern(name): by_name.get(name, []) for name in names}
+
+        outcomes = self._run_searches([
+            Search(search_command(self._tool, shard, "*.php", pattern)) for shard in self._search_shards()
+        ])
+        if any(outcome.failed for outcome in outcomes):
+            return None
+
+        compiled = re.compile(pattern)
+        matches = {method_pattern(name): [] for name in names}
+        for location, text in self._output_lines(outcomes):
+            for name in {match.group(1) for match in compiled.finditer(text)}:
+                matches[method_pattern(name)].append(location)
+        return self._sharded_matches(matches, outcomes, "*.php")
+
+    @staticmethod
+    def _output_lines(outcomes: List[SearchOutcome]):
+        """((file_path, line_number), line text) of every match rg/grep printed"""
+        for outcome in outcomes:
+            for line in outcome.stdout.split('\n'):
+                parts = line.split(':', 2)
+                if len(parts) < 3:
+                    continue
+                try:
+                    yield (Path(parts[0]), int(parts[1])), parts[2]
+                except ValueError:
+                    continue
 
-        # Fallback to grep
-        try:
-            cmd = ['grep', '-rn', pattern, str(search_path), '--include', file_pattern]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                return self._parse_search_output(result.stdout)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+    def _sharded_matches(self, matches: Dict[str, List[Tuple[Path, int]]], outcomes: List[SearchOutcome],
+                         file_pattern: str) -> Dict[str, List[Tuple[Path, int]]]:
+        for locations in matches.values():
+            # Shards finish in any order; report matches in path order, as the scanner does
+            locations.sort(key=search_order)
+        if any(outcome.timed_out for outcome in outcomes):
+            self._timed_out.update((pattern, file_pattern) for pattern, found in matches.items() if not found)
+        return matches
+
+    def prefetch(self, claim_type: str, claims: List[str]):
+        """Batch the searches a whole claim type needs into one pass per file type
+
+        Later validate_* calls for these claims are served from the prefetched
+        results instead of each starting its own tree-wide search.
+        """
+
+        if not self.source_tree:
+            return
+        if claim_type in ('php_classes', 'php_interfaces'):
+            # Classes in PSR-4 mapped namespaces or in the graph never need a search
+            searches = {'*.php': [f"class {claim.split(chr(92))[-1]}" for claim in claims
+                                  if self.autoload.resolve(claim) is None
+                                  and not (self.graph is not None and self.graph.lookup_class(claim))]}
+        elif claim_type == 'methods':
+            searches = {'*.php': claims}
+        else:
+            # Events, tables and ACL resources are answered by the config index
+            return
 
-        return []
+        for file_pattern, patterns in searches.items():
+            if not patterns:
+                continue
+            with self.profiler.span('prefetch', claim_type=claim_type, file_pattern=file_pattern):
+                if claim_type == 'methods':
+                    matches = self._search_methods(patterns)
+                else:
+                    matches = self._search_many(patterns, file_pattern)
+            if matches is None:
+                # Leave these claims to the per-claim search
+                continue
+            for pattern, results in matches.items():
+                self._prefetched[(pattern, file_pattern)] = results
 
     def _parse_search_output(self, output: str) -> List[Tuple[Path, int]]:
         """Parse grep/rg output into (file_path, line_number) tuples"""
@@ -102,7 +439,23 @@ class MagentoValidator:
                     results.append((Path(parts[0]), int(parts[1])))
                 except (ValueError, IndexError):
                     continue
-        return results
+        # rg reports files in the order its threads finish them, grep in directory order
+        return sorted(results, key=search_order)
+
+    def _evidence(self, locations: List[Tuple[Path, int]]) -> List[Tuple[int, int]]:
+        """(file_path, line) search results -> (file_id, line) evidence"""
+        return [(self.files.intern(path), line) for path, line in locations]
+
+    def _timed_out_result(self, claim: str, claim_type: str) -> ValidationResult:
+        """Result for a claim whose search never completed: unknown rather than not found"""
+        return ValidationResult(
+            claim=claim,
+            claim_type=claim_type,
+            found=False,
+            confidence='low',
+            notes=f'Search timed out after {self.search.retries + 1} attempts; result unknown',
+            timed_out=True
+        )
 
     def _get_module_path(self, module_name: str) -> Path:
         """Convert module name to directory path based on source structure"""
@@ -113,6 +466,20 @@ class MagentoValidator:
             # Composer/Mage-OS: module-customer, module-sales, etc.
             return self.vendor_path / f"module-{module_name.lower()}"
 
+    def can_validate(self, claim_type: str) -> bool:
+        """Whether this validator's backends can answer claims of a claims-file type"""
+        if claim_type not in CLAIM_VALIDATORS:
+            return False
+        if claim_type in GRAPH_ONLY_CLAIM_TYPES:
+            return self.graph is not None
+        return self.source_tree or claim_type in GRAPH_CLAIM_TYPES
+
+    def validate(self, claim_type: str, claim: str) -> Optional[ValidationResult]:
+        """Validate one claim of a claims-file type; None if the type is not validated"""
+        if not self.can_validate(claim_type):
+            return None
+        return getattr(self, CLAIM_VALIDATORS[claim_type])(claim)
+
     def validate_class(self, class_name: str) -> ValidationResult:
         """Validate a PHP class exists"""
 
@@ -128,16 +495,36 @@ class MagentoValidator:
                 notes='Invalid class name format'
             )
 
+        if self.graph is not None:
+            result = self._validate_class_from_graph(class_name)
+            # Graphs only name classes used in DI and event config; look further in the source
+            if result.found or not self.source_tree:
+                return result
+
+        candidates = self.autoload.resolve(class_name)
+        if candidates is not None:
+            self.profiler.strategy('psr4')
+            result = self._validate_class_from_autoload(class_name, parts[-1], candidates)
+            if result is not None:
+                return result
+            # The mapped file declares no such type; look for it as if unmapped
+            self.profiler.count('fallback.psr4_no_declaration')
+
+        if self.index is not None:
+            return self._validate_class_from_index(class_name, parts[-1])
+
         module_dir = self._get_module_path(parts[0])
         file_path = '/'.join(parts[1:]) + '.php'
 
         # Check if file exists
         expected_path = module_dir / file_path
 
+        self.profiler.strategy('exact_path')
         if expected_path.exists():
             # Verify class definition in file
             with open(expected_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
+                self.profiler.count('bytes_read', len(content))
                 class_def_pattern = f"class {parts[-1]}"
                 if class_def_pattern in content:
                     return ValidationResult(
@@ -145,12 +532,15 @@ class MagentoValidator:
                         claim_type='class',
                         found=True,
                         confidence='high',
-                        evidence=[f"{expected_path}:1"],
+                        evidence=[(self.files.intern(expected_path), 1)],
                         notes='Class file exists and contains class definition'
                     )
 
         # Fallback: search for class definition
+        self.profiler.count('fallback.class_search')
         search_results = self._search_in_files(f"class {parts[-1]}")
+        if search_results is None:
+            return self._timed_out_result(class_name, 'class')
 
         if search_results:
             return ValidationResult(
@@ -158,7 +548,7 @@ class MagentoValidator:
                 claim_type='class',
                 found=True,
                 confidence='medium',
-                evidence=[f"{r[0]}:{r[1]}" for r in search_results[:3]],
+                evidence=self._evidence(search_results[:3]),
                 notes='Found via pattern search'
             )
 
@@ -170,6 +560,155 @@ class MagentoValidator:
             notes=f'Expected path {expected_path} does not exist'
         )
 
+    def _validate_class_from_autoload(self, class_name: str, short_name: str,
+                                      candidates: List[Path]) -> Optional[ValidationResult]:
+        """Validate a class whose namespace is PSR-4 mapped: its file must exist where Composer would load it
+
+        Evidence is the class, interface or trait declaration line. None if the
+        file exists but declares no such type, so the caller looks further.
+        """
+
+        for path in candidates:
+            if not os.path.isfile(path):
+                continue
+            line = self._declaration_line(path, short_name)
+            if line is None:
+                return None
+            return ValidationResult(
+                claim=class_name,
+                claim_type='class',
+                found=True,
+                confidence='high',
+                evidence=[(self.files.intern(path), line)],
+                notes='Resolved via PSR-4 autoload map'
+            )
+
+        return ValidationResult(
+            claim=class_name,
+            claim_type='class',
+            found=False,
+            confidence='high',
+            notes=f'PSR-4 path {self._relative_path(candidates[0])} does not exist'
+        )
+
+    def _declaration_line(self, path: Path, short_name: str) -> Optional[int]:
+        """Line of the class, interface or trait declaration of short_name in a PHP file"""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except OSError:
+            return None
+        self.profiler.count('bytes_read', len(content))
+        for kind, name, _, line in scan_source(str(path), content):
+            if kind in ('class', 'interface', 'trait') and name == short_name:
+                return line
+        return None
+
+    def _relative_path(self, path: Path) -> str:
+        """A path as written to results: relative to the source root, or else to the Magento root"""
+        relative = os.path.relpath(path, self.vendor_path)
+        if relative.startswith(os.pardir):
+            relative = os.path.relpath(path, self.magento_root)
+        return Path(relative).as_posix()
+
+    def _validate_class_from_index(self, class_name: str, short_name: str) -> ValidationResult:
+        """Validate a class, interface or trait against the symbol index"""
+
+        self.profiler.strategy('index_fqcn')
+        declarations = self.index.lookup_fqcn(class_name)
+        if declarations:
+            return ValidationResult(
+                claim=class_name,
+                claim_type='class',
+                found=True,
+                confidence='high',
+                evidence=self._evidence(declarations[:3]),
+                notes='Declaration found in symbol index'
+            )
+
+        self.profiler.strategy('index_short_name')
+        self.profiler.count('fallback.index_short_name')
+        declarations = self.index.lookup(['class', 'interface', 'trait'], short_name)
+        if declarations:
+            return ValidationResult(
+                claim=class_name,
+                claim_type='class',
+                found=True,
+                confidence='medium',
+                evidence=self._evidence(declarations[:3]),
+                notes='Found via symbol index (short name match)'
+            )
+
+        return ValidationResult(
+            claim=class_name,
+            claim_type='class',
+            found=False,
+            confidence='high',
+            notes=f'No class, interface or trait named {short_name} in symbol index'
+        )
+
+    def _validate_class_from_graph(self, class_name: str) -> ValidationResult:
+        """Validate a class or interface against the DI/event graphs"""
+
+        self.profiler.strategy('graph')
+        mentions = self.graph.lookup_class(class_name)
+        if mentions:
+            counts: Dict[str, int] = {}
+            for role, _ in mentions:
+                counts[role] = counts.get(role, 0) + 1
+            return ValidationResult(
+                claim=class_name,
+                claim_type='class',
+                found=True,
+                confidence='high',
+                evidence=self._evidence([location for _, location in mentions[:3]]),
+                notes='Found in graph: ' + ', '.join(f"{ROLE_DESCRIPTIONS[role]} x{count}"
+                                                    for role, count in counts.items())
+            )
+
+        return ValidationResult(
+            claim=class_name,
+            claim_type='class',
+            found=False,
+            confidence='low',
+            notes='Not named in any DI or event config of the graph; graphs do not list every class'
+        )
+
+    def _graph_declared(self, claim: str, claim_type: str, declarations: List[Declaration],
+                        label: str) -> ValidationResult:
+        """Result for plugin/observer claims from their graph nodes"""
+        enabled = [declaration for declaration in declarations if not declaration.disabled]
+        if declarations:
+            notes = f'{len(declarations)} {label} node(s) in graph'
+            if not enabled:
+                notes += '; all disabled in config'
+            return ValidationResult(
+                claim=claim,
+                claim_type=claim_type,
+                found=True,
+                confidence='high' if enabled else 'medium',
+                evidence=self._evidence([declaration.location for declaration in (enabled or declarations)[:3]]),
+                notes=notes
+            )
+
+        return ValidationResult(
+            claim=claim,
+            claim_type=claim_type,
+            found=False,
+            confidence='medium',
+            notes=f'No {label} with this id, name or class in {len(self.graph.paths)} graph file(s)'
+        )
+
+    def validate_plugin(self, plugin: str) -> ValidationResult:
+        """Validate a plugin (Target\\Class::name, plugin name or plugin class) is declared in di.xml"""
+        self.profiler.strategy('graph')
+        return self._graph_declared(plugin, 'plugin', self.graph.lookup_plugin(plugin), 'plugin')
+
+    def validate_observer(self, observer: str) -> ValidationResult:
+        """Validate an observer (event::name, observer name or observer class) is declared in events.xml"""
+        self.profiler.strategy('graph')
+        return self._graph_declared(observer, 'observer', self.graph.lookup_observer(observer), 'observer')
+
     def validate_interface(self, interface_name: str) -> ValidationResult:
         """Validate a PHP interface exists"""
         return self.validate_class(interface_name)  # Same logic for now
@@ -178,7 +717,13 @@ class MagentoValidator:
         """Validate a method exists in Magento core"""
 
         # Search for method definitions
-        search_results = self._search_in_files(f"function {method_name}")
+        if self.index is not None:
+            self.profiler.strategy('index')
+            search_results = self.index.lookup(['function'], method_name)
+        else:
+            search_results = self._search_in_files(method_pattern(method_name))
+            if search_results is None:
+                return self._timed_out_result(method_name, 'method')
 
         if search_results:
             return ValidationResult(
@@ -186,7 +731,7 @@ class MagentoValidator:
                 claim_type='method',
                 found=True,
                 confidence='medium',
-                evidence=[f"{r[0]}:{r[1]}" for r in search_results[:5]],
+                evidence=self._evidence(search_results[:5]),
                 notes=f'Found {len(search_results)} occurrences'
             )
 
@@ -198,98 +743,143 @@ class MagentoValidator:
             notes='Method not found in core'
         )
 
-    def validate_event(self, event_name: str) -> ValidationResult:
-        """Validate an event is dispatched in Magento core"""
+    def _config_index(self) -> ConfigIndex:
+        """Structured events/tables/ACL declarations, built on first use"""
+        if self._config is None:
+            with self.profiler.span('build_config_index'):
+                self._config = build_config_index(self.vendor_path, self.index,
+                                                  config_from_index=self.archive is not None)
+        self.profiler.strategy('config_index')
+        return self._config
+
+    def _declared(self, claim: str, claim_type: str, sites: List[Site], declaring_kinds: Tuple[str, ...],
+                  limit: int) -> Optional[ValidationResult]:
+        """Found result from config index sites; high confidence only if a declaring kind is present"""
+        if not sites:
+            return None
+
+        sites = sorted(sites, key=lambda site: SITE_KIND_ORDER.index(site[0]))
+        counts: Dict[str, int] = {}
+        for kind, _, _ in sites:
+            counts[kind] = counts.get(kind, 0) + 1
 
-        # Search for event dispatch calls (search in both PHP and XML)
-        search_results = self._search_in_files(event_name, file_pattern="*.xml")
+        return ValidationResult(
+            claim=claim,
+            claim_type=claim_type,
+            found=True,
+            confidence='high' if any(kind in counts for kind in declaring_kinds) else 'medium',
+            evidence=self._evidence([(path, line) for _, path, line in sites[:limit]]),
+            notes='Found: ' + ', '.join(f"{SITE_DESCRIPTIONS[kind]} x{count}" for kind, count in counts.items())
+        )
 
-        if not search_results:
-            # Also search in PHP files for dispatches
-            search_results = self._search_in_files(event_name, file_pattern="*.php")
+    def validate_event(self, event_name: str) -> ValidationResult:
+        """Validate an event is dispatched in Magento core"""
 
-        if search_results:
-            return ValidationResult(
-                claim=event_name,
-                claim_type='event',
-                found=True,
-                confidence='high',
-                evidence=[f"{r[0]}:{r[1]}" for r in search_results[:5]],
-                notes=f'Found {len(search_results)} references'
-            )
+        sites = self._config_index().event_sites(event_name)
+        result = self._declared(event_name, 'event', sites, ('dispatch', 'event_prefix'), 5)
+        if result is not None:
+            return result
 
         return ValidationResult(
             claim=event_name,
             claim_type='event',
             found=False,
             confidence='high',
-            notes='Event not found in core'
+            notes='Event not dispatched, generated by a model or observed in core'
         )
 
     def validate_table(self, table_name: str) -> ValidationResult:
-        """Validate a database table is referenced in Magento core"""
-
-        # Search in XML files (db_schema.xml) and PHP files
-        search_results = self._search_in_files(table_name)
+        """Validate a database table is declared or referenced in Magento core"""
 
-        if search_results:
-            return ValidationResult(
-                claim=table_name,
-                claim_type='table',
-                found=True,
-                confidence='high',
-                evidence=[f"{r[0]}:{r[1]}" for r in search_results[:3]],
-                notes=f'Found {len(search_results)} references'
-            )
+        sites = self._config_index().table_sites(table_name)
+        result = self._declared(table_name, 'table', sites, ('db_schema',), 3)
+        if result is not None:
+            return result
 
         return ValidationResult(
             claim=table_name,
             claim_type='table',
             found=False,
             confidence='medium',
-            notes='Table not found in core'
+            notes='Table not declared in db_schema.xml or referenced via getTable()/_init()'
         )
 
     def validate_acl_resource(self, resource_id: str) -> ValidationResult:
         """Validate ACL resource is defined"""
 
-        search_results = self._search_in_files(resource_id, file_pattern="*.xml")
-
-        if search_results:
-            return ValidationResult(
-                claim=resource_id,
-                claim_type='acl_resource',
-                found=True,
-                confidence='high',
-                evidence=[f"{r[0]}:{r[1]}" for r in search_results[:3]],
-                notes=f'Found {len(search_results)} references'
-            )
+        sites = self._config_index().acl_sites(resource_id)
+        result = self._declared(resource_id, 'acl_resource', sites, ('acl',), 3)
+        if result is not None:
+            return result
 
         return ValidationResult(
             claim=resource_id,
             claim_type='acl_resource',
             found=False,
             confidence='medium',
-            notes='ACL resource not found'
+            notes='ACL resource not declared in any acl.xml'
         )
 
 
-def validate_claims_file(claims_yaml: Path, magento_root: Path) -> Dict[str, Any]:
-    """Validate all claims from a YAML file"""
-
-    with open(claims_yaml, 'r', encoding='utf-8') as f:
-        claims_data = yaml.safe_load(f)
-
-    validator = MagentoValidator(magento_root)
+def validate_claim_list(validator: MagentoValidator, claim_type: str, claim_list: List[str],
+                        cache: ResultCache = None) -> Dict[str, ValidationResult]:
+    """Validate the claims of one type, reusing cached results and batching searches
+
+    Returns no results for a claim type the validator cannot answer, such as
+    methods against a graph-only root.
+    """
+
+    profiler = validator.profiler
+    validated = {}
+    if not validator.can_validate(claim_type):
+        return validated
+    if cache is not None:
+        with profiler.span('cache_lookup', 'cache', claim_type=claim_type):
+            for claim in claim_list:
+                hit = cache.get(claim_type, claim)
+                if hit is not None:
+                    validated[claim] = ValidationResult.from_record(hit, validator.files)
+        profiler.count('cache_hits', len(validated))
+        profiler.count('cache_misses', len(claim_list) - len(validated))
+
+    if validator.index is None:
+        validator.prefetch(claim_type, [claim for claim in claim_list if claim not in validated])
+
+    for claim in claim_list:
+        if claim not in validated:
+            with profiler.claim(claim_type, claim):
+                result = validator.validate(claim_type, claim)
+            if cache is not None and not result.timed_out:
+                cache.put(claim_type, claim, result)
+            validated[claim] = result
+
+    return validated
+
+
+def build_results(claims_data: Dict[str, Any], magento_root: Path,
+                  validated: Dict[Tuple[str, str], ValidationResult], files: FileTable,
+                  snippets: SnippetReader = None) -> Dict[str, Any]:
+    """Assemble the validation output for one claims file from (claim_type, claim) results
+
+    Evidence files are listed once under 'files', relative to 'source_root',
+    and each evidence entry is a [file_index, line] pair into that list.
+    With a snippet reader, each result also gets 'snippets': the lines
+    around each evidence entry, in the same order (None where unreadable).
+    """
+
+    document_files = FileTable(files.root)
     results = {
         'source_document': claims_data['source_document'],
         'validation_date': '2025-01-07',
         'magento_root': str(magento_root),
+        'source_root': str(files.root),
+        'files': document_files.paths,
         'summary': {
             'total_claims': 0,
             'validated': 0,
             'found': 0,
             'not_found': 0,
+            'timed_out': 0,
             'confidence_distribution': {'high': 0, 'medium': 0, 'low': 0}
         },
         'results_by_type': {},
@@ -298,43 +888,42 @@ def validate_claims_file(claims_yaml: Path, magento_root: Path) -> Dict[str, Any
 
     claims = claims_data.get('claims', {})
 
-    # Validate each claim type
     for claim_type, claim_list in claims.items():
         if not claim_list:
             continue
 
         type_results = []
 
+        if claim_type not in CLAIM_VALIDATORS:
+            # Skip config_paths and file_paths for now
+            claim_list = []
+
         for claim in claim_list:
-            if claim_type == 'php_classes':
-                result = validator.validate_class(claim)
-            elif claim_type == 'php_interfaces':
-                result = validator.validate_interface(claim)
-            elif claim_type == 'methods':
-                result = validator.validate_method(claim)
-            elif claim_type == 'events':
-                result = validator.validate_event(claim)
-            elif claim_type == 'database_tables':
-                result = validator.validate_table(claim)
-            elif claim_type == 'acl_resources':
-                result = validator.validate_acl_resource(claim)
-            else:
-                # Skip config_paths and file_paths for now
+            result = validated.get((claim_type, claim))
+            if result is None:
+                # Not answerable by this validator's backends
                 continue
 
-            type_results.append({
+            entry = {
                 'claim': result.claim,
                 'found': result.found,
                 'confidence': result.confidence,
-                'evidence': result.evidence,
+                'evidence': [(document_files.intern(files.path(file_id)), line) for file_id, line in result.evidence],
                 'notes': result.notes
-            })
+            }
+            if snippets is not None and result.evidence:
+                entry['snippets'] = [snippets.snippet(files.path(file_id), line) for file_id, line in result.evidence]
+            if result.timed_out:
+                entry['status'] = 'timeout'
+            type_results.append(entry)
 
             results['summary']['total_claims'] += 1
             results['summary']['validated'] += 1
 
             if result.found:
                 results['summary']['found'] += 1
+            elif result.timed_out:
+                results['summary']['timed_out'] += 1
             else:
                 results['summary']['not_found'] += 1
 
@@ -343,21 +932,119 @@ def validate_claims_file(claims_yaml: Path, magento_root: Path) -> Dict[str, Any
         results['results_by_type'][claim_type] = {
             'total': len(type_results),
             'found': sum(1 for r in type_results if r['found']),
-            'not_found': sum(1 for r in type_results if not r['found']),
+            'not_found': sum(1 for r in type_results if not r['found'] and 'status' not in r),
+            'timed_out': sum(1 for r in type_results if r.get('status') == 'timeout'),
             'results': type_results
         }
 
     return results
 
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: validate_claims.py <claims_yaml> <magento_root> [output_yaml]")
-        print("Example: validate_claims.py architecture_claims.yaml /path/to/magento validation_results.yaml")
-        sys.exit(1)
+def validate_claims_file(claims_yaml: Path, magento_root: Path, use_index: bool = True,
+                         index_path: Path = None, rebuild_index: bool = False,
+                         validator: MagentoValidator = None, cache: ResultCache = None,
+                         snippets: SnippetReader = None) -> Dict[str, Any]:
+    """Validate all claims from a YAML file
+
+    Pass an existing validator to reuse its source detection and index
+    across several claims files, a cache to skip claims whose evidence
+    has not changed since they were last validated, and a snippet reader
+    (see snippets.py) to attach source lines to the evidence.
+    """
+
+    if validator is None:
+        validator = MagentoValidator(magento_root, use_index=use_index, index_path=index_path,
+                                     rebuild_index=rebuild_index)
+    profiler = validator.profiler
+
+    with profiler.span('load_claims'):
+        claims_data = load_document(claims_yaml)
+
+    # Validate each claim type
+    validated = {}
+    with profiler.span('validate'):
+        for claim_type, claim_list in claims_data.get('claims', {}).items():
+            if claim_list and claim_type in CLAIM_VALIDATORS:
+                for claim, result in validate_claim_list(validator, claim_type, claim_list, cache).items():
+                    validated[(claim_type, claim)] = result
 
-    claims_file = Path(sys.argv[1])
-    magento_root = Path(sys.argv[2])
+    with profiler.span('build_results'):
+        results = build_results(claims_data, magento_root, validated, validator.files, snippets)
+
+    if cache is not None:
+        cache.flush()
+        results['summary']['cache'] = {'hits': cache.hits, 'misses': cache.misses}
+
+    if profiler.enabled:
+        results['summary']['profile'] = profiler.summary()
+
+    return results
+
+
+def print_profile(profile: Dict[str, Any], profiler: Profiler):
+    """Console view of a run's profile (phases include write_results, unlike the written summary)"""
+    print()
+    print("Profile:")
+    for name, seconds in profiler.phases.items():
+        print(f"  {name}: {seconds * 1000:.1f} ms")
+    for counter, value in profile['counters'].items():
+        print(f"  {counter}: {value}")
+    for claim_type, stats in profile['claim_types'].items():
+        strategies = ', '.join(f"{name} x{count}" for name, count in stats['strategies'].items())
+        print(f"  {claim_type}: {stats['claims']} claims, mean {stats['mean_ms']:.2f} ms, "
+              f"p99 {stats['p99_ms']:.2f} ms ({strategies})")
+    print("Slowest claims:")
+    for timing in profile['slowest_claims']:
+        print(f"  {timing['ms']:.2f} ms  {timing['claim_type']}: {timing['claim']} [{timing['strategy']}]")
+
+
+def write_results(results: Dict[str, Any], output_file: Path):
+    """Write validation results in the format implied by the file extension"""
+    dump_document(results, output_file)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Validate documentation claims against Magento core source',
+        epilog='Example: validate_claims.py architecture_claims.yaml /path/to/magento validation_results.yaml'
+    )
+    parser.add_argument('claims_yaml', type=Path)
+    parser.add_argument('magento_root', type=Path)
+    parser.add_argument('output_yaml', type=Path, nargs='?')
+    parser.add_argument('--no-index', action='store_true',
+                        help='search the source tree files instead of using the symbol index')
+    parser.add_argument('--graph', type=Path, action='append', default=[], dest='graph_paths',
+                        help='*-graph.json file or directory of them answering class, interface, plugin and '
+                             'observer claims (repeatable)')
+    parser.add_argument('--index', type=Path, dest='index_path',
+                        help='symbol index location (default: <magento_root>/.magento-symbols.sqlite)')
+    parser.add_argument('--rebuild-index', action='store_true',
+                        help='discard the symbol index and rebuild it from scratch')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-validate every claim instead of reusing unchanged cached results')
+    parser.add_argument('--cache', type=Path, dest='cache_path',
+                        help='result cache location (default: .validation-cache.sqlite in magento_root, '
+                             'or next to it if it is a file)')
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='yaml',
+                        help='output format when no output file is given (default: yaml)')
+    parser.add_argument('--search-tool', choices=[SCAN_TOOL, 'rg', 'grep'], default=SCAN_TOOL,
+                        help='how --no-index searches files: in-process, or with rg/grep subprocesses '
+                             f'(default: {SCAN_TOOL})')
+    parser.add_argument('--search-jobs', type=int,
+                        help='scanner threads or concurrent rg/grep processes with --no-index (default: all cores)')
+    parser.add_argument('--search-timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'first deadline per rg/grep search in seconds, doubled on each retry '
+                             f'(default: {DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--snippets', type=int, default=0, metavar='N',
+                        help='attach N lines of source before and after each evidence line')
+    parser.add_argument('--profile', action='store_true',
+                        help='record per-claim timings, strategies and counters in summary.profile')
+    parser.add_argument('--trace', type=Path,
+                        help='also write a Chrome trace-event JSON file (implies --profile)')
+    args = parser.parse_args(argv)
+
+    claims_file = args.claims_yaml
+    magento_root = args.magento_root
 
     if not claims_file.exists():
         print(f"Error: Claims file not found: {claims_file}")
@@ -371,21 +1058,34 @@ def main():
     print(f"Magento root: {magento_root}")
     print()
 
+    profiler = Profiler() if args.profile or args.trace else NULL_PROFILER
+
     try:
-        results = validate_claims_file(claims_file, magento_root)
+        validator = MagentoValidator(magento_root, use_index=not args.no_index, index_path=args.index_path,
+                                     rebuild_index=args.rebuild_index, search_jobs=args.search_jobs,
+                                     search_timeout=args.search_timeout, profiler=profiler,
+                                     graph_paths=args.graph_paths, search_tool=args.search_tool)
+        cache = None
+        if not args.no_cache:
+            cache = ResultCache(args.cache_path or sidecar_path(magento_root, CACHE_FILENAME), validator)
+        snippets = open_snippet_reader(magento_root, validator.vendor_path, args.snippets) if args.snippets else None
+        results = validate_claims_file(claims_file, magento_root, validator=validator, cache=cache,
+                                       snippets=snippets)
     except Exception as e:
         print(f"Error during validation: {e}")
         sys.exit(1)
 
     # Determine output file
-    if len(sys.argv) >= 4:
-        output_file = Path(sys.argv[3])
+    if args.output_yaml:
+        output_file = args.output_yaml
     else:
-        output_file = claims_file.parent / f"{claims_file.stem}_validation.yaml"
+        output_file = claims_file.parent / f"{claims_file.stem}_validation{FORMAT_EXTENSIONS[args.format]}"
 
     # Write results
-    with open(output_file, 'w', encoding='utf-8') as f:
-        yaml.dump(results, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    with profiler.span('write_results'):
+        write_results(results, output_file)
+    if args.trace:
+        profiler.write_trace(args.trace)
 
     # Print summary
     print(f"Validation complete!")
@@ -395,6 +1095,13 @@ def main():
     print(f"  Total claims validated: {results['summary']['total_claims']}")
     print(f"  Found: {results['summary']['found']} ({results['summary']['found']/max(results['summary']['total_claims'], 1)*100:.1f}%)")
     print(f"  Not found: {results['summary']['not_found']} ({results['summary']['not_found']/max(results['summary']['total_claims'], 1)*100:.1f}%)")
+    if results['summary']['timed_out']:
+        print(f"  Timed out: {results['summary']['timed_out']} (searches did not finish; rerun to retry)")
+    if 'cache' in results['summary']:
+        print(f"  Cache: {results['summary']['cache']['hits']} hits, {results['summary']['cache']['misses']} misses")
+    if snippets is not None:
+        print(f"  Snippets: {snippets.snippets} from {snippets.files_read} files")
+        snippets.close()
     print()
     print("Confidence Distribution:")
     print(f"  High: {results['summary']['confidence_distribution']['high']}")
@@ -406,6 +1113,11 @@ def main():
         found_pct = type_data['found'] / max(type_data['total'], 1) * 100
         print(f"  {claim_type}: {type_data['found']}/{type_data['total']} ({found_pct:.1f}%)")
 
+    if profiler.enabled:
+        print_profile(results['summary']['profile'], profiler)
+        if args.trace:
+            print(f"Trace: {args.trace}")
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Validation Daemon
+Keeps one warm validator in a long-running process behind a Unix domain socket.
+
+serve     load the source tree once (symbol index, PSR-4 map, config index)
+          and answer requests until stopped
+validate  thin client: sends a claims file path; the daemon validates it,
+          writes the output file and returns the summary
+status    show what the daemon has loaded and served
+stop      shut the daemon down
+
+Between requests the daemon polls the source tree through the symbol index's
+incremental refresh. Results whose evidence files changed, and every
+not-found result, are dropped from its in-memory result cache; the config
+index and PSR-4 map are rebuilt when their inputs changed.
+
+Each connection carries one JSON request line and one JSON response line.
+The client imports nothing beyond the standard library, so a call costs
+interpreter startup plus the validation itself.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / f"mage-validate-{os.getuid()}.sock"
+DEFAULT_POLL_INTERVAL = 2.0
+
+# Request/response lines can carry a whole validation summary
+MAX_MESSAGE = 64 * 1024 * 1024
+
+
+class MemoryCache:
+    """In-memory ValidationResult records with the ResultCache interface
+
+    Records keep evidence as [relative_path, line], so a changed file can
+    be matched against them without a FileTable.
+    """
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, claim_type: str, claim: str) -> Optional[Dict[str, Any]]:
+        record = self.records.get((claim_type, claim))
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def put(self, claim_type: str, claim: str, result):
+        self.records[(claim_type, claim)] = result.to_record(self.validator.files)
+
+    def flush(self):
+        # Nothing to persist; records live as long as the daemon
+        pass
+
+    def invalidate(self, changed: List[str]) -> int:
+        """Drop not-found records and records with evidence in a changed file; return how many"""
+        changed = set(changed)
+        stale = [
+            key for key, record in self.records.items()
+            if not record['found'] or any(path in changed for path, _ in record['evidence'])
+        ]
+        for key in stale:
+            del self.records[key]
+        return len(stale)
+
+    def invalidate_types(self, claim_types) -> int:
+        """Drop every record of the given claim types; return how many"""
+        stale = [key for key in self.records if key[0] in claim_types]
+        for key in stale:
+            del self.records[key]
+        return len(stale)
+
+
+class ValidationService:
+    """A warm MagentoValidator plus the bookkeeping to keep it current"""
+
+    def __init__(self, magento_root: Path, index_path: Path = None, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 graph_paths: List[Path] = ()):
+        from validate_claims import MagentoValidator
+
+        self.magento_root = magento_root
+        self.poll_interval = poll_interval
+        self.started = time.time()
+        self.requests = 0
+        self.refreshes = 0
+        self.last_refresh: Dict[str, Any] = {}
+
+        self.validator = MagentoValidator(magento_root, use_index=True, index_path=index_path,
+                                          graph_paths=graph_paths)
+        self.cache = MemoryCache(self.validator)
+        # One snippet reader per context size asked for; line tables outlive requests
+        self.snippet_readers: Dict[int, Any] = {}
+        if self.validator.source_tree:
+            # Build the lazily loaded config index now rather than on the first request
+            self.validator._config_index()
+
+        self._autoload_stats = self._stat_autoload_sources()
+        self._next_poll = time.monotonic() + poll_interval
+
+    def _stat_autoload_sources(self) -> List[Optional[Tuple[int, int]]]:
+        from autoload import AUTOLOAD_PSR4
+
+        stats = []
+        for path in (self.magento_root / AUTOLOAD_PSR4, self.magento_root / 'composer.json'):
+            try:
+                st = os.stat(path)
+                stats.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stats.append(None)
+        return stats
+
+    def poll(self, force: bool = False):
+        """Refresh the index if the poll interval has passed and drop stale state"""
+        if not force and time.monotonic() < self._next_poll:
+            return
+        if self.validator.archive is not None or self.validator.index is None:
+            # Snapshot archives are not edited in place and graphs are loaded once;
+            # restart the daemon for a new one
+            return
+
+        from autoload import load_psr4
+
+        validator = self.validator
+        start = time.perf_counter()
+        changed: List[str] = []
+        stats = validator.index.refresh(changed)
+
+        autoload_stats = self._stat_autoload_sources()
+        if autoload_stats != self._autoload_stats:
+            self._autoload_stats = autoload_stats
+            validator.autoload = load_psr4(self.magento_root, validator.vendor_path)
+            # Class claims may now resolve through different files
+            invalidated = self.cache.invalidate_types(('php_classes', 'php_interfaces'))
+        else:
+            invalidated = 0
+
+        for reader in self.snippet_readers.values():
+            reader.forget(changed)
+
+        if changed or invalidated:
+            validator._config = None
+            validator._config_index()
+            self.refreshes += 1
+            self.last_refresh = {
+                **stats,
+                'invalidated': invalidated + self.cache.invalidate(changed),
+                'seconds': round(time.perf_counter() - start, 3),
+                'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+
+        self._next_poll = time.monotonic() + self.poll_interval
+
+    def _snippet_reader(self, context: int):
+        from snippets import open_snippet_reader
+
+        if not context:
+            return None
+        reader = self.snippet_readers.get(context)
+        if reader is None:
+            reader = self.snippet_readers[context] = open_snippet_reader(
+                self.magento_root, self.validator.vendor_path, context)
+        return reader
+
+    def validate(self, claims_file: Path, output_file: Optional[Path], output_format: str,
+                 snippets: int = 0) -> Dict[str, Any]:
+        from validate_claims import validate_claims_file, write_results
+        from claims_io import FORMAT_EXTENSIONS
+
+        if not claims_file.exists():
+            raise FileNotFoundError(f"Claims file not found: {claims_file}")
+        if output_file is None:
+            output_file = claims_file.parent / f"{claims_file.stem}_validation{FORMAT_EXTENSIONS[output_format]}"
+
+        start = time.perf_counter()
+        self.cache.hits = self.cache.misses = 0
+        results = validate_claims_file(claims_file, self.magento_root, validator=self.validator, cache=self.cache,
+                                       snippets=self._snippet_reader(snippets))
+        write_results(results, output_file)
+        return {
+            'output_file': str(output_file),
+            'summary': results['summary'],
+            'results_by_type': {
+                claim_type: {key: value for key, value in type_data.items() if key != 'results'}
+                for claim_type, type_data in results['results_by_type'].items()
+            },
+            'seconds': round(time.perf_counter() - start, 4),
+        }
+
+    def status(self) -> Dict[str, Any]:
+        validator = self.validator
+        return {
+            'pid': os.getpid(),
+            'magento_root': str(self.magento_root),
+            'source_root': str(validator.vendor_path),
+            'index': str(validator.index.index_path) if validator.index is not None else None,
+            'indexed_files': validator.index.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            if validator.index is not None else 0,
+            'graph_files': [str(path) for path in validator.graph.paths] if validator.graph is not None else [],
+            'psr4_prefixes': len(validator.autoload),
+            'cached_results': len(self.cache.records),
+            'snippet_files': sum(reader.cached_files for reader in self.snippet_readers.values()),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'poll_interval': self.poll_interval,
+            'refreshes': self.refreshes,
+            'last_refresh': self.last_refresh,
+        }
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one decoded request"""
+        op = request.get('op')
+        if op == 'validate':
+            self.requests += 1
+            output_file = request.get('output_file')
+            return self.validate(Path(request['claims_file']),
+                                 Path(output_file) if output_file else None,
+                                 request.get('format', 'yaml'), request.get('snippets', 0))
+        if op == 'status':
+            return self.status()
+        if op == 'refresh':
+            self.poll(force=True)
+            return {'last_refresh': self.last_refresh}
+        raise ValueError(f"Unknown request: {op!r}")
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if chunk.endswith(b'\n') or size > MAX_MESSAGE:
+            break
+    return b''.join(chunks)
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]):
+    conn.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def daemon_running(socket_path: Path) -> bool:
+    """True if something is accepting connections on the socket"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def serve(magento_root: Path, socket_path: Path = DEFAULT_SOCKET, index_path: Path = None,
+          poll_interval: float = DEFAULT_POLL_INTERVAL, graph_paths: List[Path] = ()):
+    """Load the tree and answer requests on socket_path until stopped"""
+
+    if socket_path.exists():
+        if daemon_running(socket_path):
+            raise RuntimeError(f"A daemon is already listening on {socket_path}")
+        socket_path.unlink()
+
+    start = time.perf_counter()
+    service = ValidationService(magento_root, index_path, poll_interval, graph_paths)
+    print(f"Loaded {service.validator.vendor_path} in {time.perf_counter() - start:.2f}s")
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    os.chmod(socket_path, 0o600)
+    server.listen(16)
+    # Wake up regularly to poll the tree even when no client connects
+    server.settimeout(min(poll_interval, 0.5))
+    print(f"Listening on {socket_path} (pid {os.getpid()})", flush=True)
+
+    running = True
+
+    def stop(signum, frame):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        while running:
+            service.poll()
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+
+            with conn:
+                conn.settimeout(None)
+                try:
+                    request = json.loads(_read_line(conn))
+                    if request.get('op') == 'stop':
+                        running = False
+                        response = {'ok': True}
+                    else:
+                        response = {'ok': True, **service.handle(request)}
+                except Exception as e:
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                try:
+                    _send(conn, response)
+                except OSError:
+                    # Client went away before reading the answer
+                    pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+        if service.validator.index is not None:
+            service.validator.index.close()
+        for reader in service.snippet_readers.values():
+            reader.close()
+        print("Daemon stopped")
+
+
+def request(socket_path: Path, message: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request to the daemon and return its response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(str(socket_path))
+        _send(conn, message)
+        conn.shutdown(socket.SHUT_WR)
+        response = _read_line(conn)
+    if not response:
+        raise ConnectionError("Daemon closed the connection without answering")
+    return json.loads(response)
+
+
+def print_summary(response: Dict[str, Any]):
+    summary = response['summary']
+    total = max(summary['total_claims'], 1)
+    print(f"Output: {response['output_file']}")
+    print(f"  Total claims validated: {summary['total_claims']} in {response['seconds'] * 1000:.1f} ms")
+    print(f"  Found: {summary['found']} ({summary['found'] / total * 100:.1f}%)")
+    print(f"  Not found: {summary['not_found']} ({summary['not_found'] / total * 100:.1f}%)")
+    if summary['timed_out']:
+        print(f"  Timed out: {summary['timed_out']}")
+    if 'cache' in summary:
+        print(f"  Warm results: {summary['cache']['hits']} reused, {summary['cache']['misses']} validated")
+    for claim_type, type_data in response['results_by_type'].items():
+        print(f"  {claim_type}: {type_data['found']}/{type_data['total']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate claims through a long-running validation daemon')
+    parser.add_argument('--socket', type=Path, default=DEFAULT_SOCKET,
+                        help=f'Unix socket path (default: {DEFAULT_SOCKET})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='load a Magento tree and answer requests')
+    serve_parser.add_argument('magento_root', type=Path)
+    serve_parser.add_argument('--index', type=Path, dest='index_path',
+                              help='symbol index location (default: <magento_root>/.magento-symbols.sqlite)')
+    serve_parser.add_argument('--graph', type=Path, action='append', default=[], dest='graph_paths',
+                              help='*-graph.json file or directory of them for class, interface, plugin and '
+                                   'observer claims (repeatable)')
+    serve_parser.add_argument('--poll', type=float, default=DEFAULT_POLL_INTERVAL,
+                              help=f'seconds between source tree checks (default: {DEFAULT_POLL_INTERVAL:g})')
+
+    validate_parser = commands.add_parser('validate', help='validate a claims file through the daemon')
+    validate_parser.add_argument('claims_yaml', type=Path)
+    validate_parser.add_argument('output_yaml', type=Path, nargs='?')
+    validate_parser.add_argument('--format', choices=['msgpack', 'ndjson', 'yaml'], default='yaml',
+                                 help='output format when no output file is given (default: yaml)')
+    validate_parser.add_argument('--snippets', type=int, default=0, metavar='N',
+                                 help='attach N lines of source before and after each evidence line')
+
+    commands.add_parser('status', help='show what the daemon has loaded')
+    commands.add_parser('refresh', help='check the source tree for changes now')
+    commands.add_parser('stop', help='shut the daemon down')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        if not args.magento_root.exists():
+            print(f"Error: Magento root not found: {args.magento_root}")
+            sys.exit(1)
+        try:
+            serve(args.magento_root.resolve(), args.socket, args.index_path, args.poll,
+                  [path.resolve() for path in args.graph_paths])
+        except (RuntimeError, FileNotFoundError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    message: Dict[str, Any] = {'op': args.command}
+    if args.command == 'validate':
+        message['claims_file'] = str(args.claims_yaml.resolve())
+        message['output_file'] = str(args.output_yaml.resolve()) if args.output_yaml else None
+        message['format'] = args.format
+        message['snippets'] = args.snippets
+
+    try:
+        response = request(args.socket, message)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Error: no daemon listening on {args.socket}; start one with: validate_daemon.py serve <magento_root>")
+        sys.exit(1)
+
+    if not response.pop('ok'):
+        print(f"Error: {response['error']}")
+        sys.exit(1)
+
+    if args.command == 'validate':
+        print_summary(response)
+    elif args.command == 'stop':
+        print("Daemon stopping")
+    else:
+        print(json.dumps(response, indent=2))
+
+
+if __name__ == '__main__':
+    main()
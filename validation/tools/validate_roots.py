@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Multi-Root Validation
+Validates one claims file against several Magento source trees in one pass.
+
+Produces a per-root found/not-found matrix for every claim, e.g. Magento
+Open Source vs Mage-OS, or two releases of the same edition:
+- Roots are given as name=path (or just a path, named after its directory)
+- Each root keeps its own symbol index, but indexes are opened in order and
+  share content: a file whose bytes already appear in an earlier root's
+  index copies its symbols instead of being scanned, so a second edition
+  mostly costs a tree walk and hashing
+- The summary counts claims found in every root, in none, and in some.
+  A root whose search timed out has found: null for the claim and is left
+  out of that comparison
+
+Output (<claims>_matrix.yaml by default) lists each root's evidence files
+once under roots[i].files; evidence entries are [file_index, line] pairs.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from validate_claims import CLAIM_VALIDATORS, FileTable, MagentoValidator, ValidationResult, validate_claim_list
+from claims_io import FORMAT_EXTENSIONS, dump_document, load_document
+
+
+def parse_root(spec: str) -> Tuple[str, Path]:
+    """'name=path' or 'path' -> (name, path)"""
+    name, sep, path = spec.partition('=')
+    if not sep:
+        path = spec
+        name = Path(spec).resolve().name
+    return name, Path(path)
+
+
+def open_roots(roots: List[Tuple[str, Path]]) -> Tuple[Dict[str, MagentoValidator], Dict[str, Dict[str, Any]]]:
+    """One validator per root, each index sharing the content of those opened before it"""
+    validators: Dict[str, MagentoValidator] = {}
+    timings = {}
+    for name, magento_root in roots:
+        start = time.perf_counter()
+        validators[name] = MagentoValidator(
+            magento_root, shared_indexes=[validator.index for validator in validators.values()
+                                           if validator.index is not None])
+        timings[name] = {'seconds': round(time.perf_counter() - start, 3),
+                         'files': validators[name].index.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+                         if validators[name].index is not None else 0}
+    return validators, timings
+
+
+def validate_roots(claims_data: Dict[str, Any], validators: Dict[str, MagentoValidator]) -> Dict[str, Any]:
+    """Build the claim-by-root matrix for one loaded claims document"""
+
+    validated: Dict[str, Dict[Tuple[str, str], ValidationResult]] = {name: {} for name in validators}
+    for claim_type, claim_list in claims_data.get('claims', {}).items():
+        if claim_list and claim_type in CLAIM_VALIDATORS:
+            for name, validator in validators.items():
+                for claim, result in validate_claim_list(validator, claim_type, claim_list).items():
+                    validated[name][(claim_type, claim)] = result
+
+    document_files = {name: FileTable(validator.files.root) for name, validator in validators.items()}
+    results = {
+        'source_document': claims_data['source_document'],
+        'roots': [
+            {'name': name, 'magento_root': str(validator.magento_root),
+             'source_root': str(validator.vendor_path), 'files': document_files[name].paths}
+            for name, validator in validators.items()
+        ],
+        'summary': {
+            'total_claims': 0,
+            'found_in_all': 0,
+            'found_in_none': 0,
+            'differs': 0,
+            'roots': {name: {'found': 0, 'not_found': 0, 'timed_out': 0} for name in validators},
+        },
+        'matrix': {},
+    }
+    summary = results['summary']
+
+    for claim_type, claim_list in claims_data.get('claims', {}).items():
+        if not claim_list or claim_type not in CLAIM_VALIDATORS:
+            continue
+
+        rows = []
+        for claim in claim_list:
+            found = {}
+            evidence = {}
+            for name, validator in validators.items():
+                result = validated[name].get((claim_type, claim))
+                if result is None:
+                    # A root that cannot answer this claim type, e.g. methods against a graph
+                    found[name] = None
+                    evidence[name] = []
+                    continue
+                # A timed-out search is unknown, not missing: left out of the comparison like a root
+                # that cannot answer the claim type, and counted under timed_out
+                found[name] = None if result.timed_out else result.found
+                evidence[name] = [(document_files[name].intern(validator.files.path(file_id)), line)
+                                  for file_id, line in result.evidence]
+                counts = summary['roots'][name]
+                if result.found:
+                    counts['found'] += 1
+                elif result.timed_out:
+                    counts['timed_out'] += 1
+                else:
+                    counts['not_found'] += 1
+
+            checked = [value for value in found.values() if value is not None]
+            if not checked:
+                continue
+            rows.append({'claim': claim, 'found': found, 'evidence': evidence})
+            summary['total_claims'] += 1
+            if all(checked):
+                summary['found_in_all'] += 1
+            elif not any(checked):
+                summary['found_in_none'] += 1
+            else:
+                summary['differs'] += 1
+
+        if rows:
+            results['matrix'][claim_type] = rows
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate documentation claims against several Magento source trees at once',
+        epilog='Example: validate_roots.py architecture_claims.yaml magento=/src/magento2 mage-os=/src/mageos'
+    )
+    parser.add_argument('claims_yaml', type=Path)
+    parser.add_argument('roots', nargs='+', metavar='[name=]magento_root')
+    parser.add_argument('-o', '--output', type=Path,
+                        help='output file (default: <claims>_matrix.yaml next to the claims file)')
+    parser.add_argument('--format', choices=sorted(FORMAT_EXTENSIONS), default='yaml',
+                        help='output format when no output file is given (default: yaml)')
+    args = parser.parse_args()
+
+    roots = [parse_root(spec) for spec in args.roots]
+    names = [name for name, _ in roots]
+    if len(set(names)) != len(names):
+        print(f"Error: root names must be unique: {', '.join(names)}")
+        sys.exit(1)
+    for name, magento_root in roots:
+        if not magento_root.exists():
+            print(f"Error: Magento root not found for {name}: {magento_root}")
+            sys.exit(1)
+    if not args.claims_yaml.exists():
+        print(f"Error: Claims file not found: {args.claims_yaml}")
+        sys.exit(1)
+
+    try:
+        validators, timings = open_roots(roots)
+        results = validate_roots(load_document(args.claims_yaml), validators)
+    except Exception as e:
+        print(f"Error during validation: {e}")
+        sys.exit(1)
+
+    output_file = args.output or args.claims_yaml.parent / f"{args.claims_yaml.stem}_matrix{FORMAT_EXTENSIONS[args.format]}"
+    dump_document(results, output_file)
+
+    summary = results['summary']
+    print(f"Output: {output_file}")
+    print()
+    print("Roots:")
+    for name, validator in validators.items():
+        counts = summary['roots'][name]
+        print(f"  {name}: {validator.vendor_path} ({timings[name]['files']} files indexed in "
+              f"{timings[name]['seconds']:.2f}s)")
+        print(f"    Found: {counts['found']}/{summary['total_claims']}, not found: {counts['not_found']}"
+              + (f", timed out: {counts['timed_out']}" if counts['timed_out'] else ''))
+    print()
+    print(f"Claims: {summary['total_claims']}")
+    print(f"  Found in all roots: {summary['found_in_all']}")
+    print(f"  Found in no root: {summary['found_in_none']}")
+    print(f"  Differ between roots: {summary['differs']}")
+    for claim_type, rows in results['matrix'].items():
+        for row in rows:
+            if len({found for found in row['found'].values() if found is not None}) > 1:
+                marks = '  '.join(f"{name}:{'-' if found is None else 'yes' if found else 'no'}"
+                                  for name, found in row['found'].items())
+                print(f"    {claim_type}: {row['claim']}  [{marks}]")
+
+
+if __name__ == '__main__':
+    main()